@@ -0,0 +1,365 @@
+"""
+Helpers for reading values through the cache without stampeding upstream services.
+"""
+from collections import namedtuple
+import cPickle as pickle
+from hashlib import md5
+import logging
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils.module_loading import import_string
+
+from core.timing import timed
+from core.utils import get_fetch_executor
+
+
+logger = logging.getLogger(__name__)
+
+# Marks keys known to be missing from the shared cache.
+_MISSING = object()
+
+
+class RequestCacheMemo(object):
+    """ Values read from or written to the shared cache while handling one request. """
+
+    def __init__(self):
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.values.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return _MISSING
+
+        self.hits += 1
+        # Values are stored pickled so that, as with a real cache backend, each read returns a private copy
+        return None if value is None else pickle.loads(value)
+
+    def put(self, key, value):
+        # None records that the shared cache has no value for the key
+        self.values[key] = None if value is None else pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def discard(self, key):
+        self.values.pop(key, None)
+
+
+class RequestCache(object):
+    """
+    Proxy for the shared cache that remembers the keys read and written during a request.
+
+    While a memo is active for the current thread (see `RequestCacheMiddleware`), repeated reads of a key are
+    answered in-process instead of making another round-trip.  Writes and deletes go to the shared cache and
+    update the memo.  Without an active memo, e.g. on the fetch thread pool, every call goes straight through.
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(self._cache, name)
+
+    def _call(self, method, *args, **kwargs):
+        """ Calls method on the shared cache, recording the round-trip as `cache` (see `core.timing`). """
+        with timed('cache'):
+            return getattr(self._cache, method)(*args, **kwargs)
+
+    @property
+    def memo(self):
+        return getattr(self._local, 'memo', None)
+
+    def enable_memo(self):
+        self._local.memo = RequestCacheMemo()
+        return self._local.memo
+
+    def disable_memo(self):
+        """ Discards the memo for the current thread and returns it. """
+        memo = self.memo
+        self._local.memo = None
+        return memo
+
+    def get(self, key, default=None, version=None):
+        memo = self.memo
+        if memo is None:
+            return self._call('get', key, default, version=version)
+
+        value = memo.get(key)
+        if value is _MISSING:
+            value = self._call('get', key, version=version)
+            memo.put(key, value)
+        return default if value is None else value
+
+    def get_many(self, keys, version=None):
+        memo = self.memo
+        if memo is None:
+            return self._call('get_many', keys, version=version)
+
+        values = {}
+        missing_keys = []
+        for key in keys:
+            value = memo.get(key)
+            if value is _MISSING:
+                missing_keys.append(key)
+            elif value is not None:
+                values[key] = value
+
+        if missing_keys:
+            fetched = self._call('get_many', missing_keys, version=version)
+            for key in missing_keys:
+                memo.put(key, fetched.get(key))
+            values.update(fetched)
+
+        return values
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._call('set', key, value, timeout, version=version)
+        if self.memo is not None:
+            self.memo.put(key, value)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed_keys = self._call('set_many', data, timeout, version=version)
+        if self.memo is not None:
+            for key, value in data.iteritems():
+                self.memo.put(key, value)
+        return failed_keys
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self._call('add', key, value, timeout, version=version)
+        if self.memo is not None:
+            if added:
+                self.memo.put(key, value)
+            else:
+                self.memo.discard(key)
+        return added
+
+    def delete(self, key, version=None):
+        self._call('delete', key, version=version)
+        if self.memo is not None:
+            self.memo.put(key, None)
+
+    def delete_many(self, keys, version=None):
+        self._call('delete_many', keys, version=version)
+        if self.memo is not None:
+            for key in keys:
+                self.memo.put(key, None)
+
+    def discard(self, key):
+        """ Forgets any memoized value for key, so that the next read goes to the shared cache. """
+        if self.memo is not None:
+            self.memo.discard(key)
+
+    def clear(self):
+        self._call('clear')
+        if self.memo is not None:
+            self.memo.values.clear()
+
+
+cache = RequestCache(shared_cache)
+
+# Seconds between cache checks while waiting for another worker to fill a key.
+FILL_POLL_INTERVAL = 0.1
+
+# Wrapper for values stored by get_or_set.  refresh_at is the epoch time at which the value becomes stale,
+# or None if it never does.
+CacheEntry = namedtuple('CacheEntry', ['value', 'refresh_at'])
+
+# Values encoded by a codec are stored in a CacheEntry as an EncodedValue or, if the encoded value is larger
+# than CACHE_CHUNK_SIZE, as a ChunkedValue naming the keys of its chunks.
+EncodedValue = namedtuple('EncodedValue', ['data'])
+ChunkedValue = namedtuple('ChunkedValue', ['chunk_keys', 'size'])
+
+
+class PickleCodec(object):
+    """
+    Serializes values with the highest pickle protocol, compressing them with zlib once they reach
+    CACHE_COMPRESS_THRESHOLD bytes.  A threshold of None disables compression.
+    """
+    RAW = b'p'
+    COMPRESSED = b'z'
+
+    def __init__(self, compress_level=6):
+        self.compress_threshold = settings.CACHE_COMPRESS_THRESHOLD
+        self.compress_level = compress_level
+
+    def encode(self, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if self.compress_threshold is not None and len(data) >= self.compress_threshold:
+            compressed = zlib.compress(data, self.compress_level)
+            logger.debug('Compressed %d bytes to %d bytes.', len(data), len(compressed))
+            return self.COMPRESSED + compressed
+        return self.RAW + data
+
+    def decode(self, data):
+        encoding, data = data[:1], data[1:]
+        if encoding == self.COMPRESSED:
+            data = zlib.decompress(data)
+        elif encoding != self.RAW:
+            raise ValueError('Unknown cache value encoding: {!r}'.format(encoding))
+        return pickle.loads(data)
+
+
+_codecs = {}
+
+
+def get_codec():
+    """ Returns the codec named by the CACHE_VALUE_CODEC setting. """
+    path = settings.CACHE_VALUE_CODEC
+    codec = _codecs.get(path)
+    if codec is None:
+        codec = _codecs[path] = import_string(path)()
+    return codec
+
+
+def encode_value(key, value, codec):
+    """
+    Returns the EncodedValue or ChunkedValue to store under key in place of value, and a dictionary of the
+    chunks to store alongside it.
+    """
+    with timed('codec'):
+        data = codec.encode(value)
+
+    chunk_size = settings.CACHE_CHUNK_SIZE
+    if len(data) <= chunk_size:
+        logger.debug('Encoded the value of %s in %d bytes.', key, len(data))
+        return EncodedValue(data), {}
+
+    # Chunk keys depend on the data, so that chunks of values written concurrently for key are never mixed
+    digest = md5(data).hexdigest()
+    chunks = {}
+    chunk_keys = []
+    for offset in xrange(0, len(data), chunk_size):
+        chunk_key = u'{}_{}_{}'.format(key, digest, len(chunk_keys))
+        chunk_keys.append(chunk_key)
+        chunks[chunk_key] = data[offset:offset + chunk_size]
+
+    logger.info('Encoded the value of %s in %d bytes, stored in %d chunks.', key, len(data), len(chunk_keys))
+    return ChunkedValue(chunk_keys, len(data)), chunks
+
+
+def decode_value(key, stored, codec=None):
+    """
+    Returns the value stored under key by encode_value, or _MISSING if any of its chunks have been evicted.
+    Values stored without a codec are returned as is.
+    """
+    if isinstance(stored, ChunkedValue):
+        chunks = cache.get_many(stored.chunk_keys)
+        if len(chunks) < len(stored.chunk_keys):
+            logger.info('Chunks of the value of %s are no longer cached.', key)
+            return _MISSING
+        data = b''.join(chunks[chunk_key] for chunk_key in stored.chunk_keys)
+    elif isinstance(stored, EncodedValue):
+        data = stored.data
+    else:
+        return stored
+
+    with timed('codec'):
+        return (codec or get_codec()).decode(data)
+
+
+def _get_entry_value(key):
+    """ Returns the value and refresh time of the CacheEntry stored under key.  The value is _MISSING if none is. """
+    entry = cache.get(key)
+    if not isinstance(entry, CacheEntry):
+        return _MISSING, None
+    return decode_value(key, entry.value), entry.refresh_at
+
+
+def _get_lock_key(key):
+    return u'{}_lock'.format(key)
+
+
+def _acquire_lock(key):
+    """ Returns True if this worker now holds the fill lock for key.  cache.add is atomic in memcached. """
+    return cache.add(_get_lock_key(key), True, settings.CACHE_FILL_LOCK_TIMEOUT)
+
+
+def _release_lock(key):
+    cache.delete(_get_lock_key(key))
+
+
+def _fetch_and_set(key, fetch, timeout, codec=None):
+    value = fetch()
+
+    if timeout is None:
+        refresh_at = None
+        cache_timeout = None
+    else:
+        refresh_at = time.time() + timeout
+        cache_timeout = timeout + settings.CACHE_STALE_GRACE_PERIOD
+
+    stored = value
+    if codec is not None:
+        stored, chunks = encode_value(key, value, codec)
+        # Chunks are written first, so that they are cached whenever the entry that names them is
+        if chunks and cache.set_many(chunks, cache_timeout):
+            logger.warning('Unable to cache every chunk of the value of %s.', key)
+
+    cache.set(key, CacheEntry(stored, refresh_at), cache_timeout)
+    return value
+
+
+def _refresh(key, fetch, timeout, codec=None):
+    """ Refreshes a stale value.  Failures are logged and leave the stale value in place. """
+    try:
+        _fetch_and_set(key, fetch, timeout, codec)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('Unable to refresh the cached value for %s.', key)
+    finally:
+        _release_lock(key)
+
+
+def get_or_set(key, fetch, timeout=DEFAULT_TIMEOUT, codec=None):
+    """
+    Returns the value cached under key, calling fetch to retrieve it if it is not cached.
+
+    Only one worker fetches a given key at a time:
+
+    * On a miss, the worker that acquires the fill lock calls fetch.  Other workers poll the cache for
+      up to CACHE_FILL_WAIT_TIMEOUT seconds before giving up and calling fetch themselves.
+    * After timeout seconds the value is stale but is kept for another CACHE_STALE_GRACE_PERIOD seconds.
+      Stale values are returned immediately while the worker that acquires the lock refreshes the value
+      on the fetch thread pool.
+
+    Arguments
+        key     --  Cache key
+        fetch   --  Callable taking no arguments that returns the value to cache
+        timeout --  Seconds until the value is refreshed.  Defaults to the cache's default timeout and
+                    None means the value never goes stale.
+        codec   --  Codec (e.g. from get_codec) with which to encode the value, for values that may be too
+                    large for a single cache item.  Encoded values larger than CACHE_CHUNK_SIZE are split
+                    across several keys.  None stores the value as is.
+    """
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = cache.default_timeout
+
+    value, refresh_at = _get_entry_value(key)
+    if value is not _MISSING:
+        if refresh_at is not None and refresh_at <= time.time() and _acquire_lock(key):
+            logger.debug('Refreshing stale cached value for %s.', key)
+            get_fetch_executor().submit(_refresh, key, fetch, timeout, codec)
+        return value
+
+    if _acquire_lock(key):
+        try:
+            return _fetch_and_set(key, fetch, timeout, codec)
+        finally:
+            _release_lock(key)
+
+    # Another worker is already fetching the value.  Wait for it rather than repeating the request.
+    deadline = time.time() + settings.CACHE_FILL_WAIT_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(FILL_POLL_INTERVAL)
+        cache.discard(key)
+        value, __ = _get_entry_value(key)
+        if value is not _MISSING:
+            return value
+
+    logger.warning('Timed out waiting for another worker to cache %s.', key)
+    return _fetch_and_set(key, fetch, timeout, codec)
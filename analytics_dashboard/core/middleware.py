@@ -2,11 +2,15 @@
 Middleware for Language Preferences
 """
 
+import json
 import logging
+import time
 from lang_pref_middleware import middleware
 
 from django.template.response import TemplateResponse
 
+from core import timing
+from core.caching import cache
 from core.exceptions import ServiceUnavailableError
 
 logger = logging.getLogger(__name__)
@@ -31,3 +35,70 @@ class ServiceUnavailableExceptionMiddleware(object):
         if isinstance(exception, ServiceUnavailableError):
             logger.exception(exception)
             return TemplateResponse(request, '503.html', status=503)
+
+
+class RequestCacheMiddleware(object):
+    """
+    Memoizes cache reads for the duration of each request.
+
+    Should be placed first so that the memo covers every other middleware and is discarded after they have run.
+    """
+
+    def process_request(self, request):
+        cache.enable_memo()
+
+    def process_response(self, request, response):
+        memo = cache.disable_memo()
+        if memo is not None:
+            logger.debug('Cache reads for %s: %d served by the request cache, %d sent to the shared cache.',
+                         request.path, memo.hits, memo.misses)
+        return response
+
+
+class ServerTimingMiddleware(object):
+    """
+    Times each request and reports where the time went.
+
+    Upstream calls, cache round-trips, permission refreshes and JSON encoding are recorded by the hooks in
+    `core.timing`; template rendering is recorded here.  The totals are sent to the browser in the
+    `Server-Timing` header and logged as JSON along with the page name that tracked views set as
+    `request.timing_page_name`.
+
+    Should be placed first so that the total covers every other middleware.
+    """
+
+    def process_request(self, request):
+        timing.start_timer()
+        request.timing_page_name = None
+
+    def process_template_response(self, request, response):
+        timer = timing.get_timer()
+        if timer is not None:
+            render_started_at = time.time()
+            response.add_post_render_callback(
+                lambda rendered: timer.record('render', time.time() - render_started_at))
+        return response
+
+    def process_response(self, request, response):
+        timer = timing.stop_timer()
+        if timer is None:
+            return response
+
+        total = timer.elapsed * 1000
+        metrics = timer.metrics()
+
+        entries = ['{};dur={:.1f};desc="{} calls"'.format(name, duration, count)
+                   for name, duration, count in metrics]
+        entries.append('total;dur={:.1f}'.format(total))
+        response['Server-Timing'] = ', '.join(entries)
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        summary = {
+            'page': getattr(request, 'timing_page_name', None) or getattr(resolver_match, 'view_name', None),
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total, 1),
+            'spans': {name: {'ms': round(duration, 1), 'count': count} for name, duration, count in metrics},
+        }
+        logger.info('Request timing: %s', json.dumps(summary, sort_keys=True))
+        return response
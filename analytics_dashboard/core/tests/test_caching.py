@@ -0,0 +1,190 @@
+import time
+
+import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from core.caching import (cache as request_cache, CacheEntry, ChunkedValue, EncodedValue, get_codec, get_or_set,
+                          PickleCodec)
+
+
+class GetOrSetTests(TestCase):
+    key = 'test_key'
+
+    def setUp(self):
+        super(GetOrSetTests, self).setUp()
+        cache.clear()
+
+    def tearDown(self):
+        super(GetOrSetTests, self).tearDown()
+        cache.clear()
+
+    def test_miss(self):
+        fetch = mock.Mock(return_value='value')
+        self.assertEqual(get_or_set(self.key, fetch, 60), 'value')
+        self.assertEqual(get_or_set(self.key, fetch, 60), 'value')
+        fetch.assert_called_once_with()
+
+        entry = cache.get(self.key)
+        self.assertEqual(entry.value, 'value')
+        self.assertGreater(entry.refresh_at, time.time())
+
+        # The fill lock is released once the value is cached
+        self.assertIsNone(cache.get('{}_lock'.format(self.key)))
+
+    def test_empty_values_are_cached(self):
+        fetch = mock.Mock(return_value=[])
+        self.assertListEqual(get_or_set(self.key, fetch), [])
+        self.assertListEqual(get_or_set(self.key, fetch), [])
+        fetch.assert_called_once_with()
+
+    def test_fetch_error(self):
+        fetch = mock.Mock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            get_or_set(self.key, fetch)
+        self.assertIsNone(cache.get('{}_lock'.format(self.key)))
+
+    def test_stale_value_is_served_while_refreshing(self):
+        cache.set(self.key, CacheEntry('stale', time.time() - 1))
+        fetch = mock.Mock(return_value='fresh')
+
+        with mock.patch('core.caching.get_fetch_executor') as mock_executor:
+            self.assertEqual(get_or_set(self.key, fetch, 60), 'stale')
+            mock_executor.return_value.submit.assert_called_once_with(mock.ANY, self.key, fetch, 60, None)
+
+            # Only one worker refreshes a stale value
+            self.assertEqual(get_or_set(self.key, fetch, 60), 'stale')
+            self.assertEqual(mock_executor.return_value.submit.call_count, 1)
+
+    @override_settings(CACHE_FILL_WAIT_TIMEOUT=0)
+    def test_locked_miss(self):
+        cache.set('{}_lock'.format(self.key), True)
+        fetch = mock.Mock(return_value='value')
+        self.assertEqual(get_or_set(self.key, fetch), 'value')
+        fetch.assert_called_once_with()
+
+
+class PickleCodecTests(TestCase):
+    value = {'blocks': {'block-{}'.format(i): {'children': [], 'graded': False} for i in range(100)}}
+
+    @override_settings(CACHE_COMPRESS_THRESHOLD=1024)
+    def test_compression(self):
+        codec = PickleCodec()
+        data = codec.encode(self.value)
+        self.assertTrue(data.startswith(PickleCodec.COMPRESSED))
+        self.assertDictEqual(codec.decode(data), self.value)
+
+        data = codec.encode('small')
+        self.assertTrue(data.startswith(PickleCodec.RAW))
+        self.assertEqual(codec.decode(data), 'small')
+
+    @override_settings(CACHE_COMPRESS_THRESHOLD=None)
+    def test_compression_disabled(self):
+        self.assertTrue(PickleCodec().encode(self.value).startswith(PickleCodec.RAW))
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            PickleCodec().decode(b'x')
+
+
+@override_settings(CACHE_CHUNK_SIZE=100)
+class EncodedGetOrSetTests(TestCase):
+    key = 'test_key'
+    value = ['value {}'.format(i) for i in range(100)]
+
+    def setUp(self):
+        super(EncodedGetOrSetTests, self).setUp()
+        cache.clear()
+        self.codec = PickleCodec()
+
+    def tearDown(self):
+        super(EncodedGetOrSetTests, self).tearDown()
+        cache.clear()
+
+    def test_small_value(self):
+        fetch = mock.Mock(return_value='value')
+        self.assertEqual(get_or_set(self.key, fetch, codec=self.codec), 'value')
+        self.assertEqual(get_or_set(self.key, fetch, codec=self.codec), 'value')
+        fetch.assert_called_once_with()
+        self.assertIsInstance(cache.get(self.key).value, EncodedValue)
+
+    def test_chunked_value(self):
+        fetch = mock.Mock(return_value=self.value)
+        self.assertListEqual(get_or_set(self.key, fetch, codec=self.codec), self.value)
+        self.assertListEqual(get_or_set(self.key, fetch, codec=self.codec), self.value)
+        fetch.assert_called_once_with()
+
+        stored = cache.get(self.key).value
+        self.assertIsInstance(stored, ChunkedValue)
+        self.assertGreater(len(stored.chunk_keys), 1)
+        self.assertTrue(all(len(cache.get(chunk_key)) <= 100 for chunk_key in stored.chunk_keys))
+
+        # The value is fetched again once any of its chunks has been evicted
+        cache.delete(stored.chunk_keys[-1])
+        self.assertListEqual(get_or_set(self.key, fetch, codec=self.codec), self.value)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_get_codec(self):
+        self.assertIsInstance(get_codec(), PickleCodec)
+        self.assertIs(get_codec(), get_codec())
+
+
+class RequestCacheTests(TestCase):
+    def setUp(self):
+        super(RequestCacheTests, self).setUp()
+        cache.clear()
+        self.memo = request_cache.enable_memo()
+
+    def tearDown(self):
+        super(RequestCacheTests, self).tearDown()
+        request_cache.disable_memo()
+        cache.clear()
+
+    def test_get(self):
+        cache.set('key', {'a': 1})
+        value = request_cache.get('key')
+        self.assertDictEqual(value, {'a': 1})
+
+        # Each read returns a copy, as with the shared cache
+        value['a'] = 2
+        with mock.patch.object(cache, 'get') as mock_get:
+            self.assertDictEqual(request_cache.get('key'), {'a': 1})
+            self.assertFalse(mock_get.called)
+
+        self.assertEqual(request_cache.get('missing', 'default'), 'default')
+        self.assertEqual(request_cache.get('missing', 'default'), 'default')
+        self.assertEqual((self.memo.hits, self.memo.misses), (2, 2))
+
+    def test_get_many(self):
+        cache.set('a', 1)
+        request_cache.get('a')
+        with mock.patch.object(cache, 'get_many', return_value={'b': 2}) as mock_get_many:
+            self.assertDictEqual(request_cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2})
+            mock_get_many.assert_called_once_with(['b', 'c'], version=None)
+            self.assertDictEqual(request_cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2})
+            self.assertEqual(mock_get_many.call_count, 1)
+
+    def test_writes(self):
+        request_cache.set('key', 'value')
+        request_cache.set_many({'a': 1})
+        self.assertEqual(cache.get('key'), 'value')
+        with mock.patch.object(cache, 'get') as mock_get:
+            self.assertEqual(request_cache.get('key'), 'value')
+            self.assertEqual(request_cache.get('a'), 1)
+            self.assertFalse(mock_get.called)
+
+        request_cache.delete('key')
+        self.assertIsNone(request_cache.get('key'))
+        self.assertIsNone(cache.get('key'))
+
+        self.assertTrue(request_cache.add('key', 'added'))
+        self.assertFalse(request_cache.add('key', 'ignored'))
+        self.assertEqual(request_cache.get('key'), 'added')
+
+    def test_without_memo(self):
+        request_cache.disable_memo()
+        request_cache.set('key', 'value')
+        cache.set('key', 'changed')
+        self.assertEqual(request_cache.get('key'), 'changed')
@@ -1,13 +1,21 @@
+import json
 import logging
 
+import mock
+
+from django.core.cache import cache as shared_cache
+from django.http import HttpResponse
 from django.template.response import TemplateResponse
 from django.test import RequestFactory, TestCase
 from django_dynamic_fixture import G
 from lang_pref_middleware.tests import LangPrefMiddlewareTestCaseMixin
 from testfixtures import LogCapture
 
+from core import timing
+from core.caching import cache
 from core.exceptions import ServiceUnavailableError
-from core.middleware import ServiceUnavailableExceptionMiddleware, LanguagePreferenceMiddleware
+from core.middleware import (LanguagePreferenceMiddleware, RequestCacheMiddleware,
+                             ServiceUnavailableExceptionMiddleware, ServerTimingMiddleware)
 from core.models import User
 
 
@@ -56,3 +64,78 @@ class ServiceUnavaliableMiddlewareTests(MiddlewareAssertionMixin, MiddlewareTest
 
             # Verify the exception was logged
             l.check(('core.middleware', 'ERROR', str(exception)),)
+
+
+class RequestCacheMiddlewareTests(MiddlewareTestCase):
+    middleware_class = RequestCacheMiddleware
+
+    def tearDown(self):
+        super(RequestCacheMiddlewareTests, self).tearDown()
+        cache.disable_memo()
+        shared_cache.clear()
+
+    def test_memo_scoped_to_request(self):
+        request = self.factory.get('/')
+        shared_cache.set('key', 'value')
+
+        self.middleware.process_request(request)
+        self.assertEqual(cache.get('key'), 'value')
+
+        # Later reads in the request are answered by the memo
+        shared_cache.set('key', 'changed')
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertEqual((cache.memo.hits, cache.memo.misses), (1, 1))
+
+        response = HttpResponse()
+        self.assertIs(self.middleware.process_response(request, response), response)
+        self.assertIsNone(cache.memo)
+        self.assertEqual(cache.get('key'), 'changed')
+
+
+class ServerTimingMiddlewareTests(MiddlewareTestCase):
+    middleware_class = ServerTimingMiddleware
+
+    def tearDown(self):
+        super(ServerTimingMiddlewareTests, self).tearDown()
+        timing.stop_timer()
+
+    def test_server_timing(self):
+        request = self.factory.get('/courses/')
+        self.middleware.process_request(request)
+        request.timing_page_name = 'course_enrollment_activity'
+        timing.get_timer().record('data_api', 0.25)
+        timing.get_timer().record('data_api', 0.5)
+        with timing.timed('cache'):
+            pass
+
+        with LogCapture('core.middleware', level=logging.INFO) as l:
+            response = self.middleware.process_response(request, HttpResponse())
+            summary = json.loads(l.records[0].args[0])
+
+        self.assertIsNone(timing.get_timer())
+        entries = response['Server-Timing'].split(', ')
+        self.assertEqual(entries[0].split(';')[0], 'cache')
+        self.assertEqual(entries[1], 'data_api;dur=750.0;desc="2 calls"')
+        self.assertTrue(entries[2].startswith('total;dur='))
+
+        self.assertEqual(summary['page'], 'course_enrollment_activity')
+        self.assertEqual(summary['status'], 200)
+        self.assertDictEqual(summary['spans']['data_api'], {'ms': 750.0, 'count': 2})
+
+    def test_render_timing(self):
+        request = self.factory.get('/')
+        self.middleware.process_request(request)
+        template_response = mock.Mock()
+        self.assertIs(self.middleware.process_template_response(request, template_response), template_response)
+
+        # Rendering is recorded once the response has been rendered
+        render_callback = template_response.add_post_render_callback.call_args[0][0]
+        render_callback(template_response)
+
+        response = self.middleware.process_response(request, HttpResponse())
+        self.assertIn('render;dur=', response['Server-Timing'])
+
+    def test_without_timer(self):
+        response = HttpResponse()
+        self.middleware.process_response(self.factory.get('/'), response)
+        self.assertFalse(response.has_header('Server-Timing'))
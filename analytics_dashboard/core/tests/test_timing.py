@@ -0,0 +1,42 @@
+from django.test import TestCase
+import mock
+
+from core import timing
+from core.utils import get_fetch_executor
+
+
+class TimingTests(TestCase):
+    def tearDown(self):
+        super(TimingTests, self).tearDown()
+        timing.stop_timer()
+
+    def test_timed(self):
+        with timing.timed('cache'):
+            pass
+        self.assertIsNone(timing.get_timer())
+
+        timer = timing.start_timer()
+        with timing.timed('cache'):
+            pass
+        with timing.timed('cache'):
+            pass
+        self.assertEqual([(name, count) for name, _, count in timer.metrics()], [('cache', 2)])
+
+    def test_propagate(self):
+        timer = timing.start_timer()
+
+        def fetch():
+            with timing.timed('data_api'):
+                return timing.get_timer()
+
+        self.assertIs(get_fetch_executor().submit(timing.propagate(fetch)).result(), timer)
+        self.assertEqual(timer.counts, {'data_api': 1})
+
+    def test_response_hook(self):
+        session = timing.add_response_hook(mock.Mock(hooks={'response': []}), 'course_api')
+        response = mock.Mock()
+        response.elapsed.total_seconds.return_value = 0.5
+
+        timer = timing.start_timer()
+        session.hooks['response'][0](response)
+        self.assertEqual(timer.metrics(), [('course_api', 500.0, 1)])
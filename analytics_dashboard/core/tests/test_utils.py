@@ -10,8 +10,8 @@ from django.test.utils import override_settings
 from django.test import TestCase
 from django.utils.translation import ugettext_lazy as _
 
-from core.utils import (CourseStructureApiClient, delete_auto_auth_users, sanitize_cache_key, translate_dict_values,
-                        remove_keys, Message)
+from core.utils import (CourseStructureApiClient, delete_auto_auth_users, get_analytics_api_client, get_http_session,
+                        sanitize_cache_key, translate_dict_values, remove_keys, Message)
 
 
 User = get_user_model()
@@ -158,3 +158,22 @@ class CourseStructureApiClientTests(TestCase):
         client = CourseStructureApiClient('http://example.com/', 'arbitrary_access_token', timeout=2.5)
         # pylint: disable=protected-access
         self.assertEqual(client._store['session'].timeout, 2.5)
+
+
+class HttpSessionTests(TestCase):
+    def test_get_http_session(self):
+        session = get_http_session('data_api')
+        self.assertIs(get_http_session('data_api'), session)
+        self.assertIsNot(get_http_session('lms'), session)
+        self.assertEqual(session.get_adapter('https://example.com')._pool_maxsize,  # pylint: disable=protected-access
+                         settings.HTTP_POOL_MAXSIZE['data_api'])
+
+    def test_get_analytics_api_client(self):
+        client = get_analytics_api_client()
+        self.assertEqual(client.timeout, settings.ANALYTICS_API_DEFAULT_TIMEOUT)
+        self.assertIs(client.session, get_http_session('data_api'))
+        self.assertFalse(client.stream)
+
+        client = get_analytics_api_client(timeout=2.5, stream=True)
+        self.assertEqual(client.timeout, 2.5)
+        self.assertTrue(client.stream)
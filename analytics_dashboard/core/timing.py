@@ -0,0 +1,110 @@
+"""
+Per-request timing of upstream calls, cache access and rendering.
+
+`ServerTimingMiddleware` starts a `RequestTimer` for each request.  Code that talks to an upstream service
+records its duration under a metric name with `timed` (or, for `requests` sessions, `add_response_hook`),
+and the middleware reports the totals in the `Server-Timing` header and a log entry.  Outside of a request,
+e.g. in management commands, nothing is recorded.
+"""
+from contextlib import contextmanager
+import functools
+import threading
+import time
+
+
+_local = threading.local()
+
+
+class RequestTimer(object):
+    """ Total duration and count of the timed operations under each metric name for one request. """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.durations = {}
+        self.counts = {}
+        # Operations may be recorded from the fetch thread pool (see `propagate`)
+        self._lock = threading.Lock()
+
+    def record(self, name, duration):
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + duration
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started_at
+
+    def metrics(self):
+        """ Returns a list of (name, total milliseconds, count) tuples sorted by name. """
+        with self._lock:
+            return [(name, self.durations[name] * 1000, self.counts[name]) for name in sorted(self.durations)]
+
+
+def get_timer():
+    """ Returns the timer for the request being handled by the current thread, or None. """
+    return getattr(_local, 'timer', None)
+
+
+def start_timer():
+    _local.timer = RequestTimer()
+    return _local.timer
+
+
+def stop_timer():
+    """ Stops timing the current request and returns its timer. """
+    timer = get_timer()
+    _local.timer = None
+    return timer
+
+
+@contextmanager
+def timed(name):
+    """ Records the duration of the enclosed block under name. """
+    timer = get_timer()
+    if timer is None:
+        yield
+        return
+
+    start = time.time()
+    try:
+        yield
+    finally:
+        timer.record(name, time.time() - start)
+
+
+def propagate(func):
+    """
+    Wraps func so that, when it is called on another thread, its operations are recorded with the timer of the
+    request that wrapped it.
+    """
+    timer = get_timer()
+    if timer is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = get_timer()
+        _local.timer = timer
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.timer = previous
+
+    return wrapper
+
+
+def add_response_hook(session, name):
+    """
+    Records the duration of every request sent by a `requests` session under name.
+
+    The duration is measured from sending the request until the response headers are parsed, so streamed
+    bodies are not included.
+    """
+    def record_response(response, *args, **kwargs):  # pylint: disable=unused-argument
+        timer = get_timer()
+        if timer is not None:
+            timer.record(name, response.elapsed.total_seconds())
+        return response
+
+    session.hooks['response'].append(record_response)
+    return session
@@ -1,5 +1,9 @@
 from hashlib import md5
+import threading
 
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
 from soapbox.models import Message
 from waffle import switch_is_active
 
@@ -9,10 +13,141 @@ from django.http import Http404
 from django.utils.translation import ugettext_lazy as _
 
 from common import clients
+from core import timing
 
 
 User = get_user_model()
 
+_fetch_executor = None
+_prefetch_executor = None
+_learners_prefetch_executor = None
+_fetch_executor_lock = threading.Lock()
+
+_http_adapters = {}
+_http_sessions = {}
+_http_sessions_lock = threading.Lock()
+
+
+def get_fetch_executor():
+    """
+    Returns the process-wide thread pool used to run independent API requests concurrently.
+
+    The pool is created lazily so that management commands and tests that never fetch
+    concurrently do not spawn threads.
+    """
+    global _fetch_executor  # pylint: disable=global-statement
+    if _fetch_executor is None:
+        with _fetch_executor_lock:
+            if _fetch_executor is None:
+                _fetch_executor = ThreadPoolExecutor(max_workers=settings.PRESENTER_FETCH_MAX_WORKERS)
+    return _fetch_executor
+
+
+def get_prefetch_executor():
+    """
+    Returns the process-wide thread pool used to fill caches in the background with data a user is likely
+    to request next.
+
+    It is separate from the fetch pool, so that prefetching never delays the requests of the page being
+    rendered.
+    """
+    global _prefetch_executor  # pylint: disable=global-statement
+    if _prefetch_executor is None:
+        with _fetch_executor_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(max_workers=settings.PREFETCH_MAX_WORKERS)
+    return _prefetch_executor
+
+
+def get_learners_prefetch_executor():
+    """
+    Returns the process-wide thread pool on which the learner roster page prefetches Data API responses.
+
+    Responses that miss the page's budget keep their thread until LEARNERS_PREFETCH_TIMEOUT, so they are run
+    on this bounded pool rather than the fetch pool, where they would hold up the requests of other pages.
+    """
+    global _learners_prefetch_executor  # pylint: disable=global-statement
+    if _learners_prefetch_executor is None:
+        with _fetch_executor_lock:
+            if _learners_prefetch_executor is None:
+                _learners_prefetch_executor = ThreadPoolExecutor(max_workers=settings.LEARNERS_PREFETCH_MAX_WORKERS)
+    return _learners_prefetch_executor
+
+
+def get_http_adapter(upstream):
+    """
+    Returns the process-wide connection pool for the named upstream service.
+
+    The pool keeps up to HTTP_POOL_MAXSIZE[upstream] connections alive.  Mount it on a session to share
+    those connections with every other session using the same upstream.
+    """
+    adapter = _http_adapters.get(upstream)
+    if adapter is None:
+        with _http_sessions_lock:
+            adapter = _http_adapters.get(upstream)
+            if adapter is None:
+                pool_maxsize = settings.HTTP_POOL_MAXSIZE.get(upstream, settings.HTTP_POOL_MAXSIZE['default'])
+                adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+                _http_adapters[upstream] = adapter
+    return adapter
+
+
+def mount_http_adapter(session, upstream):
+    """ Sends the session's requests through the process-wide connection pool for the named upstream. """
+    adapter = get_http_adapter(upstream)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_http_session(upstream):
+    """
+    Returns the process-wide `requests` session for the named upstream service.
+
+    Requests made by different views and threads through the session reuse its keep-alive connections.
+    Sessions that need their own headers or authentication should use `mount_http_adapter` instead.
+    """
+    session = _http_sessions.get(upstream)
+    if session is None:
+        adapter = get_http_adapter(upstream)
+        with _http_sessions_lock:
+            session = _http_sessions.get(upstream)
+            if session is None:
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                timing.add_response_hook(session, upstream)
+                _http_sessions[upstream] = session
+    return session
+
+
+def get_analytics_api_client(timeout=None, stream=False):
+    """
+    Returns an Analytics Data API client using the process-wide connection pool for the Data API.
+
+    Arguments
+        timeout --  Seconds to wait for the Data API. Defaults to ANALYTICS_API_DEFAULT_TIMEOUT.
+        stream  --  Whether CSV responses should be returned unread (see `common.clients.AnalyticsApiClient`)
+    """
+    if timeout is None:
+        timeout = settings.ANALYTICS_API_DEFAULT_TIMEOUT
+    return clients.AnalyticsApiClient(base_url=settings.DATA_API_URL, auth_token=settings.DATA_API_AUTH_TOKEN,
+                                      timeout=timeout, stream=stream, session=get_http_session('data_api'))
+
+
+def iter_response_content(response, chunk_size=None):
+    """
+    Yields the body of a streamed `requests` response in chunks and closes the response once the
+    body has been consumed (or the consumer stops early).
+    """
+    chunk_size = chunk_size or settings.STREAMING_RESPONSE_CHUNK_SIZE
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                yield chunk
+    finally:
+        response.close()
+
 
 def delete_auto_auth_users():
     if not settings.AUTO_AUTH_USERNAME_PREFIX:
@@ -31,10 +166,12 @@ def sanitize_cache_key(key):
 class CourseStructureApiClient(clients.CourseStructureApiClient):
     """
     A very thin wrapper around `common.clients.CourseStructureApiClient`, which
-    defaults the client timeout to `settings.LMS_DEFAULT_TIMEOUT`.
+    defaults the client timeout to `settings.LMS_DEFAULT_TIMEOUT` and records
+    the duration of its requests as `course_api` (see `core.timing`).
     """
     def __init__(self, url, access_token, timeout=settings.LMS_DEFAULT_TIMEOUT):
         super(CourseStructureApiClient, self).__init__(url, access_token=access_token, timeout=timeout)
+        timing.add_response_hook(self._store['session'], 'course_api')
 
 
 def feature_flagged(feature_flag):
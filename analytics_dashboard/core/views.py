@@ -10,10 +10,10 @@ from django.http import HttpResponse, Http404
 from django.shortcuts import redirect
 from django.views.generic import View, TemplateView
 from django.core.urlresolvers import reverse_lazy
-from analyticsclient.client import Client
 from analyticsclient.exceptions import TimeoutError
 
 from analytics_dashboard.courses import permissions
+from core.utils import get_analytics_api_client
 
 
 logger = logging.getLogger(__name__)
@@ -42,7 +42,7 @@ def health(_request):
         database_status = UNAVAILABLE
 
     try:
-        client = Client(base_url=settings.DATA_API_URL, auth_token=settings.DATA_API_AUTH_TOKEN, timeout=0.35)
+        client = get_analytics_api_client(timeout=0.35)
         # Note: client.status.healthy sends a request to the health endpoint on
         # the Analytics API.  The request may throw a TimeoutError.  Currently,
         # other exceptions are caught by the client.status.healthy method
@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+
+from analyticsclient.exceptions import NotFoundError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.caching import cache
+from courses.exceptions import BaseCourseError
+from courses.presenters.course_summaries import CourseSummariesPresenter
+from courses.presenters.engagement import CourseEngagementVideoPresenter
+from courses.presenters.performance import CoursePerformancePresenter, TagsDistributionPresenter
+from courses.views import CourseValidMixin
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(object):
+    """ Spaces out calls to `wait`, across all threads, so that at most `rate` of them return each second. """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next_at = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.time()
+            start_at = max(self._next_at, now)
+            self._next_at = start_at + self.interval
+
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+class Command(BaseCommand):
+    """
+    A command to fill the caches read by the course pages, so that the first visitor after a cache restart or
+    pipeline run does not wait on the upstream services.
+    """
+
+    help = 'Warm the course validation, structure, grading policy, module data and course summary caches.'
+
+    # Upstream requests made for each course: validation, structure, grading policy and the problem, video
+    # and tag data.
+    REQUESTS_PER_COURSE = 6
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', metavar='COURSE_ID',
+                            help='Courses to warm.  Defaults to every course with a course summary.')
+        parser.add_argument('--org', action='append', dest='orgs', default=[],
+                            help='Only warm the courses of this organization.  May be repeated.')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Number of courses warmed concurrently.')
+        parser.add_argument('--rate', type=float, default=10,
+                            help='Maximum upstream requests per second across all workers.  0 disables the limit.')
+        parser.add_argument('--timeout', type=float, default=30,
+                            help='Seconds to wait for each upstream request.')
+        parser.add_argument('--access-token', default=settings.COURSE_API_KEY,
+                            help='Access token for the Course and Grading Policy APIs.  Defaults to COURSE_API_KEY.')
+        parser.add_argument('--refresh', action='store_true',
+                            help='Fetch every value again, even if it is cached (e.g. after a pipeline run).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report the courses and number of requests that would be made without warming.')
+
+    def handle(self, *args, **options):
+        if not options['access_token']:
+            raise CommandError('An access token is required when COURSE_API_KEY is not set.')
+
+        self.access_token = options['access_token']
+        self.timeout = options['timeout']
+        self.refresh = options['refresh']
+        self.limiter = RateLimiter(options['rate'])
+
+        summaries_presenter = CourseSummariesPresenter(timeout=self.timeout)
+        if self.refresh and not options['dry_run']:
+            # The index lists every course and the creation time of its summary
+            cache.delete(summaries_presenter.CACHE_KEY)
+        course_ids = self.get_course_ids(summaries_presenter, options['course_ids'], options['orgs'])
+        workers = max(options['workers'], 1)
+
+        if options['dry_run']:
+            self.estimate(course_ids, workers, options['rate'], options['verbosity'])
+            return
+
+        started_at = time.time()
+        self.warm_summaries(summaries_presenter, course_ids if options['course_ids'] or options['orgs'] else None)
+
+        failures = 0
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            warmups = {executor.submit(self.warm_course, course_id): course_id for course_id in course_ids}
+            for done, future in enumerate(as_completed(warmups), 1):
+                course_id = warmups[future]
+                try:
+                    elapsed = future.result()
+                except Exception:  # pylint: disable=broad-except
+                    failures += 1
+                    logger.exception('Unable to warm the caches for %s.', course_id)
+                    self.stdout.write(u'[{}/{}] {} failed'.format(done, len(course_ids), course_id))
+                else:
+                    self.stdout.write(u'[{}/{}] {} warmed in {:.1f}s'.format(done, len(course_ids), course_id,
+                                                                            elapsed))
+        finally:
+            executor.shutdown(wait=True)
+
+        self.stdout.write(u'Warmed {} courses in {:.1f}s.'.format(len(course_ids) - failures,
+                                                                 time.time() - started_at))
+        if failures:
+            raise CommandError(u'Unable to warm the caches for {} courses.'.format(failures))
+
+    def get_course_ids(self, summaries_presenter, course_ids, orgs):
+        """ Returns the requested courses, or every course with a summary, filtered by organization. """
+        if not course_ids:
+            self.limiter.wait()
+            course_ids = sorted(summaries_presenter.get_summarized_course_ids())
+
+        if orgs:
+            orgs = set(orgs)
+            course_ids = [course_id for course_id in course_ids if self.get_org(course_id) in orgs]
+
+        return course_ids
+
+    @staticmethod
+    def get_org(course_id):
+        try:
+            return CourseKey.from_string(course_id).org
+        except InvalidKeyError:
+            return None
+
+    def estimate(self, course_ids, workers, rate, verbosity):
+        requests = len(course_ids) * self.REQUESTS_PER_COURSE + 1
+        self.stdout.write(u'Would warm {} courses with {} workers, making up to {} upstream requests.'.format(
+            len(course_ids), workers, requests))
+        if rate:
+            self.stdout.write(u'At {} requests per second, this takes at least {:.0f}s.'.format(
+                rate, requests / rate))
+        if verbosity > 1:
+            for course_id in course_ids:
+                self.stdout.write(course_id)
+
+    def _fetch(self, keys, fetch):
+        """ Waits for the rate limiter and calls fetch, discarding the cached keys first when refreshing. """
+        if self.refresh:
+            cache.delete_many(keys)
+        self.limiter.wait()
+        return fetch()
+
+    def warm_summaries(self, presenter, course_ids):
+        """ Warms the summaries of the courses given, or of every course if course_ids is None. """
+        # Summaries created since they were cached are fetched again, so there is nothing to discard.
+        self.limiter.wait()
+        count = presenter.warm_summaries(course_ids)
+        self.stdout.write(u'Warmed {} course summaries.'.format(count))
+
+    def warm_course(self, course_id):
+        """ Warms the caches of a single course and returns the seconds taken. """
+        started_at = time.time()
+
+        self._fetch([CourseValidMixin.get_validation_cache_key(course_id)],
+                    lambda: CourseValidMixin.validate_courses([course_id]))
+
+        performance_presenter = CoursePerformancePresenter(self.access_token, course_id, self.timeout)
+        self._fetch([performance_presenter.get_cache_key('structure')], performance_presenter.warm_structure)
+        self._fetch([performance_presenter.get_cache_key('grading_policy')], performance_presenter.grading_policy)
+
+        for presenter in [performance_presenter,
+                          CourseEngagementVideoPresenter(self.access_token, course_id, self.timeout),
+                          TagsDistributionPresenter(self.access_token, course_id, self.timeout)]:
+            keys = [presenter.get_cache_key(presenter.module_type)]
+            if self.refresh:
+                # Values built from the structure and module data (e.g. sections) are discarded along with them
+                keys += presenter.get_derived_cache_keys()
+            try:
+                self._fetch(keys, presenter.warm_module_data)
+            except (BaseCourseError, NotFoundError) as e:
+                # Courses without problems or videos have nothing to cache
+                logger.debug(e)
+
+        return time.time() - started_at
@@ -2,18 +2,23 @@ import datetime
 import logging
 
 from django.conf import settings
-from django.core.cache import cache
 from django.dispatch import receiver
 
 from social_django.utils import load_strategy
 
 from auth_backends.backends import EdXOpenIdConnect
 
+from core.caching import cache
+from core.timing import timed
 from courses.exceptions import UserNotAssociatedWithBackendError, InvalidAccessTokenError, \
     PermissionsRetrievalFailedError
 
 logger = logging.getLogger(__name__)
 
+# Attribute of the User instance holding its course permissions for the remainder of the request.  Like the
+# _perm_cache set by Django's ModelBackend, this lives only as long as the instance loaded for the request.
+_COURSE_PERMISSIONS_MEMO_ATTR = '_course_permissions_cache'
+
 
 def _get_course_permission_cache_keys(user):
     """
@@ -52,6 +57,7 @@ def set_user_course_permissions(user, courses):
 
     data = {key_courses: courses, key_last_updated: datetime.datetime.utcnow()}
     cache.set_many(data, settings.COURSE_PERMISSIONS_TIMEOUT)
+    _clear_course_permissions_memo(user)
 
 
 def revoke_user_course_permissions(user):
@@ -62,6 +68,12 @@ def revoke_user_course_permissions(user):
         user (User) --  User for which permissions should be revoked
     """
     cache.delete_many(_get_course_permission_cache_keys(user))
+    _clear_course_permissions_memo(user)
+
+
+def _clear_course_permissions_memo(user):
+    if hasattr(user, _COURSE_PERMISSIONS_MEMO_ATTR):
+        delattr(user, _COURSE_PERMISSIONS_MEMO_ATTR)
 
 
 def refresh_user_course_permissions(user):
@@ -75,7 +87,8 @@ def refresh_user_course_permissions(user):
     # list of courses the user has access as staff and another that the user has access as instructor. The variable
     # `settings.COURSE_PERMISSIONS_CLAIMS` is a list of the claims that contain the courses.
     claims = settings.COURSE_PERMISSIONS_CLAIMS
-    data = _get_user_claims_values(user, claims)
+    with timed('permissions'):
+        data = _get_user_claims_values(user, claims)
     courses_set = set()
     for claim in claims:
         courses_set.update(data.get(claim, []))
@@ -162,6 +175,23 @@ def get_user_course_permissions(user):
     return courses
 
 
+def get_user_course_permission_set(user):
+    """
+    Return a frozenset of the courses accessible by user.
+
+    The set is kept on the user instance, so repeated checks within a request need neither a cache round-trip
+    nor a scan of the course list.
+
+    Arguments
+        user (User) --  User for which course permissions should be returned
+    """
+    courses = getattr(user, _COURSE_PERMISSIONS_MEMO_ATTR, None)
+    if courses is None:
+        courses = frozenset(get_user_course_permissions(user))
+        setattr(user, _COURSE_PERMISSIONS_MEMO_ATTR, courses)
+    return courses
+
+
 def user_can_view_course(user, course_id):
     """
     Returns boolean indicating if specified user can view specified course.
@@ -177,7 +207,7 @@ def user_can_view_course(user, course_id):
     if user.is_superuser:
         return True
 
-    courses = get_user_course_permissions(user)
+    courses = get_user_course_permission_set(user)
 
     return course_id in courses
 
@@ -1,26 +1,46 @@
 import abc
-from collections import OrderedDict
+from collections import namedtuple, OrderedDict
 import datetime
 import logging
 
 from django.conf import settings
-from django.core.cache import cache
 from analyticsclient.client import Client
-from common.course_structure import CourseStructure
-from core.utils import CourseStructureApiClient, sanitize_cache_key
+from opaque_keys import InvalidKeyError
+from common.course_structure import CompactCourseStructure, CourseStructure
+from core import timing
+from core.caching import cache, get_codec, get_or_set
+from core.utils import CourseStructureApiClient, get_analytics_api_client, get_fetch_executor, sanitize_cache_key
 
+from courses import utils
 from courses.exceptions import BaseCourseError
 
 
 logger = logging.getLogger(__name__)
 
+# Lookup tables for the components (e.g. videos, problems) of an annotated course structure:
+#   components  --  dictionary mapping each (section ID, subsection ID, component ID) to the component.  A
+#                   component reused in several subsections is listed under each of them.
+#   siblings    --  components with data, in course order
+#   positions   --  dictionary mapping the ID of each component in siblings to its position
+BlockIndex = namedtuple('BlockIndex', ['components', 'siblings', 'positions'])
+
 
 class BasePresenter(object):
 
     def __init__(self, timeout=settings.ANALYTICS_API_DEFAULT_TIMEOUT):
-        self.client = Client(base_url=settings.DATA_API_URL,
-                             auth_token=settings.DATA_API_AUTH_TOKEN,
-                             timeout=timeout)
+        self.client = get_analytics_api_client(timeout=timeout)
+
+    @staticmethod
+    def submit(func, *args, **kwargs):
+        """
+        Schedules an API call on the shared fetch pool and returns its future.
+
+        Use this to start a request early and collect the result with `future.result()`
+        once it is needed.  Calls must not depend on thread-local state (e.g. the active
+        translation or waffle request caches), other than the request timer, which is
+        carried over so that their upstream calls are still reported.
+        """
+        return get_fetch_executor().submit(timing.propagate(func), *args, **kwargs)
 
     def get_current_date(self):
         return datetime.datetime.utcnow().strftime(Client.DATE_FORMAT)
@@ -63,16 +83,17 @@ class CourseAPIPresenterMixin(object):
     __metaclass__ = abc.ABCMeta
 
     _last_updated = None
+    _structure_index = None
+    _module_ids_by_encoded_id = None
+    _block_index = None
 
     def __init__(self, access_token, course_id, timeout=settings.LMS_DEFAULT_TIMEOUT):
         super(CourseAPIPresenterMixin, self).__init__(course_id, timeout)
-        self.course_api_client = CourseStructureApiClient(settings.COURSE_API_URL, access_token)
+        self.course_api_client = CourseStructureApiClient(settings.COURSE_API_URL, access_token, timeout)
 
     def _get_structure(self):
-        """ Retrieves course structure from the course API. """
-        key = self.get_cache_key('structure')
-        structure = cache.get(key)
-        if not structure:
+        """ Retrieves the course structure from the course API, projected to the fields the presenters use. """
+        def fetch_structure():
             logger.debug('Retrieving structure for course: %s', self.course_id)
             blocks_kwargs = {
                 'course_id': self.course_id,
@@ -80,10 +101,49 @@ class CourseAPIPresenterMixin(object):
                 'all_blocks': 'true',
                 'requested_fields': 'children,format,graded',
             }
-            structure = self.course_api_client.blocks().get(**blocks_kwargs)
-            cache.set(key, structure)
+            return CompactCourseStructure.from_blocks(self.course_api_client.blocks().get(**blocks_kwargs),
+                                                      encode_id=self._encode_module_id)
+
+        return get_or_set(self.get_cache_key('structure'), fetch_structure, codec=get_codec())
 
-        return structure
+    @staticmethod
+    def _encode_module_id(block_id):
+        """
+        Returns the encoded module ID of a block, or None if it has none.  Block IDs are encoded once, when the
+        structure is fetched, rather than on every lookup.
+        """
+        try:
+            return utils.get_encoded_module_id(block_id)
+        except InvalidKeyError:
+            return None
+
+    def encoded_module_id(self, module_id):
+        """ Returns the encoded form of a course structure module ID, as used by the data API. """
+        encoded_module_id = self._get_structure_index().encoded_module_id(module_id)
+        if encoded_module_id is None:
+            # not in the structure
+            encoded_module_id = utils.get_encoded_module_id(module_id)
+        return encoded_module_id
+
+    def module_id_from_encoded_id(self, encoded_module_id):
+        """ Returns the course structure module ID for an encoded module ID, or None if there is none. """
+        if self._module_ids_by_encoded_id is None:
+            structure = self._get_structure_index()
+            self._module_ids_by_encoded_id = {
+                encoded_id: module_id
+                for module_id, encoded_id in zip(structure.ids, structure.encoded_module_ids or [])
+                if encoded_id is not None
+            }
+        return self._module_ids_by_encoded_id.get(encoded_module_id)
+
+    def _get_structure_index(self):
+        """
+        Returns the CompactCourseStructure of the course.  It is loaded once per presenter and shared by
+        every consumer of the structure.
+        """
+        if self._structure_index is None:
+            self._structure_index = self._get_structure()
+        return self._structure_index
 
     @abc.abstractproperty
     def section_type_template(self):
@@ -112,6 +172,32 @@ class CourseAPIPresenterMixin(object):
         """ Returns sanitized key for caching. """
         return sanitize_cache_key(u'{}_{}'.format(self.course_id, name))
 
+    def warm_structure(self):
+        """ Fills the cache with the course structure, if it is not cached already. """
+        self._get_structure()
+
+    def warm_module_data(self):
+        """ Fills the cache with the course module data, if it is not cached already. """
+        self._course_module_data()
+
+    def get_derived_cache_keys(self):
+        """
+        Returns the keys of the cached values built from the course structure and module data (e.g. the
+        sections), so that they can be discarded along with them.
+        """
+        sections = cache.get(self.get_cache_key(self.all_sections_key))
+        if sections is None:
+            sections = CourseStructure.course_structure_to_sections(self._get_structure_index(), self.module_type,
+                                                                    graded=self.module_graded_type)
+
+        names = [self.all_sections_key, self.section_type_template.format(None, None),
+                 '{}_last_updated'.format(self.module_type)]
+        for section in sections:
+            names.append(self.section_type_template.format(section['id'], None))
+            for subsection in section['children']:
+                names.append(self.section_type_template.format(section['id'], subsection['id']))
+        return [self.get_cache_key(name) for name in names]
+
     def course_structure(self, section_id=None, subsection_id=None):
         """
         Returns course structure from cache.  If structure isn't found, it is fetched from the
@@ -130,7 +216,7 @@ class CourseAPIPresenterMixin(object):
             found_structure = cache.get(all_sections_key)
 
             if not found_structure:
-                structure = self._get_structure()
+                structure = self._get_structure_index()
                 found_structure = CourseStructure.course_structure_to_sections(structure, self.module_type,
                                                                                graded=self.module_graded_type)
                 cache.set(all_sections_key, found_structure)
@@ -189,38 +275,35 @@ class CourseAPIPresenterMixin(object):
         """
         pass
 
-    def _course_module_data(self):
-        """ Retrieves course problems (from cache or course API) and calls process_module_data to attach data. """
-
-        key = self.get_cache_key(self.module_type)
-        module_data = cache.get(key)
-
-        if not module_data:
-            module_data = self.fetch_course_module_data()
+    def _fetch_and_process_course_module_data(self):
+        """ Fetches course module data and builds a lookup table of it keyed by module ID. """
+        module_data = self.fetch_course_module_data()
 
-            # Create a lookup table so that submission data can be quickly retrieved by downstream consumers.
-            table = OrderedDict()
-            last_updated = datetime.datetime.min
+        # Create a lookup table so that submission data can be quickly retrieved by downstream consumers.
+        table = OrderedDict()
+        last_updated = datetime.datetime.min
 
-            for datum in module_data:
-                self.attach_computed_data(datum)
-                table[datum['id']] = datum
+        for datum in module_data:
+            self.attach_computed_data(datum)
+            table[datum['id']] = datum
 
-                # Set the last_updated value
-                created = datum.pop('created', None)
-                if created:
-                    created = self.parse_api_datetime(created)
-                    last_updated = max(last_updated, created)
+            # Set the last_updated value
+            created = datum.pop('created', None)
+            if created:
+                created = self.parse_api_datetime(created)
+                last_updated = max(last_updated, created)
 
-            if last_updated is not datetime.datetime.min:
-                _key = self.get_cache_key('{}_last_updated'.format(self.module_type))
-                cache.set(_key, last_updated)
-                self._last_updated = last_updated
+        if last_updated is not datetime.datetime.min:
+            _key = self.get_cache_key('{}_last_updated'.format(self.module_type))
+            cache.set(_key, last_updated)
+            self._last_updated = last_updated
 
-            module_data = table
-            cache.set(key, module_data)
+        return table
 
-        return module_data
+    def _course_module_data(self):
+        """ Retrieves course problems (from cache or course API) and calls process_module_data to attach data. """
+        return get_or_set(self.get_cache_key(self.module_type), self._fetch_and_process_course_module_data,
+                          codec=get_codec())
 
     def module_id_to_data_id(self, module):
         """ Translates the course structure module to the ID used by the analytics data API. """
@@ -301,19 +384,34 @@ class CourseAPIPresenterMixin(object):
             return subsections.get('children', None)
         return None
 
+    def _get_block_index(self):
+        """
+        Returns the BlockIndex of the annotated course structure.  It is built once per presenter, so repeated
+        child and sibling lookups do not walk the course again.
+        """
+        if self._block_index is None:
+            components = {}
+            siblings = []
+            positions = {}
+            for section in self.sections() or []:
+                for subsection in section['children']:
+                    for component in subsection['children']:
+                        components.setdefault((section['id'], subsection['id'], component['id']), component)
+                        # Only consider siblings with data, hence with URLs
+                        if component.get('url'):
+                            positions.setdefault(component['id'], len(siblings))
+                            siblings.append(component)
+            self._block_index = BlockIndex(components, siblings, positions)
+        return self._block_index
+
     def subsection_child(self, section_id, subsection_id, child_id):
         """ Return the specified child of a subsection (e.g. problem, video). """
-        found_child = None
-        children = self.subsection_children(section_id, subsection_id)
-        if children:
-            found_children = [child for child in children if child['id'] == child_id]
-            found_child = found_children[0] if found_children else None
-        return found_child
+        return self._get_block_index().components.get((section_id, subsection_id, child_id))
 
     def block(self, block_id):
         """ Retrieve a specific block (e.g. problem, video). """
-        block = self._get_structure()['blocks'][block_id]
-        block['name'] = block.get('display_name')
+        block = self._get_structure_index().block(block_id)
+        block['name'] = block['display_name']
         return block
 
     def sibling_block(self, block_id, sibling_offset):
@@ -324,25 +422,17 @@ class CourseAPIPresenterMixin(object):
         its requested sibling.  Returns `None` if no such sibling is found.
         Only siblings with data are returned.
         """
-        sections = self.sections()
-        siblings = [
-            component
-            for section in sections
-            for subsection in section['children']
-            for component in subsection['children']
-            if component.get('url')  # Only consider siblings with data, hence with URLs
-        ]
-        try:
-            block_index = (index for index, sibling in enumerate(siblings) if sibling['id'] == block_id).next()
-            sibling_index = block_index + sibling_offset
-            if sibling_index < 0:
-                return None
-            return siblings[sibling_index]
-        except (StopIteration, IndexError):
-            # StopIteration: requested video not found in the course structure
-            # IndexError: No such video with the requested offset
+        index = self._get_block_index()
+        block_index = index.positions.get(block_id)
+        if block_index is None:
+            # requested video not found in the course structure
             return None
 
+        sibling_index = block_index + sibling_offset
+        if 0 <= sibling_index < len(index.siblings):
+            return index.siblings[sibling_index]
+        return None
+
     def next_block(self, block_id):
         """
         Get the next block in the course with the same block type as the block
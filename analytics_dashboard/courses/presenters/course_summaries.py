@@ -1,14 +1,21 @@
+from collections import OrderedDict
+
 from django.conf import settings
-from django.core.cache import cache
 from waffle import switch_is_active
 
+from core.caching import cache, get_or_set
+from core.utils import sanitize_cache_key
 from courses.presenters import BasePresenter
 
 
 class CourseSummariesPresenter(BasePresenter):
     """ Presenter for the course enrollment data. """
 
-    CACHE_KEY = 'summaries'
+    # Caches a mapping of every course ID to the creation time of its summary.  Each summary is cached
+    # separately and is only fetched again when its creation time changes.
+    CACHE_KEY = 'summaries_index'
+    # Summaries are cached per set of excluded fields, since it depends on the enabled features
+    SUMMARY_CACHE_KEY_TEMPLATE = u'summaries_{course_id}_{exclude}'
     NON_NULL_STRING_FIELDS = ['course_id', 'catalog_course', 'catalog_course_title',
                               'start_date', 'end_date', 'pacing_type', 'availability']
 
@@ -17,35 +24,112 @@ class CourseSummariesPresenter(BasePresenter):
         """Filter results to just the course IDs specified."""
         if course_ids is None:
             return all_summaries
+        course_ids = set(course_ids)
         return [summary for summary in all_summaries if summary['course_id'] in course_ids]
 
+    @classmethod
+    def get_summary_cache_key(cls, course_id, exclude):
+        return sanitize_cache_key(cls.SUMMARY_CACHE_KEY_TEMPLATE.format(course_id=course_id,
+                                                                        exclude='_'.join(sorted(exclude))))
+
+    @staticmethod
+    def get_excluded_fields():
+        """Returns the summary fields that are not requested from the analytics data API."""
+        exclude = ['programs']  # we make a separate call to the programs endpoint
+        if not switch_is_active('enable_course_passing'):
+            exclude.append('passing_users')
+        return exclude
+
+    @staticmethod
+    def _missing_summary(created):
+        """
+        Returns the entry cached for a course without a summary, so that it is not requested again until the
+        index records a summary created at a different time.
+        """
+        return {'created': created, 'missing': True}
+
+    def _get_summaries_index(self):
+        """Returns a dictionary mapping each course ID to the creation time of its summary."""
+        def fetch_index():
+            summaries = self.client.course_summaries().course_summaries(fields=['course_id', 'created'])
+            return {summary['course_id']: summary['created'] for summary in summaries}
+
+        return get_or_set(self.CACHE_KEY, fetch_index, settings.COURSE_SUMMARIES_CACHE_TIMEOUT)
+
+    def get_summarized_course_ids(self):
+        """Returns the ID of every course with a summary."""
+        return self._get_summaries_index().keys()
+
+    def warm_summaries(self, course_ids=None):
+        """
+        Fills the cache with the summaries of the courses given, or of every course if course_ids is None, and
+        returns the number of summaries.
+        """
+        return len(self._get_summaries(course_ids))
+
+    def _fetch_summaries(self, exclude, course_ids=None):
+        """Fetches course summaries from the analytics data API, fetching all summaries if course_ids is None."""
+        summaries = self.client.course_summaries().course_summaries(course_ids=course_ids, exclude=exclude)
+        return [
+            {
+                field: (
+                    '' if val is None and field in self.NON_NULL_STRING_FIELDS
+                    else val
+                )
+                for field, val in summary.items()
+            } for summary in summaries
+        ]
+
     def _get_summaries(self, course_ids=None):
         """Returns list of course summaries.
 
-        If requesting full list and it's not cached or requesting a subset of course_summaries with the course_ids
-        parameter, summaries will be fetched from the analytics data API.
+        Summaries are read from the cache in a single batch.  Those that are missing, or that were created
+        before the time recorded in the summaries index, are fetched from the analytics data API and cached.
+        Courses missing from the index are fetched too, since the index may predate their summaries.  Courses
+        the API has no summary for are cached as missing.
         """
-        summaries = None
+        index = self._get_summaries_index()
+        exclude = self.get_excluded_fields()
         if course_ids is None:
-            # we only cache the full list of summaries
-            summaries = cache.get(self.CACHE_KEY)
-        if summaries is None:
-            exclude = ['programs']  # we make a separate call to the programs endpoint
-            if not switch_is_active('enable_course_passing'):
-                exclude.append('passing_users')
-            summaries = self.client.course_summaries().course_summaries(course_ids=course_ids, exclude=exclude)
-            summaries = [
-                {
-                    field: (
-                        '' if val is None and field in self.NON_NULL_STRING_FIELDS
-                        else val
-                    )
-                    for field, val in summary.items()
-                } for summary in summaries
-            ]
-            if course_ids is None:
-                cache.set(self.CACHE_KEY, summaries, settings.COURSE_SUMMARIES_CACHE_TIMEOUT)
-        return summaries
+            course_ids = index.keys()
+        else:
+            # drop duplicates
+            course_ids = OrderedDict.fromkeys(course_ids).keys()
+
+        cache_keys = {course_id: self.get_summary_cache_key(course_id, exclude) for course_id in course_ids}
+        cached = cache.get_many(cache_keys.values())
+
+        summaries = {}
+        for course_id, cache_key in cache_keys.iteritems():
+            summary = cached.get(cache_key)
+            if summary is not None and summary['created'] == index.get(course_id, summary['created']):
+                summaries[course_id] = summary
+
+        missing_course_ids = [course_id for course_id in course_ids if course_id not in summaries]
+        if missing_course_ids:
+            if len(missing_course_ids) > settings.COURSE_SUMMARIES_IDS_CUTOFF:
+                # Request all courses from the Analytics API rather than sending a very long ID list
+                fetched = self._fetch_summaries(exclude)
+            else:
+                fetched = self._fetch_summaries(exclude, course_ids=missing_course_ids)
+
+            fetched = {summary['course_id']: summary for summary in fetched}
+            entries = {self.get_summary_cache_key(course_id, exclude): summary
+                       for course_id, summary in fetched.iteritems()}
+            entries.update((self.get_summary_cache_key(course_id, exclude), self._missing_summary(index.get(course_id)))
+                           for course_id in missing_course_ids if course_id not in fetched)
+            cache.set_many(entries, settings.COURSE_SUMMARY_CACHE_TIMEOUT)
+            summaries.update((course_id, fetched[course_id])
+                             for course_id in missing_course_ids if course_id in fetched)
+
+            if any(course_id not in index or summary['created'] > index[course_id]
+                   for course_id, summary in fetched.iteritems()):
+                # The summaries were created after the index was cached (e.g. by a pipeline run), so it is
+                # fetched again rather than sending every request for them upstream until it expires.
+                cache.delete(self.CACHE_KEY)
+
+        return [summaries[course_id] for course_id in course_ids
+                if course_id in summaries and not summaries[course_id].get('missing')]
 
     def _get_last_updated(self, summaries):
         # all the create times should be the same, so just use the first one
@@ -59,13 +143,7 @@ class CourseSummariesPresenter(BasePresenter):
         Returns course summaries that match those listed in course_ids.  If
         no course IDs provided, all data will be returned.
         """
-        if course_ids and len(course_ids) > settings.COURSE_SUMMARIES_IDS_CUTOFF:
-            # Request all courses from the Analytics API and filter here
-            all_summaries = self._get_summaries()
-            summaries = self.filter_summaries(all_summaries, course_ids)
-        else:
-            # Request courses only in ID list from the Analytics API
-            summaries = self._get_summaries(course_ids=course_ids)
+        summaries = self._get_summaries(course_ids=course_ids)
 
         # sort by title by default with "None" values at the end
         summaries = sorted(
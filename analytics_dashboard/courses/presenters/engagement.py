@@ -269,7 +269,7 @@ class CourseEngagementVideoPresenter(CourseAPIPresenterMixin, CoursePresenter):
         The data api only has the encoded module ID.  This converts the course structure ID
         to the encoded form.
         """
-        return utils.get_encoded_module_id(module['id'])
+        return self.encoded_module_id(module['id'])
 
     def get_video_timeline(self, video_module):
         """ Returns the video timeline with gaps in the beginning and end filled in with zeros. """
@@ -124,9 +124,10 @@ class CourseEnrollmentPresenter(CoursePresenter):
         valid_modes = self._get_valid_enrollment_modes(trends)
         invalid_modes = set(enrollment_modes.ALL) - valid_modes
 
-        for trend in trends:
-            for mode in invalid_modes:
-                trend.pop(mode, None)
+        if invalid_modes:
+            for trend in trends:
+                for mode in invalid_modes:
+                    trend.pop(mode, None)
 
         # hides verified enrollment counts in the summary card if it doesn't exist
         if enrollment_modes.VERIFIED not in valid_modes:
@@ -135,20 +136,33 @@ class CourseEnrollmentPresenter(CoursePresenter):
         return summary, trends
 
     def _fill_trend(self, api_response):
-        """ Fills in enrollment counts for missing days in the trend data for display. """
-        if api_response:
-            start_date = self.parse_api_date(api_response[0]['date'])
-            end_date = self.parse_api_date(api_response[-1]['date'])
-            days_apart = (end_date - start_date).days
+        """
+        Fills in enrollment counts for missing days in the trend data for display.
 
-            for day_change in range(days_apart):
-                expected_date = start_date + datetime.timedelta(days=day_change)
-                current_date = self.parse_api_date(api_response[day_change]['date'])
+        Missing days repeat the counts of the preceding day.  The trend is built in a single pass, so long-running
+        courses with years of daily data are not slowed down by repeated list insertions.
+        """
+        if not api_response:
+            return api_response
 
-                if current_date > expected_date:
-                    api_response.insert(day_change, self._clone_datapoint(api_response[day_change - 1], expected_date))
+        one_day = datetime.timedelta(days=1)
+        filled = []
+        previous = None
+        previous_date = None
 
-        return api_response
+        for datum in api_response:
+            current_date = self.parse_api_date(datum['date'])
+            if previous is not None:
+                expected_date = previous_date + one_day
+                while expected_date < current_date:
+                    filled.append(self._clone_datapoint(previous, expected_date))
+                    expected_date += one_day
+
+            filled.append(datum)
+            previous = datum
+            previous_date = current_date
+
+        return filled
 
     def _clone_datapoint(self, datapoint, new_date):
         """
@@ -348,113 +362,88 @@ class CourseEnrollmentDemographicsPresenter(CoursePresenter):
 
         if api_response:
             last_updated = self.parse_api_datetime(api_response[0]['created'])
-            api_response = sorted(api_response, key=lambda i: i['birth_year'], reverse=True)
-            summary = self._build_ages_summary(api_response)
-            binned_ages = self._build_binned_ages(api_response)
-            known_enrollment_percent = self._calculate_known_total_percent(api_response, 'birth_year')
+            histogram, unknown_count = self._build_age_histogram(api_response)
+            summary = self._build_ages_summary(histogram)
+            binned_ages = self._build_binned_ages(histogram, unknown_count)
+            known_count = sum(histogram)
+            known_enrollment_percent = utils.math.calculate_percent(known_count, known_count + unknown_count)
 
         return last_updated, summary, binned_ages, known_enrollment_percent
 
-    def _count_ages(self, api_response, min_age, max_age):
+    def _build_age_histogram(self, api_response):
         """
-        Returns the number of enrollments between min_age (inclusive) and
-        max_age (exclusive).
+        Returns a list of enrollment counts indexed by age, and the number of enrollments with unknown ages.
+
+        The list covers at least the ages up to MAX_AGE.  Birth years in the future are counted as age zero.
         """
         current_year = datetime.date.today().year
-        filtered_ages = api_response
+        ages = []
+        unknown_count = 0
+        for datum in api_response:
+            if datum['birth_year']:
+                ages.append((max(current_year - int(datum['birth_year']), 0), datum['count']))
+            else:
+                unknown_count += datum['count']
 
-        if min_age:
-            filtered_ages = ([datum for datum in filtered_ages
-                              if datum['birth_year'] and (current_year - datum['birth_year']) >= min_age])
-        if max_age:
-            filtered_ages = ([datum for datum in filtered_ages
-                              if datum['birth_year'] and (current_year - datum['birth_year']) < max_age])
-        return self.sum_counts(filtered_ages)
+        histogram = [0] * (max([self.MAX_AGE] + [age for age, _count in ages]) + 1)
+        for age, count in ages:
+            histogram[age] += count
 
-    def _calculate_median_age(self, api_response):
-        current_year = datetime.date.today().year
-        total_enrollment = self.sum_counts(api_response)
+        return histogram, unknown_count
+
+    def _calculate_median_age(self, histogram):
+        total_enrollment = sum(histogram)
         half_enrollments = total_enrollment * 0.5
         count_enrollments = 0
-        for index, datum in enumerate(api_response):
-            age = current_year - datum['birth_year']
-            count_enrollments += datum['count']
+        for age, count in enumerate(histogram):
+            if not count:
+                continue
+            count_enrollments += count
 
             if count_enrollments > half_enrollments:
                 return age
             elif count_enrollments == half_enrollments:
                 if total_enrollment % 2 == 0:
-                    # When no single median value, calculate the mean between the flanking ages.  It will always
-                    # be the case that at the loop can be advanced
-                    next_age = current_year - api_response[index + 1]['birth_year']
+                    # When no single median value, calculate the mean between the flanking ages.  There is
+                    # always an older age with enrollments, since only half of them have been counted.
+                    next_age = next(next_age for next_age in range(age + 1, len(histogram)) if histogram[next_age])
                     return (next_age + age) * 0.5
                 return age
 
         return None
 
-    def _build_ages_summary(self, api_response):
+    def _build_ages_summary(self, histogram):
         """ Returns age metrics, excluding unknown ages. """
-        known_ages = [i for i in api_response if i['birth_year']]
-        summary = {'median': self._calculate_median_age(known_ages)}
-        summary_params = [
-            {
-                'field': 'age_25_and_under',
-                'ages': [None, 26]
-            },
-            {
-                'field': 'age_26_to_40',
-                'ages': [26, 41]
-            },
-            {
-                'field': 'age_41_and_over',
-                'ages': [41, None]
-            }
-        ]
+        # cumulative[age] is the number of enrollments younger than age
+        cumulative = [0]
+        for count in histogram:
+            cumulative.append(cumulative[-1] + count)
+        known_enrollment_total = cumulative[-1]
+
+        counts = {
+            'age_25_and_under': cumulative[26],
+            'age_26_to_40': cumulative[41] - cumulative[26],
+            'age_41_and_over': known_enrollment_total - cumulative[41],
+        }
 
         # calculate the percentages for each age range
-        known_enrollment_total = self._calculate_known_total_enrollment(api_response, 'birth_year')
-        for params in summary_params:
-            age_range = params['ages']
-            count = self._count_ages(api_response, age_range[0], age_range[1])
-            summary[params['field']] = utils.math.calculate_percent(count, known_enrollment_total)
-
+        summary = {field: utils.math.calculate_percent(count, known_enrollment_total)
+                   for field, count in counts.iteritems()}
+        summary['median'] = self._calculate_median_age(histogram)
         return summary
 
-    def _build_binned_ages(self, api_response):
-        current_year = datetime.date.today().year
-        known_ages = [i for i in api_response if i['birth_year']]
-        enrollment_total = self.sum_counts(api_response)
-
-        binned_ages = [{'age': current_year - int(datum['birth_year']),
-                        'count': datum['count'],
-                        'percent': utils.math.calculate_percent(datum['count'], enrollment_total)}
-                       for datum in known_ages]
-
-        # fill in ages with no counts for display
-        for age in range(self.MAX_AGE + 1):
-            try:
-                binned = next(binned for binned in binned_ages if binned['age'] is age)
-            except StopIteration:
-                binned = None
-            if not binned:
-                binned = {'age': age, 'count': 0, 'percent': 0}
-                binned_ages.append(binned)
-
-        # fill in gaps may have altered the ordering
-        binned_ages = sorted(binned_ages, key=lambda i: i['age'], reverse=False)
-
-        # bin all the ages above MAX_AGE (e.g. 100) and remove them from the dataset
-        elderly = [datum for datum in binned_ages if datum['age'] > self.MAX_AGE]
-        elderly_bin = next(binned for binned in binned_ages if binned['age'] is self.MAX_AGE)
-        for datum in elderly:
-            elderly_bin['count'] = elderly_bin['count'] + datum['count']
-            binned_ages.remove(datum)
-        elderly_bin['percent'] = utils.math.calculate_percent(elderly_bin['count'], enrollment_total)
+    def _build_binned_ages(self, histogram, unknown_count):
+        enrollment_total = sum(histogram) + unknown_count
+
+        # bin all the ages at and above MAX_AGE (e.g. 100)
+        counts = histogram[:self.MAX_AGE] + [sum(histogram[self.MAX_AGE:])]
+        binned_ages = [{'age': age,
+                        'count': count,
+                        'percent': utils.math.calculate_percent(count, enrollment_total)}
+                       for age, count in enumerate(counts)]
 
         # tack enrollment counts for learners with unknown ages
-        unknown = [i for i in api_response if not i['birth_year']]
-        if unknown:
-            unknown_count = unknown[0]['count']
+        if unknown_count:
             binned_ages.append({
                 'age': _('Unknown'),
                 'count': unknown_count,
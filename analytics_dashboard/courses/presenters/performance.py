@@ -1,14 +1,15 @@
 from collections import namedtuple, OrderedDict
 import logging
+import threading
+import uuid
 from slugify import slugify
 
-from analyticsclient.exceptions import NotFoundError
+from analyticsclient.exceptions import ClientError, NotFoundError
 from django.conf import settings
-from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.utils.translation import ugettext_lazy as _
-from edx_rest_api_client.exceptions import HttpClientError
-from core.utils import (CourseStructureApiClient, sanitize_cache_key)
+from core.caching import cache, get_codec, get_or_set
+from core.utils import (CourseStructureApiClient, get_prefetch_executor, sanitize_cache_key)
 
 from common.course_structure import CourseStructure
 from courses import utils
@@ -18,6 +19,10 @@ from courses.presenters import (CoursePresenter, CourseAPIPresenterMixin)
 
 logger = logging.getLogger(__name__)
 
+# Number of answer distributions being prefetched for each course
+_prefetching = {}
+_prefetching_lock = threading.Lock()
+
 # Stores the answer distribution return from CoursePerformancePresenter
 AnswerDistributionEntry = namedtuple('AnswerDistributionEntry', [
     'last_updated',
@@ -30,6 +35,19 @@ AnswerDistributionEntry = namedtuple('AnswerDistributionEntry', [
     'problem_part_description'
 ])
 
+# Answer distribution of a problem, as cached by CoursePerformancePresenter: its questions, without labels,
+# in part order, and a dictionary mapping each part ID to its AnswerDistributionPart.
+ProblemAnswerDistribution = namedtuple('ProblemAnswerDistribution', ['questions', 'parts'])
+
+# Answers to one part of a problem, sorted by descending count, and what is displayed for them
+AnswerDistributionPart = namedtuple('AnswerDistributionPart', [
+    'answer_distribution',
+    'answer_distribution_limited',
+    'is_random',
+    'answer_type',
+    'last_updated'
+])
+
 
 class CoursePerformancePresenter(CourseAPIPresenterMixin, CoursePresenter):
     """
@@ -44,7 +62,8 @@ class CoursePerformancePresenter(CourseAPIPresenterMixin, CoursePresenter):
 
     def __init__(self, access_token, course_id, timeout=settings.LMS_DEFAULT_TIMEOUT):
         super(CoursePerformancePresenter, self).__init__(access_token, course_id, timeout)
-        self.grading_policy_client = CourseStructureApiClient(settings.GRADING_POLICY_API_URL, access_token)
+        self.grading_policy_client = CourseStructureApiClient(settings.GRADING_POLICY_API_URL, access_token,
+                                                              timeout)
 
     def course_module_data(self):
         try:
@@ -56,38 +75,118 @@ class CoursePerformancePresenter(CourseAPIPresenterMixin, CoursePresenter):
         """
         Retrieve answer distributions for a particular module/problem and problem part.
         """
+        distribution = self._get_problem_answer_distribution(problem_id)
+        part = distribution.parts.get(problem_part_id)
+        if part is None:
+            raise NotFoundError
 
-        module = self.client.modules(self.course_id, problem_id)
+        questions = self._build_questions(distribution.questions)
+        active_question = [q for q in questions if q['part_id'] == problem_part_id][0]
+        self._last_updated = part.last_updated
 
-        api_response = module.answer_distribution()
-        questions = self._build_questions(api_response)
+        return AnswerDistributionEntry(part.last_updated, questions, active_question['question'],
+                                       part.answer_distribution, part.answer_distribution_limited, part.is_random,
+                                       part.answer_type, active_question['short_description'])
 
-        filtered_active_question = [i for i in questions if i['part_id'] == problem_part_id]
-        if not filtered_active_question:
-            raise NotFoundError
-        else:
-            active_question = filtered_active_question[0]['question']
+    def _get_problem_answer_distribution(self, problem_id):
+        """
+        Returns the ProblemAnswerDistribution of a problem.  It is cached, so switching between the parts of
+        a problem does not fetch and process its answers again.
+        """
+        def fetch_answer_distribution():
+            api_response = self.client.modules(self.course_id, problem_id).answer_distribution()
+            return self._build_problem_answer_distribution(api_response)
 
-        answer_distributions = self._build_answer_distribution(api_response, problem_part_id)
-        problem_part_description = self._build_problem_description(problem_part_id, questions)
+        return get_or_set(self._get_answer_distribution_cache_key(problem_id), fetch_answer_distribution,
+                          codec=get_codec())
 
-        is_random = self._is_answer_distribution_random(answer_distributions)
-        answer_distribution_limited = None
-        if not is_random:
-            # only display the top in the chart
-            answer_distribution_limited = answer_distributions[:self.CHART_LIMIT]
+    def prefetch_answer_distributions(self, problem_ids):
+        """
+        Fetches the answer distributions of the problems into the cache on the prefetch thread pool, skipping
+        those that are cached already.  At most ANSWER_DISTRIBUTION_PREFETCH_COURSE_LIMIT distributions of the
+        course are fetched at once; the remaining problems are skipped rather than queued.
+        """
+        keys = {problem_id: self._get_answer_distribution_cache_key(problem_id) for problem_id in problem_ids}
+        cached = cache.get_many(keys.values())
+
+        for problem_id in problem_ids:
+            if keys[problem_id] in cached:
+                continue
+
+            with _prefetching_lock:
+                if _prefetching.get(self.course_id, 0) >= settings.ANSWER_DISTRIBUTION_PREFETCH_COURSE_LIMIT:
+                    logger.debug('Skipped prefetching answer distributions for %s: too many in progress.',
+                                 self.course_id)
+                    return
+                _prefetching[self.course_id] = _prefetching.get(self.course_id, 0) + 1
+
+            try:
+                get_prefetch_executor().submit(self._prefetch_answer_distribution, problem_id)
+            except Exception:  # pylint: disable=broad-except
+                # e.g. the pool has been shut down
+                logger.exception('Unable to prefetch the answer distribution for %s.', problem_id)
+                self._release_prefetch_slot()
+                return
+
+    def _prefetch_answer_distribution(self, problem_id):
+        try:
+            self._get_problem_answer_distribution(problem_id)
+        except NotFoundError:
+            logger.debug('No answer distribution to prefetch for %s.', problem_id)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Unable to prefetch the answer distribution for %s.', problem_id)
+        finally:
+            self._release_prefetch_slot()
+
+    def _release_prefetch_slot(self):
+        with _prefetching_lock:
+            _prefetching[self.course_id] -= 1
+            if not _prefetching[self.course_id]:
+                del _prefetching[self.course_id]
+
+    def _get_answer_distribution_cache_key(self, problem_id):
+        return self.get_cache_key(u'answer_distribution_{}'.format(problem_id))
+
+    def _build_problem_answer_distribution(self, api_response):
+        """ Groups the answers by part and computes what is displayed for each part. """
+        part_id_to_problem = {}
+        part_answers = {}
+        for answer_dist in api_response:
+            part_id = answer_dist['part_id']
+            part_id_to_problem[part_id] = {
+                'part_id': part_id,
+                'question': answer_dist.get('question_text', None),
+                'problem_name': answer_dist.get('problem_display_name', None)
+            }
 
-        answer_type = self._get_answer_type(answer_distributions)
-        last_updated = self.parse_api_datetime(answer_distributions[0]['created'])
-        self._last_updated = last_updated
+            # First and last response counts were added, we can handle both types of API responses at the moment.
+            # If just the count is specified it is assumed to be the last response count.
+            # TODO: teach downstream logic about first and last response counts
+            count = answer_dist.get('last_response_count')
+            if count is not None:
+                answer_dist['count'] = count
+            part_answers.setdefault(part_id, []).append(answer_dist)
+
+        questions = part_id_to_problem.values()
+        utils.sorting.natural_sort(questions, 'part_id')
+
+        parts = {}
+        for part_id, answer_distributions in part_answers.iteritems():
+            # sort in descending order
+            answer_distributions.sort(key=lambda a: -a['count'])
+
+            is_random = self._is_answer_distribution_random(answer_distributions)
+            answer_distribution_limited = None
+            if not is_random:
+                # only display the top in the chart
+                answer_distribution_limited = answer_distributions[:self.CHART_LIMIT]
 
-        return AnswerDistributionEntry(last_updated, questions, active_question, answer_distributions,
-                                       answer_distribution_limited, is_random, answer_type, problem_part_description)
+            parts[part_id] = AnswerDistributionPart(
+                answer_distributions, answer_distribution_limited, is_random,
+                self._get_answer_type(answer_distributions),
+                self.parse_api_datetime(answer_distributions[0]['created']))
 
-    def _build_problem_description(self, problem_part_id, questions):
-        """ Returns the displayable problem name. """
-        problem = [q for q in questions if q['part_id'] == problem_part_id][0]
-        return problem['short_description']
+        return ProblemAnswerDistribution(questions, parts)
 
     def _get_answer_type(self, answer_distributions):
         """
@@ -112,35 +211,17 @@ class CoursePerformancePresenter(CourseAPIPresenterMixin, CoursePresenter):
         return False
 
     # pylint: disable=redefined-variable-type
-    def _build_questions(self, answer_distributions):
+    def _build_questions(self, problem_questions):
         """
-        Builds the questions and part_id from the answer distribution. Displayed
-        drop down.
+        Labels the questions of a problem, in part order, for the displayed drop down.  Labels are
+        translated, so they are added to copies of the cached questions for each request.
         """
         questions = []
-        part_id_to_problem = {}
-
-        # Collect unique questions from the answer distribution
-        for question_answer in answer_distributions:
-            question = question_answer.get('question_text', None)
-            problem_name = question_answer.get('problem_display_name', None)
-            part_id_to_problem[question_answer['part_id']] = {
-                'question': question,
-                'problem_name': problem_name
-            }
-
-        for part_id, problem in part_id_to_problem.iteritems():
-            questions.append({
-                'part_id': part_id,
-                'question': problem['question'],
-                'problem_name': problem['problem_name']
-            })
-
-        utils.sorting.natural_sort(questions, 'part_id')
 
         # add an enumerated label
-        has_parts = len(questions) > 1
-        for i, question in enumerate(questions):
+        has_parts = len(problem_questions) > 1
+        for i, question in enumerate(problem_questions):
+            question = dict(question)
             text = question['question']
             question_num = i + 1
             question_template = _('Submissions')
@@ -161,22 +242,10 @@ class CoursePerformancePresenter(CourseAPIPresenterMixin, CoursePresenter):
             question['question'] = question_template.format(part_number=question_num, part_description=text)
             question['short_description'] = short_description_template.format(
                 part_number=question_num, part_description=text)
+            questions.append(question)
 
         return questions
 
-    def _build_answer_distribution(self, api_response, problem_part_id):
-        """ Filter for this problem part and sort descending order. """
-        answer_distributions = [i for i in api_response if i['part_id'] == problem_part_id]
-        for answer_dist in answer_distributions:
-            # First and last response counts were added, we can handle both types of API responses at the moment.
-            # If just the count is specified it is assumed to be the last response count.
-            # TODO: teach downstream logic about first and last response counts
-            count = answer_dist.get('last_response_count')
-            if count is not None:
-                answer_dist['count'] = count
-        answer_distributions = sorted(answer_distributions, key=lambda a: -a['count'])
-        return answer_distributions
-
     def grading_policy(self):
         """ Returns the grading policy for the represented course."""
         key = self.get_cache_key('grading_policy')
@@ -267,7 +336,7 @@ class CoursePerformancePresenter(CourseAPIPresenterMixin, CoursePresenter):
             assignments = cache.get(all_assignments_key)
 
             if not assignments:
-                structure = self._get_structure()
+                structure = self._get_structure_index()
                 assignments = CourseStructure.course_structure_to_assignments(
                     structure, graded=True, assignment_type=None)
                 cache.set(all_assignments_key, assignments)
@@ -285,6 +354,22 @@ class CoursePerformancePresenter(CourseAPIPresenterMixin, CoursePresenter):
 
         return assignments
 
+    def get_derived_cache_keys(self):
+        """ Includes the cached assignments, for all assignment types and for each of them. """
+        assignment_types = set(policy['assignment_type'] for policy in self.grading_policy())
+        assignments = cache.get(self.get_cache_key(u'assignments'))
+        if assignments:
+            assignment_types.update(assignment['assignment_type'] for assignment in assignments)
+
+        # Pages request the assignments of a type by its name or its slug
+        names = [u'assignments', u'assignments_None']
+        for assignment_type in assignment_types:
+            names.append(u'assignments_{}'.format(assignment_type))
+            names.append(u'assignments_{}'.format(slugify(assignment_type)))
+
+        keys = super(CoursePerformancePresenter, self).get_derived_cache_keys()
+        return keys + [self.get_cache_key(name) for name in names]
+
     def attach_aggregated_data_to_parent(self, index, parent, url_func=None):
         children = parent['children']
         total_submissions = sum(child.get('total_submissions', 0) for child in children)
@@ -394,12 +479,25 @@ class CoursePerformancePresenter(CourseAPIPresenterMixin, CoursePresenter):
         return False
 
 
+# Tags of the problems of a course, built by TagsDistributionPresenter along with its module data:
+#   version      -- random token identifying the module data the index was built from
+#   values       -- dictionary mapping each tag key to the set of its values
+#   slugs        -- dictionary mapping each tag value to its slug, as used in URLs
+#   distribution -- dictionary mapping each tag key to the aggregated submissions of each of its values, in the
+#                   order the values are first seen, without URLs
+TagIndex = namedtuple('TagIndex', ['version', 'values', 'slugs', 'distribution'])
+
+# Module data of TagsDistributionPresenter, as cached: the lookup table of tagged problems keyed by module ID,
+# and the TagIndex built from it.
+TaggedModuleData = namedtuple('TaggedModuleData', ['table', 'tag_index'])
+
+
 class TagsDistributionPresenter(CourseAPIPresenterMixin, CoursePresenter):
     """
     Presenter for the tags distribution page.
     """
 
-    available_tags = None
+    _tagged_module_data = None
 
     @property
     def section_type_template(self):
@@ -420,6 +518,26 @@ class TagsDistributionPresenter(CourseAPIPresenterMixin, CoursePresenter):
     def get_cache_key(self, name):
         return sanitize_cache_key(u'{}_{}'.format(self.course_id, name))
 
+    def _fetch_and_process_course_module_data(self):
+        """ Builds the TagIndex along with the module data, so that the two are cached and refreshed together. """
+        table = super(TagsDistributionPresenter, self)._fetch_and_process_course_module_data()
+        return TaggedModuleData(table, self._build_tag_index(table))
+
+    def _get_tagged_module_data(self):
+        """ Returns the TaggedModuleData of the course.  It is loaded once per presenter. """
+        if self._tagged_module_data is None:
+            try:
+                logger.debug("Retrieving tags distribution for course: %s", self.course_id)
+                data = super(TagsDistributionPresenter, self)._course_module_data()
+            except ClientError as e:
+                logger.error("Unable to retrieve tags distribution info for %s: %s", self.course_id, e)
+                data = TaggedModuleData({}, self._build_tag_index({}))
+            self._tagged_module_data = data
+        return self._tagged_module_data
+
+    def _course_module_data(self):
+        return self._get_tagged_module_data().table
+
     def fetch_course_module_data(self):
         try:
             problems_and_tags = self.client.courses(self.course_id).problems_and_tags()
@@ -457,17 +575,7 @@ class TagsDistributionPresenter(CourseAPIPresenterMixin, CoursePresenter):
             ...
         }
         """
-        if not self.available_tags:
-            tags_distribution_data = self._get_course_module_data()
-            self.available_tags = {}
-
-            for item in tags_distribution_data.values():
-                for tag_key, tag_values in item['tags'].iteritems():
-                    if tag_key not in self.available_tags:
-                        self.available_tags[tag_key] = set()
-                    for tag_value in tag_values:
-                        self.available_tags[tag_key].add(tag_value)
-        return self.available_tags
+        return self._get_tag_index().values
 
     def get_tags_content_nav(self, key, selected=None):
         """
@@ -477,142 +585,155 @@ class TagsDistributionPresenter(CourseAPIPresenterMixin, CoursePresenter):
         """
         result = []
         selected_item = None
-        tags = self.get_available_tags()
-
-        if key in tags:
-            for item in tags[key]:
-                val = {
-                    'id': item,
-                    'name': item,
-                    'url': reverse('courses:performance:learning_outcomes_section',
-                                   kwargs={'course_id': self.course_id,
-                                           'tag_value': slugify(item)})}
-                if selected == slugify(item):
-                    selected_item = val
-                result.append(val)
-        return result, selected_item
-
-    def _get_course_module_data(self):
-        try:
-            logger.debug("Retrieving tags distribution for course: %s", self.course_id)
-            return self._course_module_data()
-        except HttpClientError as e:
-            logger.error("Unable to retrieve tags distribution info for %s: %s", self.course_id, e)
-            return {}
+        tag_index = self._get_tag_index()
 
-    def _get_course_structure(self):
-        def _update_node(updated_structure, origin_structure, node_id, parent_id=None):
-            """
-            Helper function to get proper course structure.
-            Updates the dict that passed as the first argument (adds the parent to each node)
-            """
-            updated_structure[node_id] = origin_structure[node_id]
-            updated_structure[node_id]['parent'] = parent_id if parent_id else None
-            for child_id in origin_structure[node_id].get("children", []):
-                _update_node(updated_structure, origin_structure, child_id, origin_structure[node_id]['id'])
-
-        updated_structure = OrderedDict()
-        origin_structure = self._get_structure()
-        if origin_structure:
-            _update_node(updated_structure, origin_structure["blocks"], origin_structure['root'])
-        return updated_structure
+        for item in tag_index.values.get(key, []):
+            slug = tag_index.slugs[item]
+            val = {
+                'id': item,
+                'name': item,
+                'url': reverse('courses:performance:learning_outcomes_section',
+                               kwargs={'course_id': self.course_id,
+                                       'tag_value': slug})}
+            if selected == slug:
+                selected_item = val
+            result.append(val)
+        return result, selected_item
 
-    def get_tags_distribution(self, key):
-        tags_distribution_data = self._get_course_module_data()
+    def _get_tag_index(self):
+        return self._get_tagged_module_data().tag_index
 
-        result = OrderedDict()
-        index = 0
+    @staticmethod
+    def _build_tag_index(table):
+        """ Builds the TagIndex of the module data in a single pass over it. """
+        values = {}
+        slugs = {}
+        distribution = {}
 
-        for item in tags_distribution_data.values():
-            if key in item['tags']:
-                tag_values = item['tags'][key]
+        for item in table.values():
+            for tag_key, tag_values in item['tags'].iteritems():
+                values.setdefault(tag_key, set()).update(tag_values)
+                aggregates = distribution.setdefault(tag_key, OrderedDict())
                 for tag_value in tag_values:
-                    if tag_value not in result:
-                        index += 1
-                        result[tag_value] = {
+                    if tag_value not in slugs:
+                        slugs[tag_value] = slugify(tag_value)
+                    if tag_value not in aggregates:
+                        aggregates[tag_value] = {
                             'id': tag_value,
-                            'index': index,
+                            'index': len(aggregates) + 1,
                             'name': tag_value,
                             'num_modules': 0,
                             'total_submissions': 0,
                             'correct_submissions': 0,
                             'incorrect_submissions': 0
                         }
-                    result[tag_value]['num_modules'] += 1
-                    result[tag_value]['total_submissions'] += item['total_submissions']
-                    result[tag_value]['correct_submissions'] += item['correct_submissions']
-                    result[tag_value]['incorrect_submissions'] += item['incorrect_submissions']
+                    aggregates[tag_value]['num_modules'] += 1
+                    aggregates[tag_value]['total_submissions'] += item['total_submissions']
+                    aggregates[tag_value]['correct_submissions'] += item['correct_submissions']
+                    aggregates[tag_value]['incorrect_submissions'] += item['incorrect_submissions']
+
+        for tag_key, aggregates in distribution.iteritems():
+            for item in aggregates.values():
+                item.update({
+                    'average_submissions': (item['total_submissions'] * 1.0) / item['num_modules'],
+                    'average_correct_submissions': (item['correct_submissions'] * 1.0) / item['num_modules'],
+                    'average_incorrect_submissions': (item['incorrect_submissions'] * 1.0) / item['num_modules'],
+                    'correct_percent': utils.math.calculate_percent(item['correct_submissions'],
+                                                                    item['total_submissions']),
+                    'incorrect_percent': utils.math.calculate_percent(item['incorrect_submissions'],
+                                                                      item['total_submissions']),
+                })
+            distribution[tag_key] = aggregates.values()
+
+        return TagIndex(version=uuid.uuid4().hex, values=values, slugs=slugs, distribution=distribution)
+
+    def _get_tagged_modules(self):
+        """
+        Returns a dictionary mapping each tag key to a dictionary mapping the slugs of its values to the modules
+        marked with them, in course order, without indexes and URLs.
 
-        for tag_val, item in result.iteritems():
-            item.update({
-                'average_submissions': (item['total_submissions'] * 1.0) / item['num_modules'],
-                'average_correct_submissions': (item['correct_submissions'] * 1.0) / item['num_modules'],
-                'average_incorrect_submissions': (item['incorrect_submissions'] * 1.0) / item['num_modules'],
+        They are cached for each version of the TagIndex, so they are built again whenever the module data is
+        refreshed.
+        """
+        tag_index = self._get_tag_index()
+        if not tag_index.values:
+            # nothing is tagged, so there is nothing to order by the course structure
+            return {}
+
+        return get_or_set(self.get_cache_key(u'tagged_modules_{}'.format(tag_index.version)),
+                          self._build_tagged_modules, codec=get_codec())
+
+    def _build_tagged_modules(self):
+        """ Orders the tagged modules by the course structure and precomputes what is displayed for each. """
+        tags_distribution_data = self._course_module_data()
+        tag_index = self._get_tag_index()
+
+        # Modules missing from the structure are counted in the distribution but not listed.
+        structure = self._get_structure_index()
+        positions = structure.positions
+        tagged = sorted([(positions[module_id], item) for module_id, item in tags_distribution_data.iteritems()
+                         if item['tags'] and module_id in positions], key=lambda entry: entry[0])
+
+        modules = {}
+        for node, item in tagged:
+            row = {
+                'id': item['id'],
+                'name': self._get_display_path(structure, node),
+                'total_submissions': item['total_submissions'],
+                'correct_submissions': item['correct_submissions'],
+                'incorrect_submissions': item['incorrect_submissions'],
                 'correct_percent': utils.math.calculate_percent(item['correct_submissions'],
                                                                 item['total_submissions']),
                 'incorrect_percent': utils.math.calculate_percent(item['incorrect_submissions'],
                                                                   item['total_submissions']),
-                'url': reverse('courses:performance:learning_outcomes_section',
-                               kwargs={'course_id': self.course_id,
-                                       'tag_value': slugify(tag_val)})
-            })
-        return result.values()
+            }
+            # information about all tags connected with the module
+            for tag_key in tag_index.values:
+                tag_values = item['tags'].get(tag_key)
+                row[tag_key] = u', '.join(tag_values) if tag_values else None
+
+            for tag_key, tag_values in item['tags'].iteritems():
+                modules_by_slug = modules.setdefault(tag_key, {})
+                for slug in set(tag_index.slugs[tag_value] for tag_value in tag_values):
+                    modules_by_slug.setdefault(slug, []).append(row)
+
+        return modules
+
+    @staticmethod
+    def _get_display_path(structure, node):
+        """ Returns the display names of the module, its parent and its grandparent, outermost first. """
+        path = [node]
+        while len(path) < 3 and structure.parents[path[0]] is not None:
+            path.insert(0, structure.parents[path[0]])
+        return u', '.join(structure.display_names[ancestor] for ancestor in path)
 
-    def get_modules_marked_with_tag(self, tag_key, tag_value):
-        tags_distribution_data = self._get_course_module_data()
-        available_tags = self.get_available_tags()
-        intermediate = OrderedDict()
-
-        def _get_tags_info(av_tags, tags):
-            """
-            Helper function to return information about all tags connected with the current item.
-            """
-            data = {}
-            for av_tag_key in av_tags:
-                if av_tag_key in tags and tags[av_tag_key]:
-                    data[av_tag_key] = u', '.join(tags[av_tag_key])
-                else:
-                    data[av_tag_key] = None
-            return data
-
-        for item in tags_distribution_data.values():
-            if tag_key in item['tags']:
-                for item_tag_val in item['tags'][tag_key]:
-                    if tag_value == slugify(item_tag_val):
-                        val = {
-                            'id': item['id'],
-                            'name': item['id'],
-                            'total_submissions': item['total_submissions'],
-                            'correct_submissions': item['correct_submissions'],
-                            'incorrect_submissions': item['incorrect_submissions'],
-                            'correct_percent': utils.math.calculate_percent(item['correct_submissions'],
-                                                                            item['total_submissions']),
-                            'incorrect_percent': utils.math.calculate_percent(item['incorrect_submissions'],
-                                                                              item['total_submissions']),
-                            'url': reverse('courses:performance:learning_outcomes_answers_distribution',
-                                           kwargs={'course_id': self.course_id,
-                                                   'tag_value': tag_value,
-                                                   'problem_id': item['id']})
-                        }
-                        if available_tags:
-                            val.update(_get_tags_info(available_tags, item['tags']))
-                        intermediate[item['id']] = val
+    def get_tags_distribution(self, key):
+        tag_index = self._get_tag_index()
 
         result = []
-        index = 0
-
-        course_structure = self._get_course_structure()
+        for aggregates in tag_index.distribution.get(key, []):
+            item = dict(aggregates)
+            item['url'] = reverse('courses:performance:learning_outcomes_section',
+                                  kwargs={'course_id': self.course_id,
+                                          'tag_value': tag_index.slugs[item['id']]})
+            result.append(item)
+        return result
 
-        for key, val in course_structure.iteritems():
-            if key in intermediate:
-                first_parent = course_structure[val['parent']]
-                second_parent = course_structure[first_parent['parent']]
+    def get_modules_marked_with_tag(self, tag_key, tag_value):
+        """ Returns the modules marked with the tag value whose slug is `tag_value`, in course order. """
+        rows = self._get_tagged_modules().get(tag_key, {}).get(tag_value, [])
 
-                index += 1
-                intermediate[key]['index'] = index
-                intermediate[key]['name'] = u', '.join([second_parent['display_name'], first_parent['display_name'],
-                                                        val['display_name']])
-                result.append(intermediate[key])
+        result = []
+        for index, row in enumerate(rows, 1):
+            item = dict(row)
+            item.update({
+                'index': index,
+                'url': reverse('courses:performance:learning_outcomes_answers_distribution',
+                               kwargs={'course_id': self.course_id,
+                                       'tag_value': tag_value,
+                                       'problem_id': item['id']})
+            })
+            result.append(item)
 
         return result
 
@@ -1,5 +1,5 @@
+from core.caching import get_or_set
 from courses.presenters import BasePresenter
-from django.core.cache import cache
 
 
 class ProgramsPresenter(BasePresenter):
@@ -16,26 +16,27 @@ class ProgramsPresenter(BasePresenter):
         if program_ids is None:
             programs = all_programs
         else:
+            program_ids = set(program_ids)
             programs = [program for program in all_programs if program['program_id'] in program_ids]
 
         # Now apply course_ids filter
         if course_ids is None:
             return programs
-        return [program for program in programs if not set(program['course_ids']).isdisjoint(course_ids)]
+        course_ids = frozenset(course_ids)
+        return [program for program in programs if not course_ids.isdisjoint(program['course_ids'])]
 
     def _get_all_programs(self):
         """
         Returns all programs. If not cached, programs will be fetched
         from the analytics data API.
         """
-        all_programs = cache.get(self.CACHE_KEY)
-        if all_programs is None:
+        def fetch_programs():
             all_programs = self.client.programs().programs()
-            all_programs = [
+            return [
                 {field: ('' if val is None and field in self.NON_NULL_STRING_FIELDS else val)
                  for field, val in program.items()} for program in all_programs]
-            cache.set(self.CACHE_KEY, all_programs)
-        return all_programs
+
+        return get_or_set(self.CACHE_KEY, fetch_programs)
 
     def get_programs(self, program_ids=None, course_ids=None):
         """
@@ -0,0 +1,174 @@
+"""
+Generators for large synthetic courses.
+
+Unlike the factories in `courses.tests.factories`, these build data of any size.  Output is deterministic
+for a given set of arguments so that timings can be compared between runs.
+"""
+import datetime
+import random
+
+from analyticsclient.client import Client
+from analyticsclient.constants import enrollment_modes
+
+from courses.tests.utils import CREATED_DATETIME_STRING
+from courses.utils import get_encoded_module_id
+
+
+ASSIGNMENT_TYPES = ['Homework', 'Lab', 'Exam']
+
+
+def _block_id(course_key, block_type, index):
+    return u'block-v1:{}+type@{}+block@{}_{}'.format(course_key, block_type, block_type, index)
+
+
+def generate_course_structure(course_key='edX+BenchX+2017', chapters=20, sequentials_per_chapter=10,
+                              verticals_per_sequential=3, problems_per_vertical=3, videos_per_vertical=2):
+    """
+    Returns a Course Blocks API response for a course with the given shape.
+
+    Every third sequential is ungraded; the rest are graded and cycle through ASSIGNMENT_TYPES.  The
+    defaults produce a little over 3,000 blocks.
+    """
+    counts = {}
+    blocks = {}
+
+    def add_block(block_type, display_name, graded=False, block_format=None, children=None):
+        index = counts.get(block_type, 0) + 1
+        counts[block_type] = index
+        block_id = _block_id(course_key, block_type, index)
+        blocks[block_id] = {
+            u'id': block_id,
+            u'type': block_type,
+            u'display_name': display_name.format(index=index),
+            u'graded': graded,
+            u'format': block_format,
+            u'children': children or [],
+        }
+        return block_id
+
+    root = add_block(u'course', u'Benchmark Course')
+    for _chapter in range(chapters):
+        chapter = add_block(u'chapter', u'Chapter {index}')
+        blocks[root][u'children'].append(chapter)
+
+        for _sequential in range(sequentials_per_chapter):
+            graded = counts.get(u'sequential', 0) % 3 != 2
+            block_format = ASSIGNMENT_TYPES[counts.get(u'sequential', 0) % len(ASSIGNMENT_TYPES)] if graded else None
+            sequential = add_block(u'sequential', u'Subsection {index}', graded, block_format)
+            blocks[chapter][u'children'].append(sequential)
+
+            for _vertical in range(verticals_per_sequential):
+                vertical = add_block(u'vertical', u'Unit {index}', graded, block_format)
+                blocks[sequential][u'children'].append(vertical)
+                for _problem in range(problems_per_vertical):
+                    blocks[vertical][u'children'].append(add_block(u'problem', u'Problem {index}', graded))
+                for _video in range(videos_per_vertical):
+                    blocks[vertical][u'children'].append(add_block(u'video', u'Video {index}', graded))
+
+    return {u'root': root, u'blocks': blocks}
+
+
+def generate_video_data(structure, seed=0):
+    """ Returns Data API video data for every video in the structure. """
+    rand = random.Random(seed)
+    videos = []
+    for block_id, block in structure[u'blocks'].iteritems():
+        if block[u'type'] == u'video':
+            users_at_start = rand.randint(0, 5000)
+            videos.append({
+                u'pipeline_video_id': u'BenchX|{}'.format(get_encoded_module_id(block_id)),
+                u'encoded_module_id': get_encoded_module_id(block_id),
+                u'duration': rand.randint(60, 1200),
+                u'segment_length': 5,
+                u'users_at_start': users_at_start,
+                u'users_at_end': rand.randint(0, users_at_start),
+                u'created': CREATED_DATETIME_STRING,
+            })
+    return videos
+
+
+def generate_tag_values(tag_keys=5, values_per_key=40):
+    """ Returns a dictionary mapping each tag key to its possible values (200 tags by default). """
+    return {
+        u'tag_{}'.format(key): [u'Tag {} value {}'.format(key, value) for value in range(values_per_key)]
+        for key in range(tag_keys)
+    }
+
+
+def generate_problems_and_tags(structure, tag_values, tags_per_problem=2, seed=0):
+    """ Returns Data API problems and tags data for every problem in the structure. """
+    rand = random.Random(seed)
+    tag_keys = sorted(tag_values)
+    problems = []
+    for block_id in sorted(structure[u'blocks']):
+        block = structure[u'blocks'][block_id]
+        if block[u'type'] != u'problem':
+            continue
+
+        total_submissions = rand.randint(0, 2000)
+        tags = {}
+        for tag_key in rand.sample(tag_keys, min(tags_per_problem, len(tag_keys))):
+            tags[tag_key] = [rand.choice(tag_values[tag_key])]
+        problems.append({
+            u'module_id': block_id,
+            u'total_submissions': total_submissions,
+            u'correct_submissions': rand.randint(0, total_submissions),
+            u'tags': tags,
+            u'created': CREATED_DATETIME_STRING,
+        })
+    return problems
+
+
+def generate_enrollment_trend(course_id, days=3 * 365, start_date=datetime.date(2014, 1, 1), seed=0):
+    """ Returns Data API daily enrollment data, by mode, for the number of days given. """
+    rand = random.Random(seed)
+    modes = enrollment_modes.ALL
+    totals = dict.fromkeys(modes, 0)
+    trend = []
+    for index in range(days):
+        date = start_date + datetime.timedelta(days=index)
+        datum = {
+            u'date': date.strftime(Client.DATE_FORMAT),
+            u'course_id': unicode(course_id),
+            u'created': CREATED_DATETIME_STRING,
+        }
+        for mode in modes:
+            totals[mode] = max(totals[mode] + rand.randint(-5, 20), 0)
+            datum[mode] = totals[mode]
+        datum[u'count'] = sum(totals.values())
+        datum[u'cumulative_count'] = datum[u'count'] * 2
+        trend.append(datum)
+    return trend
+
+
+def generate_course_summaries(count=20000, seed=0):
+    """ Returns Data API course summaries for the number of courses given. """
+    rand = random.Random(seed)
+    summaries = []
+    for index in range(count):
+        enrollment_modes_data = {}
+        for mode in enrollment_modes.ALL:
+            mode_count = rand.randint(0, 500)
+            enrollment_modes_data[mode] = {
+                u'count': mode_count,
+                u'cumulative_count': mode_count + rand.randint(0, 100),
+                u'count_change_7_days': rand.randint(-20, 20),
+                u'passing_users': rand.randint(0, mode_count),
+            }
+        summaries.append({
+            u'created': u'2017-02-21T182754',
+            u'course_id': u'course-v1:BenchX+Course{0}+2017'.format(index),
+            # some courses have no title, which exercises the sort fallback
+            u'catalog_course_title': None if index % 50 == 0 else u'Benchmark Course {}'.format(index),
+            u'catalog_course': u'BenchX+Course{}'.format(index),
+            u'start_date': u'2017-01-10T182754',
+            u'end_date': u'2017-05-02T182754',
+            u'pacing_type': rand.choice([u'self_paced', u'instructor_paced']),
+            u'availability': rand.choice([u'Upcoming', u'Current', u'Archived']),
+            u'count': sum(mode[u'count'] for mode in enrollment_modes_data.values()),
+            u'cumulative_count': sum(mode[u'cumulative_count'] for mode in enrollment_modes_data.values()),
+            u'count_change_7_days': sum(mode[u'count_change_7_days'] for mode in enrollment_modes_data.values()),
+            u'passing_users': sum(mode[u'passing_users'] for mode in enrollment_modes_data.values()),
+            u'enrollment_modes': enrollment_modes_data,
+        })
+    return summaries
@@ -0,0 +1,239 @@
+"""
+Benchmarks for the presenters against large synthetic courses.
+
+The benchmarks are skipped unless DASHBOARD_BENCHMARKS is set, e.g. from the repository root
+
+    DASHBOARD_BENCHMARKS=1 DASHBOARD_BENCHMARK_SCALE=2 python manage.py test \
+        analytics_dashboard/courses/tests/benchmarks --settings=analytics_dashboard.settings.test -s
+
+(-s stops nose from capturing the results table, which is printed once the benchmarks have run.)
+
+DASHBOARD_BENCHMARK_SCALE multiplies the size of every fixture (default 1), DASHBOARD_BENCHMARK_REPEAT sets
+the number of timed runs (default 3, the fastest is reported) and DASHBOARD_BENCHMARK_OUTPUT names a file
+to which the results are written as JSON, for comparison with an earlier run.
+"""
+import json
+import os
+import resource
+import sys
+import time
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+import mock
+from slugify import slugify
+
+from common.course_structure import CourseStructure
+from courses.presenters.course_summaries import CourseSummariesPresenter
+from courses.presenters.engagement import CourseEngagementVideoPresenter
+from courses.presenters.enrollment import CourseEnrollmentPresenter
+from courses.presenters.performance import TagsDistributionPresenter
+from courses.tests.benchmarks import generators
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2 without the pytracemalloc backport
+    tracemalloc = None
+
+
+BENCHMARKS_ENABLED = bool(os.environ.get('DASHBOARD_BENCHMARKS'))
+SCALE = float(os.environ.get('DASHBOARD_BENCHMARK_SCALE', 1))
+REPEAT = int(os.environ.get('DASHBOARD_BENCHMARK_REPEAT', 3))
+OUTPUT = os.environ.get('DASHBOARD_BENCHMARK_OUTPUT')
+
+COURSE_ID = u'course-v1:edX+BenchX+2017'
+
+# The default LocMemCache culls after 300 entries, which would dominate the timings of large fixtures.
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmarks',
+        'OPTIONS': {'MAX_ENTRIES': 10 ** 7},
+    }
+}
+
+
+def scaled(size):
+    return max(int(size * SCALE), 1)
+
+
+def measure_peak_memory(func):
+    """
+    Returns the peak memory, in kilobytes, allocated while calling func.
+
+    tracemalloc reports the peak of the call itself.  Without it, the growth of the process's maximum resident
+    set size is reported, which is 0 if the call fits into memory the process has used before.
+    """
+    if tracemalloc is not None:
+        tracemalloc.start()
+        try:
+            func()
+            __, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak / 1024.0
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    func()
+    return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - max_rss)
+
+
+@skipUnless(BENCHMARKS_ENABLED, 'Set DASHBOARD_BENCHMARKS to run the presenter benchmarks.')
+@override_settings(CACHES=BENCHMARK_CACHES)
+class PresenterBenchmarks(TestCase):
+    results = []
+
+    @classmethod
+    def setUpClass(cls):
+        super(PresenterBenchmarks, cls).setUpClass()
+        cls.structure = generators.generate_course_structure(chapters=scaled(20))
+        cls.videos = generators.generate_video_data(cls.structure)
+        cls.tag_values = generators.generate_tag_values(values_per_key=scaled(40))
+        cls.problems_and_tags = generators.generate_problems_and_tags(cls.structure, cls.tag_values)
+        cls.enrollment_trend = generators.generate_enrollment_trend(COURSE_ID, days=scaled(3 * 365))
+        cls.summaries = generators.generate_course_summaries(scaled(20000))
+
+    @classmethod
+    def tearDownClass(cls):
+        super(PresenterBenchmarks, cls).tearDownClass()
+        cls.report(sys.stdout)
+        if OUTPUT:
+            with open(OUTPUT, 'w') as output:
+                json.dump(cls.results, output, indent=2, sort_keys=True)
+
+    @classmethod
+    def report(cls, stream):
+        stream.write('\n{:<60} {:>12} {:>14}\n'.format('Benchmark (scale {})'.format(SCALE), 'Time (ms)',
+                                                       'Peak mem (KB)'))
+        for result in cls.results:
+            stream.write('{name:<60} {ms:>12.1f} {peak_kb:>14.0f}\n'.format(**result))
+
+    def setUp(self):
+        super(PresenterBenchmarks, self).setUp()
+        cache.clear()
+
+        # Module data is copied for each call because presenters rename its keys.
+        self.patch('analyticsclient.course.Course.videos', side_effect=lambda: self.copy_rows(self.videos))
+        self.patch('analyticsclient.course.Course.problems_and_tags',
+                   side_effect=lambda: self.copy_rows(self.problems_and_tags))
+        self.patch('slumber.Resource.get', return_value=self.structure)
+        self.patch('analyticsclient.course.Course.enrollment', return_value=self.enrollment_trend)
+        self.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                   side_effect=self.get_course_summaries)
+
+    def patch(self, target, **kwargs):
+        patcher = mock.patch(target, mock.Mock(**kwargs))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def copy_rows(rows):
+        return [dict(row) for row in rows]
+
+    def get_course_summaries(self, course_ids=None, fields=None, **_kwargs):
+        summaries = self.summaries
+        if course_ids:
+            course_ids = set(course_ids)
+            summaries = [summary for summary in summaries if summary['course_id'] in course_ids]
+        if fields:
+            summaries = [{field: summary[field] for field in fields} for summary in summaries]
+        return summaries
+
+    def benchmark(self, name, func, warm=False):
+        """
+        Records the fastest of REPEAT calls to func and the peak memory of one more call.
+
+        The cache is cleared before each call unless warm is True, in which case func is called once beforehand
+        to fill the cache.
+        """
+        def run():
+            if not warm:
+                cache.clear()
+            return func()
+
+        if warm:
+            func()
+
+        timings = []
+        for __ in range(REPEAT):
+            start = time.time()
+            result = run()
+            timings.append(time.time() - start)
+
+        self.results.append({
+            'name': name + (' (warm)' if warm else ''),
+            'ms': min(timings) * 1000,
+            'peak_kb': measure_peak_memory(run),
+        })
+        return result
+
+    def video_presenter(self):
+        return CourseEngagementVideoPresenter(settings.COURSE_API_KEY, COURSE_ID)
+
+    def tags_presenter(self):
+        return TagsDistributionPresenter(settings.COURSE_API_KEY, COURSE_ID)
+
+    def test_course_structure(self):
+        assignments = self.benchmark(
+            'CourseStructure.course_structure_to_assignments',
+            lambda: CourseStructure.course_structure_to_assignments(self.structure, graded=True))
+        self.assertTrue(assignments)
+
+        sections = self.benchmark('CourseStructure.course_structure_to_sections',
+                                  lambda: CourseStructure.course_structure_to_sections(self.structure, u'video'))
+        self.assertEqual(len(sections), scaled(20))
+
+    def test_presenter_course_structure(self):
+        for warm in (False, True):
+            sections = self.benchmark('CourseEngagementVideoPresenter.course_structure',
+                                      lambda: self.video_presenter().course_structure(), warm=warm)
+            self.assertEqual(len(sections), scaled(20))
+
+        section_id = sections[-1]['id']
+        subsection_id = sections[-1]['children'][-1]['id']
+        self.benchmark('CourseEngagementVideoPresenter.subsection_children',
+                       lambda: self.video_presenter().subsection_children(section_id, subsection_id))
+
+    def test_enrollment(self):
+        def get_summary_and_trend_data():
+            return CourseEnrollmentPresenter(COURSE_ID).get_summary_and_trend_data()
+
+        __, trend = self.benchmark('CourseEnrollmentPresenter.get_summary_and_trend_data',
+                                   get_summary_and_trend_data)
+        self.assertGreaterEqual(len(trend), scaled(3 * 365))
+
+    def test_tags_distribution(self):
+        tag_key = sorted(self.tag_values)[0]
+        tag_value = self.tag_values[tag_key][0]
+
+        tags = self.benchmark('TagsDistributionPresenter.get_available_tags',
+                              lambda: self.tags_presenter().get_available_tags())
+        self.assertTrue(tags)
+
+        distribution = self.benchmark('TagsDistributionPresenter.get_tags_distribution',
+                                      lambda: self.tags_presenter().get_tags_distribution(tag_key))
+        self.assertTrue(distribution)
+
+        modules = self.benchmark('TagsDistributionPresenter.get_modules_marked_with_tag',
+                                 lambda: self.tags_presenter().get_modules_marked_with_tag(tag_key,
+                                                                                           slugify(tag_value)))
+        self.assertTrue(modules)
+
+    def test_course_summaries(self):
+        course_ids = [summary['course_id'] for summary in self.summaries[::10]]
+
+        for warm in (False, True):
+            summaries, __ = self.benchmark('CourseSummariesPresenter.get_course_summaries',
+                                           lambda: CourseSummariesPresenter().get_course_summaries(), warm=warm)
+            self.assertEqual(len(summaries), len(self.summaries))
+
+            summaries, __ = self.benchmark(
+                'CourseSummariesPresenter.get_course_summaries (10% of courses)',
+                lambda: CourseSummariesPresenter().get_course_summaries(course_ids), warm=warm)
+            self.assertEqual(len(summaries), len(course_ids))
+
+        self.benchmark('CourseSummariesPresenter.get_course_summary_metrics',
+                       lambda: CourseSummariesPresenter().get_course_summary_metrics(self.summaries))
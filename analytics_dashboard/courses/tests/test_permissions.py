@@ -203,6 +203,20 @@ class PermissionsTests(TestCase):
         with mock.patch('auth_backends.backends.EdXOpenIdConnect.get_json', side_effect=Exception):
             self.assertRaises(PermissionsRetrievalFailedError, permissions.get_user_course_permissions, self.user)
 
+    def test_get_user_course_permission_set(self):
+        permissions.set_user_course_permissions(self.user, [self.course_id])
+        with mock.patch('courses.permissions.cache.get_many', wraps=cache.get_many) as mock_get_many:
+            self.assertEqual(permissions.get_user_course_permission_set(self.user), frozenset([self.course_id]))
+            self.assertTrue(permissions.user_can_view_course(self.user, self.course_id))
+            self.assertEqual(mock_get_many.call_count, 1)
+
+        # Changing the permissions clears the memoized set
+        permissions.set_user_course_permissions(self.user, [])
+        self.assertEqual(permissions.get_user_course_permission_set(self.user), frozenset())
+        permissions.revoke_user_course_permissions(self.user)
+        with mock.patch('courses.permissions.refresh_user_course_permissions', return_value=[self.course_id]):
+            self.assertTrue(permissions.user_can_view_course(self.user, self.course_id))
+
     def test_on_auth_complete(self):
         """ Verify the function receives the auth_complete_signal signal, and updates course permissions. """
         # No initial permissions
@@ -8,7 +8,9 @@ import mock
 from django.conf import settings
 from django.core.cache import cache
 from django.test import TestCase
+from waffle.testutils import override_switch
 
+from core.caching import CacheEntry
 from courses.presenters.course_summaries import CourseSummariesPresenter
 from courses.tests import utils
 from courses.tests.utils import CourseSamples
@@ -239,3 +241,105 @@ class CourseSummariesPresenterTests(TestCase):
             summaries, last_updated = presenter.get_course_summaries()
             self.assertListEqual(summaries, [])
             self.assertIsNone(last_updated)
+
+    def test_summaries_cached_per_course(self):
+        cache.clear()
+        presenter = CourseSummariesPresenter()
+        api_summaries = self._API_SUMMARIES.values()
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=api_summaries)) as mock_summaries:
+            summaries, _ = presenter.get_course_summaries()
+            self.assertEqual(len(summaries), len(api_summaries))
+            self.assertEqual(mock_summaries.call_count, 2)  # index, then the summaries themselves
+
+            # Summaries are read from the cache, including subsets
+            presenter.get_course_summaries()
+            summaries, _ = presenter.get_course_summaries([CourseSamples.DEMO_COURSE_ID])
+            self.assertEqual([summary['course_id'] for summary in summaries], [CourseSamples.DEMO_COURSE_ID])
+            self.assertEqual(mock_summaries.call_count, 2)
+
+    def test_only_changed_summaries_refreshed(self):
+        cache.clear()
+        presenter = CourseSummariesPresenter()
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=self._API_SUMMARIES.values())):
+            presenter.get_course_summaries()
+
+        # Record a newer summary for the demo course in the index
+        index = presenter._get_summaries_index()  # pylint: disable=protected-access
+        index[CourseSamples.DEMO_COURSE_ID] = '2016-01-01T000000'
+        cache.set(CourseSummariesPresenter.CACHE_KEY, CacheEntry(index, None))
+
+        updated_summary = dict(self._API_SUMMARIES[CourseSamples.DEMO_COURSE_ID], created='2016-01-01T000000')
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=[updated_summary])) as mock_summaries:
+            summaries, _ = presenter.get_course_summaries()
+            mock_summaries.assert_called_once_with(course_ids=[CourseSamples.DEMO_COURSE_ID], exclude=mock.ANY)
+            self.assertEqual(len(summaries), len(self._API_SUMMARIES))
+
+    def test_summaries_missing_from_index_fetched(self):
+        cache.clear()
+        presenter = CourseSummariesPresenter()
+        demo_summary = self._API_SUMMARIES[CourseSamples.DEMO_COURSE_ID]
+        cache.set(CourseSummariesPresenter.CACHE_KEY, CacheEntry({}, None))
+
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=[demo_summary])) as mock_summaries:
+            summaries, _ = presenter.get_course_summaries([CourseSamples.DEMO_COURSE_ID])
+            mock_summaries.assert_called_once_with(course_ids=[CourseSamples.DEMO_COURSE_ID], exclude=mock.ANY)
+            self.assertEqual([summary['course_id'] for summary in summaries], [CourseSamples.DEMO_COURSE_ID])
+
+        # The index is fetched again, since it predates the summary
+        self.assertIsNone(cache.get(CourseSummariesPresenter.CACHE_KEY))
+
+    def test_index_refreshed_by_newer_summaries(self):
+        cache.clear()
+        presenter = CourseSummariesPresenter()
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=self._API_SUMMARIES.values())):
+            presenter.get_course_summaries()
+
+        # A pipeline run creates a newer summary, which is fetched because it is not cached yet
+        cache.delete(presenter.get_summary_cache_key(CourseSamples.DEMO_COURSE_ID, presenter.get_excluded_fields()))
+        updated_summary = dict(self._API_SUMMARIES[CourseSamples.DEMO_COURSE_ID], created='2099-01-01T000000')
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=[updated_summary])):
+            presenter.get_course_summaries([CourseSamples.DEMO_COURSE_ID])
+        self.assertIsNone(cache.get(CourseSummariesPresenter.CACHE_KEY))
+
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=[updated_summary])) as mock_summaries:
+            summaries, _ = presenter.get_course_summaries([CourseSamples.DEMO_COURSE_ID])
+            # only the index is fetched; the updated summary is read from the cache
+            mock_summaries.assert_called_once_with(fields=['course_id', 'created'])
+            self.assertEqual(summaries[0]['created'], '2099-01-01T000000')
+
+    def test_summaries_cached_per_excluded_fields(self):
+        cache.clear()
+        presenter = CourseSummariesPresenter()
+        demo_summary = self._API_SUMMARIES[CourseSamples.DEMO_COURSE_ID]
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=[demo_summary])) as mock_summaries:
+            with override_switch('enable_course_passing', active=False):
+                presenter.get_course_summaries([CourseSamples.DEMO_COURSE_ID])
+
+            # Enabling the switch requests summaries with the passing users, rather than reading those without
+            with override_switch('enable_course_passing', active=True):
+                presenter.get_course_summaries([CourseSamples.DEMO_COURSE_ID])
+            mock_summaries.assert_called_with(course_ids=[CourseSamples.DEMO_COURSE_ID], exclude=['programs'])
+
+    def test_missing_summaries_cached(self):
+        cache.clear()
+        presenter = CourseSummariesPresenter()
+        cache.set(CourseSummariesPresenter.CACHE_KEY,
+                  CacheEntry({CourseSamples.DEMO_COURSE_ID: utils.CREATED_DATETIME_STRING}, None))
+
+        with mock.patch('analyticsclient.course_summaries.CourseSummaries.course_summaries',
+                        mock.Mock(return_value=[])) as mock_summaries:
+            summaries, _ = presenter.get_course_summaries([CourseSamples.DEMO_COURSE_ID])
+            self.assertListEqual(summaries, [])
+
+            # The course is not requested again
+            summaries, _ = presenter.get_course_summaries([CourseSamples.DEMO_COURSE_ID])
+            self.assertListEqual(summaries, [])
+            mock_summaries.assert_called_once_with(course_ids=[CourseSamples.DEMO_COURSE_ID], exclude=mock.ANY)
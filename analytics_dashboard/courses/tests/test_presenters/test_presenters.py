@@ -14,6 +14,8 @@ from waffle.testutils import override_switch
 
 import analyticsclient.constants.activity_type as AT
 from analyticsclient.constants import enrollment_modes
+from analyticsclient.exceptions import ClientError, NotFoundError
+from edx_rest_api_client.exceptions import HttpClientError
 
 from common.tests.course_fixtures import (
     ChapterFixture,
@@ -58,6 +60,10 @@ class BasePresenterTests(TestCase):
     def test_strip_time(self):
         self.assertEqual(self.presenter.strip_time('2014-01-01T000000'), '2014-01-01')
 
+    def test_submit(self):
+        future = self.presenter.submit(lambda x, y=0: x + y, 1, y=2)
+        self.assertEqual(future.result(), 3)
+
     def test_get_current_date(self):
         dt_format = '%Y-%m-%d'
         self.assertEqual(self.presenter.get_current_date(), datetime.datetime.utcnow().strftime(dt_format))
@@ -201,6 +207,14 @@ class CourseEngagementActivityPresenterTests(TestCase):
         self.assertSummaryAndTrendsValid(True, self.get_expected_trends_small(True),
                                          self.get_expected_summary_normal(True))
 
+    @mock.patch('analyticsclient.course.Course.activity', mock.Mock(side_effect=NotFoundError))
+    @mock.patch('analyticsclient.course.Course.enrollment')
+    def test_get_summary_and_trend_data_not_found(self, mock_enrollment):
+        with self.assertRaises(NotFoundError):
+            self.presenter.get_summary_and_trend_data()
+        # enrollment is only requested for activity trends
+        self.assertFalse(mock_enrollment.called)
+
 
 @ddt
 class CourseEngagementVideoPresenterTests(TestCase):
@@ -287,10 +301,24 @@ class CourseEngagementVideoPresenterTests(TestCase):
     def test_module_id_to_data_id(self):
         opaque_key_id = 'i4x-edX-DemoX-video-0b9e39477cf34507a7a48f74be381fdd'
         module_id = 'i4x://edX/DemoX/video/0b9e39477cf34507a7a48f74be381fdd'
-        self.assertEqual(self.presenter.module_id_to_data_id({'id': module_id}), opaque_key_id)
-
         block_id = 'block-v1:edX+DemoX.1+2014+type@problem+block@466f474fa4d045a8b7bde1b911e095ca'
-        self.assertEqual(self.presenter.module_id_to_data_id({'id': block_id}), '466f474fa4d045a8b7bde1b911e095ca')
+        structure = {'root': module_id, 'blocks': {module_id: {'id': module_id, 'type': 'video'}}}
+        cache.clear()
+
+        with mock.patch('slumber.Resource.get', mock.Mock(return_value=structure)):
+            with mock.patch('courses.utils.get_encoded_module_id',
+                            mock.Mock(side_effect=utils.get_encoded_module_id)) as mock_encode:
+                self.assertEqual(self.presenter.module_id_to_data_id({'id': module_id}), opaque_key_id)
+                self.assertEqual(self.presenter.module_id_to_data_id({'id': module_id}), opaque_key_id)
+                # the ID is encoded when the structure is fetched, not on each lookup
+                self.assertEqual(mock_encode.call_count, 1)
+
+                # blocks that are not in the structure are encoded on demand
+                self.assertEqual(self.presenter.module_id_to_data_id({'id': block_id}),
+                                 '466f474fa4d045a8b7bde1b911e095ca')
+
+            self.assertEqual(self.presenter.module_id_from_encoded_id(opaque_key_id), module_id)
+            self.assertIsNone(self.presenter.module_id_from_encoded_id('466f474fa4d045a8b7bde1b911e095ca'))
 
     def test_post_process_adding_data_to_blocks(self):
         def url_func(parent_block, child_block):
@@ -627,6 +655,44 @@ class CourseEngagementVideoPresenterTests(TestCase):
                 sibling = self.presenter.sibling_block(utils.get_encoded_module_id(self.VIDEO_1['id']), 1)
                 self.assertEqual(sibling['id'], utils.get_encoded_module_id(self.VIDEO_3['id']))
 
+    def test_block_index(self):
+        """ Verify that the annotated structure is only walked once for child and sibling lookups. """
+        video_1, video_2, video_3 = [{'id': video_id, 'url': '/' + video_id} for video_id in ['v1', 'v2', 'v3']]
+        sections = [
+            {'id': 's1', 'children': [{'id': 'ss1', 'children': [video_1, {'id': 'no-data'}]}]},
+            {'id': 's2', 'children': [{'id': 'ss2', 'children': [video_2, video_3]}]},
+        ]
+
+        with mock.patch.object(self.presenter, 'sections', mock.Mock(return_value=sections)) as mock_sections:
+            self.assertEqual(self.presenter.next_block('v1'), video_2)
+            self.assertEqual(self.presenter.previous_block('v2'), video_1)
+            self.assertIsNone(self.presenter.previous_block('v1'))
+            self.assertIsNone(self.presenter.next_block('v3'))
+            self.assertIsNone(self.presenter.next_block('no-data'))
+
+            self.assertEqual(self.presenter.subsection_child('s2', 'ss2', 'v3'), video_3)
+            self.assertEqual(self.presenter.subsection_child('s1', 'ss1', 'no-data'), {'id': 'no-data'})
+            self.assertIsNone(self.presenter.subsection_child('s1', 'ss1', 'v3'))
+            self.assertIsNone(self.presenter.subsection_child(None, None, 'v3'))
+
+            mock_sections.assert_called_once_with()
+
+    def test_block_index_reused_component(self):
+        """ Verify that a component reused in several subsections is found in each of them. """
+        video_1, video_2 = [{'id': video_id, 'url': '/' + video_id} for video_id in ['v1', 'v2']]
+        reused_video = {'id': 'v1', 'url': '/v1-reused'}
+        sections = [
+            {'id': 's1', 'children': [{'id': 'ss1', 'children': [video_1]},
+                                      {'id': 'ss2', 'children': [video_2, reused_video]}]},
+        ]
+
+        with mock.patch.object(self.presenter, 'sections', mock.Mock(return_value=sections)):
+            self.assertEqual(self.presenter.subsection_child('s1', 'ss1', 'v1'), video_1)
+            self.assertEqual(self.presenter.subsection_child('s1', 'ss2', 'v1'), reused_video)
+            self.assertIsNone(self.presenter.subsection_child('s1', 'ss1', 'v2'))
+            # siblings are found from the first use of the component, in course order
+            self.assertEqual(self.presenter.next_block('v1'), video_2)
+
     @data('http://example.com', 'http://example.com/')
     def test_build_render_xblock_url(self, xblock_render_base):
         self.assertIsNone(self.presenter.build_render_xblock_url(None, None))
@@ -876,6 +942,58 @@ class CoursePerformancePresenterTests(TestCase):
         questions = utils.get_presenter_performance_answer_distribution_single_question()
         self.assertAnswerDistribution(problem_parts, questions, mock_data)
 
+    @mock.patch('analyticsclient.module.Module.answer_distribution')
+    def test_answer_distribution_is_fetched_once_per_problem(self, mock_answer_distribution):
+        mock_data = utils.get_mock_api_answer_distribution_multiple_questions_data(self.course_id)
+        mock_answer_distribution.return_value = mock_data
+        part_ids = sorted(set(datum['part_id'] for datum in mock_data))
+
+        for part_id in part_ids + part_ids:
+            entry = self.presenter.get_answer_distribution(self.problem_id, part_id)
+            self.assertTrue(all(datum['part_id'] == part_id for datum in entry.answer_distribution))
+        self.assertEqual(mock_answer_distribution.call_count, 1)
+
+        with self.assertRaises(NotFoundError):
+            self.presenter.get_answer_distribution(self.problem_id, 'missing-part')
+
+    @override_settings(ANSWER_DISTRIBUTION_PREFETCH_COURSE_LIMIT=2)
+    @mock.patch('analyticsclient.module.Module.answer_distribution')
+    @mock.patch('courses.presenters.performance.get_prefetch_executor')
+    def test_prefetch_answer_distributions(self, mock_executor, mock_answer_distribution):
+        # pylint: disable=protected-access
+        mock_answer_distribution.return_value = utils.get_mock_api_answer_distribution_single_question_data(
+            self.course_id)
+        submit = mock_executor.return_value.submit
+        cache.set(self.presenter._get_answer_distribution_cache_key('cached'), 'value')
+
+        # Cached problems are skipped, and problems beyond the course limit are not queued
+        self.presenter.prefetch_answer_distributions(['cached', 'first', 'second', 'third'])
+        self.assertListEqual(submit.call_args_list, [mock.call(self.presenter._prefetch_answer_distribution, 'first'),
+                                                     mock.call(self.presenter._prefetch_answer_distribution, 'second')])
+
+        for call in submit.call_args_list:
+            func, problem_id = call[0]
+            func(problem_id)
+        self.assertEqual(mock_answer_distribution.call_count, 2)
+
+        # Finished prefetches free their slots, and prefetched problems are cached
+        submit.reset_mock()
+        self.presenter.prefetch_answer_distributions(['first', 'third'])
+        submit.assert_called_once_with(self.presenter._prefetch_answer_distribution, 'third')
+        func, problem_id = submit.call_args[0]
+        func(problem_id)
+
+        # Slots are freed if a prefetch cannot be submitted
+        submit.side_effect = RuntimeError
+        self.presenter.prefetch_answer_distributions(['fourth'])
+        submit.reset_mock()
+        submit.side_effect = None
+        self.presenter.prefetch_answer_distributions(['fourth', 'fifth'])
+        self.assertEqual(submit.call_count, 2)
+        for call in submit.call_args_list:
+            func, problem_id = call[0]
+            func(problem_id)
+
     def assertAnswerDistribution(self, expected_problem_parts, expected_questions, answer_distribution_data):
         for part in expected_problem_parts:
             expected = part['expected']
@@ -1027,6 +1145,42 @@ class CoursePerformancePresenterTests(TestCase):
                 self.assertListEqual(
                     self.presenter.subsection_children(section['id'], subsection['id']), expected_problems)
 
+    @mock.patch('courses.presenters.performance.CoursePerformancePresenter.grading_policy',
+                mock.Mock(return_value=CoursePerformanceDataFactory.grading_policy))
+    def test_derived_cache_keys(self):
+        """ Verify the sections and assignments cached by the presenter are listed among its derived cache keys. """
+        ungraded_problems = self.factory.problems(False)
+        with mock.patch('slumber.Resource.get', mock.Mock(return_value=self.factory.structure)):
+            with mock.patch('analyticsclient.course.Course.problems', mock.Mock(return_value=ungraded_problems)):
+                section = self.factory.presented_sections[0]
+                subsection = section['children'][0]
+                self.presenter.sections()
+                self.presenter.section(section['id'])
+                self.presenter.subsection(section['id'], subsection['id'])
+                assignment_type = self.factory.presented_assignment_types[0]
+                self.presenter.assignments()
+                self.presenter.assignments({'name': assignment_type['name']})
+                self.presenter.assignments({'name': slugify(assignment_type['name'])})
+
+                template = self.presenter.section_type_template
+                expected_keys = [self.presenter.get_cache_key(name) for name in [
+                    self.presenter.all_sections_key,
+                    template.format(None, None),
+                    template.format(section['id'], None),
+                    template.format(section['id'], subsection['id']),
+                    'problem_last_updated',
+                    'assignments',
+                    'assignments_None',
+                    u'assignments_{}'.format(assignment_type['name']),
+                    u'assignments_{}'.format(slugify(assignment_type['name'])),
+                ]]
+                self.assertItemsEqual(cache.get_many(expected_keys).keys(), expected_keys)
+
+                derived_keys = self.presenter.get_derived_cache_keys()
+                self.assertTrue(set(expected_keys).issubset(derived_keys))
+                cache.delete_many(derived_keys)
+                self.assertEqual(cache.get_many(expected_keys), {})
+
 
 @ddt
 class TagsDistributionPresenterTests(TestCase):
@@ -1187,6 +1341,72 @@ class TagsDistributionPresenterTests(TestCase):
                 expected_modules = factory.get_expected_modules_marked_with_tag('learning_outcome', 'Learned nothing')
                 self.assertEqual(modules, expected_modules)
 
+    def test_tag_index_is_cached(self):
+        factory = TagsDistributionDataFactory([{"total_submissions": 21, "correct_submissions": 5,
+                                                "tags": {"difficulty": ["Hard"], "learning_outcome": ["Learned"]}}])
+
+        with mock.patch('slumber.Resource.get', mock.Mock(return_value=factory.structure)), \
+                mock.patch('analyticsclient.course.Course.problems_and_tags',
+                           mock.Mock(return_value=factory.problems_and_tags)) as mock_problems_and_tags:
+            expected_distribution = self.presenter.get_tags_distribution('learning_outcome')
+            expected_modules = self.presenter.get_modules_marked_with_tag('learning_outcome', 'learned')
+
+            # Later presenters are served from the cached index, without slugifying tag values again
+            presenter = TagsDistributionPresenter(settings.COURSE_API_KEY, self.course_id)
+            with mock.patch('courses.presenters.performance.slugify') as mock_slugify:
+                self.assertEqual(presenter.get_available_tags(), factory.get_expected_available_tags())
+                self.assertEqual(presenter.get_tags_content_nav('learning_outcome', 'learned')[1]['name'], 'Learned')
+                self.assertEqual(presenter.get_tags_distribution('learning_outcome'), expected_distribution)
+                self.assertEqual(presenter.get_modules_marked_with_tag('learning_outcome', 'learned'),
+                                 expected_modules)
+                self.assertFalse(mock_slugify.called)
+
+            mock_problems_and_tags.assert_called_once_with()
+            self.assertEqual(expected_modules,
+                             factory.get_expected_modules_marked_with_tag('learning_outcome', 'Learned'))
+
+    def test_tagged_modules_rebuilt_with_module_data(self):
+        tags_data = [{"total_submissions": 21, "correct_submissions": 5, "tags": {"learning_outcome": ["Learned"]}}]
+        factory = TagsDistributionDataFactory(tags_data)
+        refreshed_factory = TagsDistributionDataFactory([dict(tags_data[0], total_submissions=30)])
+
+        with mock.patch('slumber.Resource.get', mock.Mock(return_value=factory.structure)):
+            with mock.patch('analyticsclient.course.Course.problems_and_tags',
+                            mock.Mock(return_value=factory.problems_and_tags)):
+                self.presenter.get_modules_marked_with_tag('learning_outcome', 'learned')
+
+            # The module data is refreshed, e.g. after a pipeline run
+            cache.delete(self.presenter.get_cache_key(self.presenter.module_type))
+            presenter = TagsDistributionPresenter(settings.COURSE_API_KEY, self.course_id)
+            with mock.patch('analyticsclient.course.Course.problems_and_tags',
+                            mock.Mock(return_value=refreshed_factory.problems_and_tags)):
+                modules = presenter.get_modules_marked_with_tag('learning_outcome', 'learned')
+
+        self.assertEqual(modules, refreshed_factory.get_expected_modules_marked_with_tag('learning_outcome', 'Learned'))
+
+    @mock.patch('analyticsclient.course.Course.problems_and_tags', mock.Mock(side_effect=ClientError))
+    def test_tag_index_unavailable(self):
+        with mock.patch('slumber.Resource.get') as mock_structure:
+            self.assertEqual(self.presenter.get_available_tags(), {})
+            self.assertEqual(self.presenter.get_tags_distribution('learning_outcome'), [])
+            self.assertEqual(self.presenter.get_modules_marked_with_tag('learning_outcome', 'learned'), [])
+            # without tagged modules, there is nothing to order by the structure
+            self.assertFalse(mock_structure.called)
+        # the failure is not cached
+        self.assertIsNone(cache.get(self.presenter.get_cache_key(self.presenter.module_type)))
+
+    @mock.patch('slumber.Resource.get', mock.Mock(side_effect=HttpClientError))
+    def test_structure_unavailable(self):
+        factory = TagsDistributionDataFactory([{"total_submissions": 21, "correct_submissions": 5,
+                                                "tags": {"learning_outcome": ["Learned"]}}])
+        with mock.patch('analyticsclient.course.Course.problems_and_tags',
+                        mock.Mock(return_value=factory.problems_and_tags)):
+            # Only the modules marked with a tag are ordered by the structure
+            self.assertEqual(self.presenter.get_available_tags(), factory.get_expected_available_tags())
+            self.assertEqual(len(self.presenter.get_tags_distribution('learning_outcome')), 1)
+            with self.assertRaises(HttpClientError):
+                self.presenter.get_modules_marked_with_tag('learning_outcome', 'learned')
+
 
 class CourseReportDownloadPresenterTests(TestCase):
 
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AnonymousUser
+from django.core.urlresolvers import reverse
 from django.test import RequestFactory, TestCase
 
 from waffle.testutils import override_flag, override_switch
@@ -33,6 +34,12 @@ class UtilsTest(TestCase):
         with override_flag(name, active=True):
             self.assertTrue(utils.is_feature_enabled(item, request))
 
+    def test_get_course_url(self):
+        for course_id in ['course-v1:edX+DemoX+Demo_2014', 'edX/DemoX/Demo_Course', u'course-v1:edX+D\xe9mo X+2014']:
+            for view_name in ['courses:home', 'courses:enrollment:activity', 'courses:learners:learners']:
+                self.assertEqual(utils.get_course_url(view_name, course_id),
+                                 reverse(view_name, kwargs={'course_id': course_id}))
+
 
 class NumberTests(TestCase):
     def test_is_number(self):
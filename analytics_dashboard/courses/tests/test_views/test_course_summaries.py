@@ -54,11 +54,14 @@ class CourseSummariesViewTests(ViewTestMixin, CoursePermissionsExceptionMixin, T
         mock_data = self.get_mock_data(course_ids)
         programs_mock_data = self.get_programs_mock_data(course_ids)
 
-        with mock.patch(permissions_method, return_value=course_ids):
+        with mock.patch(permissions_method, return_value=course_ids), \
+                mock.patch('courses.views.CourseValidMixin.prevalidate_courses') as prevalidate_courses:
             with mock.patch(presenter_method, return_value=mock_data) as summaries_presenter:
                 with mock.patch(programs_presenter_method, return_value=programs_mock_data) as programs_presenter:
                     response = self.client.get(self.path())
                     self.assertEqual(response.status_code, 200)
+                    prevalidate_courses.assert_called_once_with(course_ids)
+                    self.assertEqual(response.wsgi_request.timing_page_name, 'insights_home')
                     context = response.context
                     page_data = json.loads(context['page_data'])
                     self.assertListEqual(page_data['course']['course_list_json'], self.expected_summaries(course_ids))
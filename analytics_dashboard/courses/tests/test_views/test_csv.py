@@ -43,7 +43,8 @@ class CourseCSVTestMixin(ViewTestMixin):
         self.assertResponseFilename(response, filename)
 
         # Check data
-        self.assertEqual(response.content, csv_data)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        self.assertEqual(content, csv_data)
 
     def assertResponseContentType(self, response, content_type):
         self.assertEqual(response['Content-Type'], content_type)
@@ -237,7 +238,8 @@ class CourseIndexCSVTests(ViewTestMixin, TestCase):
         self.assertResponseFilename(response, filename)
 
         # Check data
-        self.assertEqual(response.content, csv_data)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        self.assertEqual(content, csv_data)
 
     def assertResponseContentType(self, response, content_type):
         self.assertEqual(response['Content-Type'], content_type)
@@ -1,6 +1,8 @@
 import json
 import logging
+import threading
 
+from concurrent import futures
 from ddt import data, ddt
 import httpretty
 import mock
@@ -115,3 +117,39 @@ class LearnersViewTests(ViewTestMixin, TestCase):
                     ('courses.views.learners', 'ERROR', 'Failed to reach the Learner List endpoint'),
                     ('courses.views.learners', 'ERROR', 'Failed to reach the Course Learner Metadata endpoint')
                 )
+
+    @override_settings(LEARNERS_PREFETCH_BUDGET=0)
+    def test_prefetch_budget_exceeded(self):
+        """ Responses that are not ready within the budget are left for the front-end to fetch. """
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow_get(*_args, **_kwargs):
+            release.wait()
+            raise Timeout
+
+        with mock.patch('learner_analytics_api.v0.clients.LearnerApiResource.get', mock.Mock(side_effect=slow_get)):
+            response = self._get()
+            self._assert_context(response, {
+                'learner_list_json': None,
+                'course_learner_metadata_json': None,
+            })
+
+    @override_settings(LEARNERS_PREFETCH_BUDGET=0)
+    @mock.patch('courses.views.learners.get_learners_prefetch_executor')
+    def test_prefetch_not_started_cancelled(self, mock_executor):
+        """ Prefetches still queued when the budget runs out are cancelled rather than left to run. """
+        queued = []
+
+        def submit(*_args, **_kwargs):
+            queued.append(futures.Future())
+            return queued[-1]
+
+        mock_executor.return_value.submit.side_effect = submit
+        response = self._get()
+        self._assert_context(response, {
+            'learner_list_json': None,
+            'course_learner_metadata_json': None,
+        })
+        self.assertEqual(len(queued), 2)
+        self.assertTrue(all(future.cancelled() for future in queued))
@@ -1,25 +1,122 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.test.utils import override_settings
+from edx_rest_api_client.exceptions import HttpClientError
 import mock
+import requests
 
 from courses.tests.utils import CourseSamples
-from courses.views import CourseValidMixin
+from courses.views import CourseAPIMixin, CourseValidMixin
 
 
 class CourseValidMixinTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.mixin = CourseValidMixin()
         self.mixin.course_id = CourseSamples.DEPRECATED_DEMO_COURSE_ID
 
+    def tearDown(self):
+        cache.clear()
+
     @override_settings(LMS_COURSE_VALIDATION_BASE_URL=None)
     def test_no_validation_url(self):
         self.assertTrue(self.mixin.is_valid_course())
 
     @override_settings(LMS_COURSE_VALIDATION_BASE_URL='a/url')
-    @mock.patch('courses.views.requests.get')
-    def test_valid_url(self, mock_lms_request):
+    @mock.patch('courses.views.get_http_session')
+    def test_valid_url(self, mock_session):
+        mock_lms_request = mock_session.return_value.get
         mock_lms_request.return_value.status_code = 404
         self.assertFalse(self.mixin.is_valid_course())
 
+        # Invalid courses are cached, but for less time than valid ones
+        self.assertFalse(self.mixin.is_valid_course())
+        self.assertEqual(mock_lms_request.call_count, 1)
+        cache.clear()
+
         mock_lms_request.return_value.status_code = 200
         self.assertTrue(self.mixin.is_valid_course())
+        self.assertTrue(self.mixin.is_valid_course())
+        self.assertEqual(mock_lms_request.call_count, 2)
+
+    @override_settings(LMS_COURSE_VALIDATION_BASE_URL='a/url')
+    @mock.patch('courses.views.get_http_session')
+    def test_timeout(self, mock_session):
+        mock_session.return_value.get.side_effect = requests.exceptions.Timeout
+        self.assertTrue(self.mixin.is_valid_course())
+
+        # Timeouts are not cached
+        self.assertTrue(self.mixin.is_valid_course())
+        self.assertEqual(mock_session.return_value.get.call_count, 2)
+
+    @override_settings(LMS_COURSE_VALIDATION_BASE_URL='a/url')
+    @mock.patch('courses.views.get_http_session')
+    def test_validate_courses(self, mock_session):
+        def get(uri, **_kwargs):
+            response = mock.Mock()
+            response.status_code = 200 if CourseSamples.DEMO_COURSE_ID in uri else 404
+            return response
+
+        mock_session.return_value.get.side_effect = get
+        course_ids = [CourseSamples.DEMO_COURSE_ID, CourseSamples.DEPRECATED_DEMO_COURSE_ID]
+        expected = {CourseSamples.DEMO_COURSE_ID: True, CourseSamples.DEPRECATED_DEMO_COURSE_ID: False}
+        self.assertDictEqual(CourseValidMixin.validate_courses(course_ids), expected)
+        self.assertDictEqual(CourseValidMixin.validate_courses(course_ids), expected)
+        self.assertEqual(mock_session.return_value.get.call_count, 2)
+
+    @override_settings(LMS_COURSE_VALIDATION_BASE_URL='a/url', COURSE_VALIDATION_PREFETCH_LIMIT=1)
+    @mock.patch('courses.views.CourseValidMixin.validate_courses')
+    @mock.patch('courses.views.get_prefetch_executor')
+    def test_prevalidate_courses(self, mock_executor, mock_validate):
+        mock_executor.return_value.submit.side_effect = lambda func: func()
+        CourseValidMixin.prevalidate_courses([CourseSamples.DEMO_COURSE_ID, CourseSamples.DEPRECATED_DEMO_COURSE_ID])
+        mock_validate.assert_called_once_with([CourseSamples.DEMO_COURSE_ID])
+
+    @override_settings(LMS_COURSE_VALIDATION_BASE_URL=None)
+    @mock.patch('courses.views.get_prefetch_executor')
+    def test_prevalidate_courses_without_validation_url(self, mock_executor):
+        CourseValidMixin.prevalidate_courses([CourseSamples.DEMO_COURSE_ID])
+        self.assertFalse(mock_executor.called)
+
+
+class CourseAPIMixinTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.mixin = CourseAPIMixin()
+        self.mixin.request = mock.Mock()
+        self.mixin.request.user.pk = 1
+        self.mixin.course_api = mock.Mock()
+
+    def tearDown(self):
+        cache.clear()
+
+    def get_page(self, page, num_pages):
+        return {
+            'results': [{'id': 'course-{}'.format(page)}],
+            'pagination': {
+                'next': 'next' if page < num_pages else None,
+                'num_pages': num_pages,
+            }
+        }
+
+    def test_get_courses(self):
+        self.mixin.course_api.courses.get.side_effect = lambda page, page_size: self.get_page(page, 3)
+        courses = self.mixin.get_courses()
+        self.assertListEqual(courses, [{'id': 'course-1'}, {'id': 'course-2'}, {'id': 'course-3'}])
+        self.assertEqual(self.mixin.course_api.courses.get.call_count, 3)
+
+        # Course details are cached
+        self.assertDictEqual(self.mixin.get_course_info('course-2'), {'id': 'course-2'})
+
+        # As is the list of courses
+        self.assertListEqual(self.mixin.get_courses(), courses)
+        self.assertEqual(self.mixin.course_api.courses.get.call_count, 3)
+
+    def test_get_courses_error(self):
+        def get_page(page, page_size):
+            if page == 3:
+                raise HttpClientError
+            return self.get_page(page, 4)
+
+        self.mixin.course_api.courses.get.side_effect = get_page
+        self.assertListEqual(self.mixin.get_courses(), [{'id': 'course-1'}, {'id': 'course-2'}])
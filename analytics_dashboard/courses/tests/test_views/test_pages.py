@@ -3,8 +3,9 @@
 from ddt import data, ddt
 import httpretty
 import mock
-from waffle.testutils import override_switch
+from waffle.testutils import override_flag, override_switch
 
+from django.core.urlresolvers import reverse
 from django.test import TestCase
 
 from analyticsclient.exceptions import NotFoundError
@@ -94,3 +95,20 @@ class CourseHomeViewTests(CourseViewTestMixin, TestCase):
         else:
             mock_get_report_info.side_effect = NotFoundError
         self.assert_performance_report_link_present(available)
+
+    @httpretty.activate
+    @override_switch('enable_course_api', active=True)
+    @override_switch('enable_engagement_videos_pages', active=False)
+    @override_flag('display_learner_analytics', active=True)
+    def test_table_items(self):
+        self.mock_course_detail(CourseSamples.DEPRECATED_DEMO_COURSE_ID, {})
+        for __ in range(2):
+            response = self.client.get(self.path(course_id=CourseSamples.DEPRECATED_DEMO_COURSE_ID))
+            self.assertEqual(response.status_code, 200)
+
+            items = {item['view']: item for column in response.context['table_items'] for item in column['items']}
+            self.assertNotIn('courses:engagement:videos', items)
+            self.assertNotIn('courses:performance:learning_outcomes', items)
+            self.assertEqual(items['courses:learners:learners']['href'],
+                             reverse('courses:learners:learners',
+                                     kwargs={'course_id': CourseSamples.DEPRECATED_DEMO_COURSE_ID}))
@@ -8,6 +8,7 @@ from mock import patch, Mock
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.utils.translation import ugettext_lazy as _
 
 from slugify import slugify
@@ -16,6 +17,7 @@ from waffle.testutils import override_switch
 from analyticsclient.exceptions import ClientError, NotFoundError
 
 from courses.tests import utils
+from courses.views.performance import PerformanceAnswerDistributionView
 from courses.tests.factories import CoursePerformanceDataFactory, TagsDistributionDataFactory
 from courses.tests.test_views import (CourseStructureViewMixin, CourseAPIMixin, PatchMixin)
 from courses.tests.utils import CourseSamples
@@ -293,6 +295,44 @@ class CoursePerformanceGradedAnswerDistributionViewTests(CoursePerformanceAnswer
     def test_valid_course(self):
         self._test_valid_course(self.factory.presented_assignments[0]['children'][0])
 
+    def test_prefetch_switch(self):
+        prefetch_method = 'courses.presenters.performance.CoursePerformancePresenter.prefetch_answer_distributions'
+        for active in (True, False):
+            with override_switch('enable_answer_distribution_prefetch', active=active), \
+                    patch(prefetch_method) as mock_prefetch:
+                self._test_valid_course(self.factory.presented_assignments[0]['children'][0])
+                self.assertEqual(mock_prefetch.called, active)
+
+
+class PerformanceAnswerDistributionViewTests(TestCase):
+    assignment = {
+        'children': [
+            {'id': 'first', 'url': '/first/'},
+            {'id': 'second', 'url': '/second/'},
+            # problems without submissions have no url
+            {'id': 'unanswered'},
+            {'id': 'third', 'url': '/third/'},
+            {'id': 'fourth', 'url': '/fourth/'},
+        ]
+    }
+
+    def get_next_problem_ids(self, problem_id, assignment=assignment):
+        view = PerformanceAnswerDistributionView()
+        view.problem_id = problem_id
+        view.assignment = assignment
+        return view.get_next_problem_ids()
+
+    @override_settings(ANSWER_DISTRIBUTION_PREFETCH_COUNT=2)
+    def test_get_next_problem_ids(self):
+        self.assertListEqual(self.get_next_problem_ids('first'), ['second', 'third'])
+        self.assertListEqual(self.get_next_problem_ids('third'), ['fourth'])
+        self.assertListEqual(self.get_next_problem_ids('fourth'), [])
+
+    def test_get_next_problem_ids_outside_assignment(self):
+        self.assertListEqual(self.get_next_problem_ids('unanswered'), [])
+        self.assertListEqual(self.get_next_problem_ids('missing'), [])
+        self.assertListEqual(self.get_next_problem_ids('first', assignment=None), [])
+
 
 @override_switch('enable_course_api', active=True)
 @ddt
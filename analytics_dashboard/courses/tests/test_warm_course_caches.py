@@ -0,0 +1,123 @@
+from StringIO import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+import mock
+
+from common.course_structure import CompactCourseStructure
+from courses.exceptions import NoVideosError
+from courses.management.commands.warm_course_caches import Command, RateLimiter
+from courses.presenters import CourseAPIPresenterMixin
+from courses.presenters.course_summaries import CourseSummariesPresenter
+from courses.presenters.performance import CoursePerformancePresenter, TaggedModuleData
+from courses.tests.factories import CoursePerformanceDataFactory
+from courses.tests.utils import CourseSamples
+
+
+COMMAND_PATH = 'courses.management.commands.warm_course_caches'
+
+
+class WarmCourseCachesTests(TestCase):
+    course_ids = [CourseSamples.DEMO_COURSE_ID, CourseSamples.DEPRECATED_DEMO_COURSE_ID, 'course-v1:OrgX+C+R']
+
+    def setUp(self):
+        super(WarmCourseCachesTests, self).setUp()
+        cache.clear()
+        self.summaries_index = {course_id: '2017-02-21T182754' for course_id in self.course_ids}
+        patcher = mock.patch.object(CourseSummariesPresenter, '_get_summaries_index',
+                                    return_value=self.summaries_index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call_command(self, *args, **kwargs):
+        stdout = StringIO()
+        kwargs.setdefault('rate', 0)
+        call_command('warm_course_caches', *args, stdout=stdout, **kwargs)
+        return stdout.getvalue()
+
+    def test_dry_run(self):
+        output = self.call_command(dry_run=True, org=['edX'], rate=6, workers=2, verbosity=2)
+        self.assertIn('Would warm 2 courses with 2 workers, making up to 13 upstream requests.', output)
+        self.assertIn('this takes at least 2s', output)
+        self.assertIn(CourseSamples.DEMO_COURSE_ID, output)
+        self.assertNotIn('OrgX', output)
+
+    @mock.patch('courses.views.CourseValidMixin.validate_courses')
+    @mock.patch.object(CourseSummariesPresenter, '_get_summaries', return_value=[])
+    @mock.patch.object(CoursePerformancePresenter, 'grading_policy')
+    @mock.patch.object(CoursePerformancePresenter, '_get_structure')
+    @mock.patch.object(CourseAPIPresenterMixin, '_course_module_data',
+                       side_effect=[{}, NoVideosError(course_id=CourseSamples.DEMO_COURSE_ID),
+                                    TaggedModuleData({}, None)])
+    def test_warm(self, mock_module_data, mock_structure, mock_grading_policy, mock_summaries, mock_validate):
+        output = self.call_command(CourseSamples.DEMO_COURSE_ID)
+
+        mock_summaries.assert_called_once_with([CourseSamples.DEMO_COURSE_ID])
+        mock_validate.assert_called_once_with([CourseSamples.DEMO_COURSE_ID])
+        mock_structure.assert_called_once_with()
+        mock_grading_policy.assert_called_once_with()
+        self.assertEqual(mock_module_data.call_count, 3)
+        self.assertIn(u'[1/1] {} warmed in'.format(CourseSamples.DEMO_COURSE_ID), output)
+
+    def test_refresh(self):
+        key = CoursePerformancePresenter('token', CourseSamples.DEMO_COURSE_ID).get_cache_key('structure')
+        cache.set(key, 'stale')
+
+        with mock.patch.object(Command, 'warm_summaries'), \
+                mock.patch.object(CourseAPIPresenterMixin, '_course_module_data'), \
+                mock.patch.object(CoursePerformancePresenter, 'grading_policy'), \
+                mock.patch('courses.views.CourseValidMixin.validate_courses'), \
+                mock.patch.object(CourseAPIPresenterMixin, '_get_structure',
+                                  side_effect=lambda: cache.get(key, 'fresh')) as mock_structure:
+            self.call_command(CourseSamples.DEMO_COURSE_ID, access_token='token')
+            self.assertEqual(mock_structure.call_count, 1)
+            self.assertEqual(cache.get(key), 'stale')
+
+            self.call_command(CourseSamples.DEMO_COURSE_ID, access_token='token', refresh=True)
+            self.assertIsNone(cache.get(key))
+
+    def test_refresh_discards_assignments(self):
+        presenter = CoursePerformancePresenter('token', CourseSamples.DEMO_COURSE_ID)
+        keys = [presenter.get_cache_key(name) for name in
+                ['assignments', 'assignments_None', 'assignments_Homework', 'assignments_homework',
+                 'problem_last_updated']]
+        cache.set_many({key: 'stale' for key in keys})
+        structure = CompactCourseStructure.from_blocks(CoursePerformanceDataFactory().structure)
+
+        with mock.patch.object(Command, 'warm_summaries'), \
+                mock.patch.object(CourseAPIPresenterMixin, '_course_module_data'), \
+                mock.patch.object(CourseAPIPresenterMixin, '_get_structure', return_value=structure), \
+                mock.patch.object(CoursePerformancePresenter, 'grading_policy',
+                                  return_value=[{'assignment_type': 'Homework'}]), \
+                mock.patch('courses.views.CourseValidMixin.validate_courses'):
+            self.call_command(CourseSamples.DEMO_COURSE_ID, access_token='token', refresh=True)
+
+        self.assertEqual(cache.get_many(keys), {})
+
+    def test_failures(self):
+        with mock.patch.object(Command, 'warm_summaries'), \
+                mock.patch.object(Command, 'warm_course', side_effect=[1.0, ValueError, 1.0]):
+            with self.assertRaisesRegexp(CommandError, 'Unable to warm the caches for 1 courses'):
+                self.call_command(workers=1)
+
+    def test_access_token_required(self):
+        with self.assertRaises(CommandError):
+            call_command('warm_course_caches', access_token=None)
+
+
+class RateLimiterTests(TestCase):
+    @mock.patch('{}.time'.format(COMMAND_PATH))
+    def test_wait(self, mock_time):
+        mock_time.time.return_value = 100.0
+        limiter = RateLimiter(4)
+        for __ in range(3):
+            limiter.wait()
+        self.assertListEqual(mock_time.sleep.call_args_list, [mock.call(0.25), mock.call(0.5)])
+
+    @mock.patch('{}.time'.format(COMMAND_PATH))
+    def test_unlimited(self, mock_time):
+        limiter = RateLimiter(0)
+        limiter.wait()
+        self.assertFalse(mock_time.time.called)
@@ -1,6 +1,10 @@
 import re
 from waffle import flag_is_active, switch_is_active
 
+from django.core.urlresolvers import get_script_prefix, reverse
+from django.utils.encoding import force_text
+from django.utils.http import RFC3986_SUBDELIMS, urlquote
+
 from opaque_keys.edx.keys import UsageKey
 
 
@@ -25,6 +29,30 @@ def get_encoded_module_id(module_id):
     return UsageKey.from_string(module_id).html_id()
 
 
+# Matches the course_id URL pattern and is left as-is when reversed
+_COURSE_ID_PLACEHOLDER = 'course-v1:COURSE+ID+PLACEHOLDER'
+
+# Characters that reverse() leaves unquoted in URL arguments
+_URL_SAFE_CHARACTERS = RFC3986_SUBDELIMS + str('/~:@')
+
+_course_url_templates = {}
+
+
+def get_course_url(view_name, course_id):
+    """
+    Returns the path of a course view, as reverse() would.
+
+    Each view is reversed once per script prefix and the course ID is substituted into the result, so it is
+    not checked against the URL pattern.
+    """
+    key = (view_name, get_script_prefix())
+    template = _course_url_templates.get(key)
+    if template is None:
+        template = reverse(view_name, kwargs={'course_id': _COURSE_ID_PLACEHOLDER})
+        _course_url_templates[key] = template
+    return template.replace(_COURSE_ID_PLACEHOLDER, urlquote(force_text(course_id), safe=_URL_SAFE_CHARACTERS))
+
+
 def get_page_name(page_name_object):
     """Given a page_name object (scope, lens, report, depth), return a string with the levels concatenated in order."""
     return '_'.join([page_name_object[lvl] for lvl in ['scope', 'lens', 'report', 'depth'] if page_name_object[lvl]])
@@ -6,7 +6,6 @@ import re
 
 from braces.views import LoginRequiredMixin
 from django.conf import settings
-from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.core.urlresolvers import reverse
 from django.http import Http404
@@ -17,24 +16,29 @@ from django.views.generic import TemplateView
 from edx_rest_api_client.exceptions import (HttpClientError, SlumberBaseException)
 from opaque_keys.edx.keys import CourseKey
 import requests
-from waffle import flag_is_active, switch_is_active
+from waffle import switch_is_active
 
-from analyticsclient.client import Client
 from analyticsclient.exceptions import (ClientError, NotFoundError)
 
+from core import timing
+from core.caching import cache
 from core.exceptions import ServiceUnavailableError
-from core.utils import CourseStructureApiClient, sanitize_cache_key, translate_dict_values
+from core.utils import (CourseStructureApiClient, get_analytics_api_client, get_fetch_executor, get_http_session,
+                        get_prefetch_executor, sanitize_cache_key, translate_dict_values)
 
 from courses import permissions
 from courses.presenters.performance import CourseReportDownloadPresenter
 from courses.serializers import LazyEncoder
-from courses.utils import is_feature_enabled, get_page_name
+from courses.utils import get_course_url, is_feature_enabled, get_page_name
 
 from help.views import ContextSensitiveHelpMixin
 
 
 logger = logging.getLogger(__name__)
 
+# Nav and course home items compiled for each view and set of active switches and flags (see get_catalog)
+_catalogs = {}
+
 
 class CourseAPIMixin(object):
     access_token = None
@@ -42,6 +46,9 @@ class CourseAPIMixin(object):
     course_api = None
     course_id = None
 
+    # Number of courses requested from the Course API at a time by get_courses
+    courses_page_size = 100
+
     @cached_property
     def course_info(self):
         """
@@ -86,6 +93,19 @@ class CourseAPIMixin(object):
 
         return info
 
+    def _cache_course_details(self, course_details):
+        """ Caches the details of each course so that they don't need to be retrieved later. """
+        cache.set_many({self._course_detail_cache_key(course['id']): course for course in course_details})
+
+    def _get_courses_page(self, page):
+        """ Returns a page of course details from the Course API, or None if the page could not be retrieved. """
+        try:
+            logger.debug('Retrieving page %d of course info...', page)
+            return self.course_api.courses.get(page=page, page_size=self.courses_page_size)
+        except HttpClientError as e:
+            logger.error("Unable to retrieve course data: %s", e)
+            return None
+
     def get_courses(self):
         # Check the cache for the user's courses
         key = sanitize_cache_key(u'user_{}_courses'.format(self.request.user.pk))
@@ -94,31 +114,31 @@ class CourseAPIMixin(object):
         # If no cached courses, iterate over the data from the course API.
         if not courses:
             courses = []
-            page = 1
+            response = self._get_courses_page(1)
+
+            if response:
+                pagination = response['pagination']
+                responses = [response]
+                if pagination['next'] and pagination.get('num_pages'):
+                    # The number of pages is known, so retrieve the rest of them concurrently.
+                    responses += get_fetch_executor().map(timing.propagate(self._get_courses_page),
+                                                          range(2, pagination['num_pages'] + 1))
+                else:
+                    page = 1
+                    while response and response['pagination']['next']:
+                        page += 1
+                        response = self._get_courses_page(page)
+                        responses.append(response)
 
-            while page:
-                try:
-                    logger.debug('Retrieving page %d of course info...', page)
-                    response = self.course_api.courses.get(page=page, page_size=100)
+                for response in responses:
+                    if not response:
+                        # Keep the pages retrieved before the failure, as when pages were retrieved one at a time.
+                        break
                     course_details = response['results']
-
-                    # Cache the information so that it doesn't need to be retrieved later.
-                    for course in course_details:
-                        course_id = course['id']
-                        _key = self._course_detail_cache_key(course_id)
-                        cache.set(_key, course)
-
+                    self._cache_course_details(course_details)
                     courses += course_details
 
-                    if response['pagination']['next']:
-                        page += 1
-                    else:
-                        page = None
-                        logger.debug('Completed retrieval of course info. Retrieved info for %d courses.', len(courses))
-                except HttpClientError as e:
-                    logger.error("Unable to retrieve course data: %s", e)
-                    page = None
-                    break
+            logger.debug('Completed retrieval of course info. Retrieved info for %d courses.', len(courses))
 
         cache.set(key, courses)
         return courses
@@ -137,6 +157,11 @@ class TrackedViewMixin(object):
         'depth': '',
     }
 
+    def dispatch(self, request, *args, **kwargs):
+        # Reported by ServerTimingMiddleware
+        request.timing_page_name = get_page_name(self.page_name)
+        return super(TrackedViewMixin, self).dispatch(request, *args, **kwargs)
+
     def get_context_data(self, **kwargs):
         context = super(TrackedViewMixin, self).get_context_data(**kwargs)
         self.page_name['name'] = get_page_name(self.page_name)
@@ -154,7 +179,8 @@ class LazyEncoderMixin(object):
     def get_page_data(self, context):
         """ Returns JSON serialized data with lazy translations converted. """
         if 'js_data' in context:
-            return json.dumps(context['js_data'], cls=LazyEncoder)
+            with timing.timed('json'):
+                return json.dumps(context['js_data'], cls=LazyEncoder)
         return None
 
 
@@ -216,26 +242,89 @@ class CourseContextMixin(CourseAPIMixin, TrackedViewMixin, LazyEncoderMixin):
 class CourseValidMixin(object):
     """
     Mixin that checks the validity of a course ID against the LMS.
+
+    The LMS's answers are cached, for longer if the course is valid than if it is not.
     """
 
     course_id = None
 
-    def is_valid_course(self):
+    @staticmethod
+    def get_validation_cache_key(course_id):
+        """ Returns the key under which the validity of the course is cached. """
+        return sanitize_cache_key(u'course_{}_valid'.format(course_id))
+
+    @staticmethod
+    def _validate_course(course_id):
+        """ Returns whether the LMS knows of the course, or None if it did not answer in time. """
+        uri = '{0}/{1}/info'.format(settings.LMS_COURSE_VALIDATION_BASE_URL, course_id)
 
-        if settings.LMS_COURSE_VALIDATION_BASE_URL:
-            uri = '{0}/{1}/info'.format(settings.LMS_COURSE_VALIDATION_BASE_URL, self.course_id)
+        try:
+            response = get_http_session('lms').get(uri, timeout=settings.LMS_DEFAULT_TIMEOUT)
+        except requests.exceptions.Timeout:
+            logger.error('Course validation timed out: %s', uri)
+            return None
+
+        # pylint: disable=no-member
+        return response.status_code == requests.codes.ok
+
+    @classmethod
+    def validate_courses(cls, course_ids):
+        """
+        Returns a dictionary mapping each of the course IDs to whether it is valid.
+
+        Courses without a cached result are validated against the LMS concurrently, so this can be used to
+        validate a user's courses ahead of time.
+        """
+        if not settings.LMS_COURSE_VALIDATION_BASE_URL:
+            # all courses valid if LMS url isn't specified
+            return {course_id: True for course_id in course_ids}
+
+        keys = {course_id: cls.get_validation_cache_key(course_id) for course_id in course_ids}
+        cached = cache.get_many(keys.values())
+        results = {course_id: cached[key] for course_id, key in keys.iteritems() if key in cached}
+
+        missing_course_ids = [course_id for course_id in keys if course_id not in results]
+        if len(missing_course_ids) > 1:
+            validations = get_fetch_executor().map(timing.propagate(cls._validate_course), missing_course_ids)
+        else:
+            validations = [cls._validate_course(course_id) for course_id in missing_course_ids]
+
+        valid, invalid = {}, {}
+        for course_id, is_valid in zip(missing_course_ids, validations):
+            if is_valid is None:
+                # consider the course valid if the LMS times out, but ask again next time
+                results[course_id] = True
+                continue
+
+            results[course_id] = is_valid
+            (valid if is_valid else invalid)[keys[course_id]] = is_valid
+
+        if valid:
+            cache.set_many(valid, settings.COURSE_VALIDATION_CACHE_TIMEOUT)
+        if invalid:
+            cache.set_many(invalid, settings.COURSE_VALIDATION_NEGATIVE_CACHE_TIMEOUT)
+
+        return results
+
+    @classmethod
+    def prevalidate_courses(cls, course_ids):
+        """
+        Validates up to COURSE_VALIDATION_PREFETCH_LIMIT of the courses on the prefetch thread pool, so that
+        the course pages a user opens next find the LMS's answers cached.
+        """
+        if not settings.LMS_COURSE_VALIDATION_BASE_URL:
+            return
 
+        def prevalidate():
             try:
-                response = requests.get(uri, timeout=settings.LMS_DEFAULT_TIMEOUT)
-            except requests.exceptions.Timeout:
-                logger.error('Course validation timed out: %s', uri)
-                # consider the course valid if the LMS times out
-                return True
+                cls.validate_courses(course_ids[:settings.COURSE_VALIDATION_PREFETCH_LIMIT])
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Unable to prevalidate courses.')
 
-            # pylint: disable=no-member
-            return response.status_code == requests.codes.ok
-        # all courses valid if LMS url isn't specified
-        return True
+        get_prefetch_executor().submit(prevalidate)
+
+    def is_valid_course(self):
+        return self.validate_courses([self.course_id])[self.course_id]
 
     def dispatch(self, request, *args, **kwargs):
         if self.is_valid_course():
@@ -280,81 +369,116 @@ class CourseNavBarMixin(object):
     # Items that will populate the tertiary nav list. This value is optional.
     tertiary_nav_items = []
 
-    def get_primary_nav_items(self, request):
-        """
-        Return the primary nav items.
-        """
-
-        items = [
-            {
-                'name': 'enrollment',
-                'text': ugettext_noop('Enrollment'),
-                'view': 'courses:enrollment:activity',
-                'icon': 'fa-child',
-                'fragment': '',
-                'scope': 'course',
-                'lens': 'enrollment',
-                'report': 'activity',
-                'depth': ''
-            },
-            {
-                'name': 'engagement',
-                'text': ugettext_noop('Engagement'),
-                'view': 'courses:engagement:content',
-                'icon': 'fa-bar-chart',
-                'fragment': '',
-                'scope': 'course',
-                'lens': 'engagement',
-                'report': 'content',
-                'depth': ''
-            },
-            {
-                'name': 'performance',
-                'text': ugettext_noop('Performance'),
-                'view': 'courses:performance:graded_content',
-                'icon': 'fa-check-square-o',
-                'switch': 'enable_course_api',
-                'fragment': '',
-                'scope': 'course',
-                'lens': 'performance',
-                'report': 'graded',
-                'depth': ''
-            },
-            {
-                'name': 'learners',
-                'text': ugettext_noop('Learners'),
-                'view': 'courses:learners:learners',
-                'icon': 'fa-users',
-                'flag': 'display_learner_analytics',
-                'fragment': '#?ignore_segments=inactive',
-                'scope': 'course',
-                'lens': 'learners',
-                'report': 'roster',
-                'depth': ''
-            }
-
-        ]
+    # Whether each (switch, flag) pair is active for the request, filled in by _is_enabled
+    _feature_states = None
 
-        translate_dict_values(items, ('text',))
-
-        # Remove disabled items
-        items = [item for item in items if is_feature_enabled(item, request)]
-
-        # Clean each item
-        map(self.clean_item, items)
+    # Items that populate the primary nav list.
+    primary_nav_items = [
+        {
+            'name': 'enrollment',
+            'text': ugettext_noop('Enrollment'),
+            'view': 'courses:enrollment:activity',
+            'icon': 'fa-child',
+            'fragment': '',
+            'scope': 'course',
+            'lens': 'enrollment',
+            'report': 'activity',
+            'depth': ''
+        },
+        {
+            'name': 'engagement',
+            'text': ugettext_noop('Engagement'),
+            'view': 'courses:engagement:content',
+            'icon': 'fa-bar-chart',
+            'fragment': '',
+            'scope': 'course',
+            'lens': 'engagement',
+            'report': 'content',
+            'depth': ''
+        },
+        {
+            'name': 'performance',
+            'text': ugettext_noop('Performance'),
+            'view': 'courses:performance:graded_content',
+            'icon': 'fa-check-square-o',
+            'switch': 'enable_course_api',
+            'fragment': '',
+            'scope': 'course',
+            'lens': 'performance',
+            'report': 'graded',
+            'depth': ''
+        },
+        {
+            'name': 'learners',
+            'text': ugettext_noop('Learners'),
+            'view': 'courses:learners:learners',
+            'icon': 'fa-users',
+            'flag': 'display_learner_analytics',
+            'fragment': '#?ignore_segments=inactive',
+            'scope': 'course',
+            'lens': 'learners',
+            'report': 'roster',
+            'depth': ''
+        }
+    ]
+    translate_dict_values(primary_nav_items, ('text',))
 
-        return items
+    def _is_enabled(self, item, request):
+        """
+        Returns True if the switch or flag of item is active, checking each switch and flag once per request.
+        """
+        feature = (item.get('switch'), item.get('flag'))
+        if self._feature_states is None:
+            self._feature_states = {}
+        if feature not in self._feature_states:
+            self._feature_states[feature] = is_feature_enabled(item, request)
+        return self._feature_states[feature]
+
+    def get_catalog(self, name, items, request, compile_items):
+        """
+        Return the items compiled by compile_items(items, request) for the switches and flags active for request.
 
-    def _build_nav_items(self, nav_items, active_item, request):
-        # Deep copy the list since it is a list of dictionaries
-        items = copy.deepcopy(nav_items)
+        Catalogs are shared by every request to the view with the same switches and flags active, so they must
+        not be modified.  Their text is translated lazily, so one catalog serves every language.
+        """
+        children = [child for item in items for child in item.get('items', [])]
+        active = frozenset((item.get('switch'), item.get('flag')) for item in items + children
+                           if self._is_enabled(item, request))
+
+        key = (type(self), name, active)
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = compile_items(items, request)
+            _catalogs[key] = catalog
+        return catalog
+
+    def compile_nav_items(self, nav_items, request):
+        """
+        Return (view name, item) pairs for the enabled nav items, without the keys used to build them.
+        """
+        compiled = []
+        for item in nav_items:
+            if self._is_enabled(item, request):
+                item = dict(item)
+                view = item.pop('view')
+                item.pop('switch', None)
+                compiled.append((view, item))
+        return compiled
 
-        # Process only the nav items that are enabled
-        items = [item for item in items if is_feature_enabled(item, request)]
+    def get_primary_nav_items(self, request):
+        """
+        Return the primary nav items.
+        """
+        catalog = self.get_catalog('primary', self.primary_nav_items, request, self.compile_nav_items)
+        return [dict(item, href=get_course_url(view, self.course_id)) for view, item in catalog]
 
-        for item in items:
-            item['active'] = active_item == item['name']
-            self.clean_item(item)
+    def _build_nav_items(self, name, nav_items, active_item, request):
+        items = []
+        for view, item in self.get_catalog(name, nav_items, request, self.compile_nav_items):
+            item = dict(item, active=active_item == item['name'])
+            # Prevent page reload if user clicks on the active navbar item, otherwise navigate to the new page.
+            item['href'] = '#' if item['active'] else get_course_url(view, self.course_id)
+            items.append(item)
 
         return items
 
@@ -362,29 +486,13 @@ class CourseNavBarMixin(object):
         """
         Return the secondary nav items.
         """
-        return self._build_nav_items(self.secondary_nav_items, self.active_secondary_nav_item, request)
+        return self._build_nav_items('secondary', self.secondary_nav_items, self.active_secondary_nav_item, request)
 
     def get_tertiary_nav_items(self, request):
         """
         Return the tertiary nav items.
         """
-        return self._build_nav_items(self.tertiary_nav_items, self.active_tertiary_nav_item, request)
-
-    def clean_item(self, item):
-        """
-        Remove extraneous keys from item and set the href value.
-        """
-        # Prevent page reload if user clicks on the active navbar item, otherwise navigate to the new page.
-        if item.get('active', False):
-            href = '#'
-        else:
-            href = reverse(item['view'], kwargs={'course_id': self.course_id})
-
-        item['href'] = href
-
-        # Delete entries that are no longer needed
-        item.pop('view', None)
-        item.pop('switch', None)
+        return self._build_nav_items('tertiary', self.tertiary_nav_items, self.active_tertiary_nav_item, request)
 
     def get_context_data(self, **kwargs):
         context = super(CourseNavBarMixin, self).get_context_data(**kwargs)
@@ -441,11 +549,13 @@ class CourseView(LoginRequiredMixin, CourseValidMixin, CoursePermissionMixin, Te
 
     def get_context_data(self, **kwargs):
         context = super(CourseView, self).get_context_data(**kwargs)
-        self.client = Client(base_url=settings.DATA_API_URL,
-                             auth_token=settings.DATA_API_AUTH_TOKEN, timeout=settings.LMS_DEFAULT_TIMEOUT)
+        self.client = self.get_api_client()
         self.course = self.client.courses(self.course_id)
         return context
 
+    def get_api_client(self):
+        return get_analytics_api_client(timeout=settings.LMS_DEFAULT_TIMEOUT)
+
 
 class LastUpdatedView(object):
     def get_last_updated_message(self, last_updated):
@@ -475,6 +585,13 @@ class CourseTemplateWithNavView(CourseNavBarMixin, CourseTemplateView):
     pass
 
 
+def translate_table_columns(columns):
+    """ Translates the names of the course home table columns and the titles of their items. """
+    translate_dict_values(columns, ('name',))
+    for column in columns:
+        translate_dict_values(column['items'], ('title',))
+
+
 class CourseHome(CourseTemplateWithNavView):
     template_name = 'courses/home.html'
     page_name = {
@@ -484,11 +601,12 @@ class CourseHome(CourseTemplateWithNavView):
         'depth': ''
     }
     page_title = _('Course Home')
+    report_info_future = None
 
-    def get_table_items(self, request):
-        items = []
-
-        enrollment_items = {
+    # Questions listed on the course home page, grouped by column.  Columns and items with a switch or flag are
+    # shown when it is active; items in the CSV format link to a report, and are shown once it is available.
+    table_columns = [
+        {
             'name': _('Enrollment'),
             'icon': 'fa-child',
             'heading': _('Who are my learners?'),
@@ -544,10 +662,8 @@ class CourseHome(CourseTemplateWithNavView):
                     'depth': ''
                 },
             ],
-        }
-        items.append(enrollment_items)
-
-        engagement_items = {
+        },
+        {
             'name': _('Engagement'),
             'icon': 'fa-bar-chart',
             'heading': _('What are learners doing in my course?'),
@@ -561,125 +677,161 @@ class CourseHome(CourseTemplateWithNavView):
                     'lens': 'engagement',
                     'report': 'content',
                     'depth': ''
-                }
-            ]
-        }
-        if switch_is_active('enable_engagement_videos_pages'):
-            engagement_items['items'].append({
-                'title': ugettext_noop('How did learners interact with course videos?'),
-                'view': 'courses:engagement:videos',
-                'breadcrumbs': [_('Videos')],
-                'fragment': '',
-                'scope': 'course',
-                'lens': 'engagement',
-                'report': 'videos',
-                'depth': ''
-            })
-
-        items.append(engagement_items)
-
-        if self.course_api_enabled:
-            subitems = [{
-                'title': ugettext_noop('How are learners doing on graded course assignments?'),
-                'view': 'courses:performance:graded_content',
-                'breadcrumbs': [_('Graded Content')],
-                'fragment': '',
-                'scope': 'course',
-                'lens': 'performance',
-                'report': 'graded',
-                'depth': ''
-            }, {
-                'title': ugettext_noop('How are learners doing on ungraded exercises?'),
-                'view': 'courses:performance:ungraded_content',
-                'breadcrumbs': [_('Ungraded Problems')],
-                'fragment': '',
-                'scope': 'course',
-                'lens': 'performance',
-                'report': 'ungraded',
-                'depth': ''
-            }]
-
-            if switch_is_active('enable_performance_learning_outcome'):
-                subitems.append({
+                },
+                {
+                    'title': ugettext_noop('How did learners interact with course videos?'),
+                    'view': 'courses:engagement:videos',
+                    'switch': 'enable_engagement_videos_pages',
+                    'breadcrumbs': [_('Videos')],
+                    'fragment': '',
+                    'scope': 'course',
+                    'lens': 'engagement',
+                    'report': 'videos',
+                    'depth': ''
+                },
+            ],
+        },
+        {
+            'name': _('Performance'),
+            'icon': 'fa-check-square-o',
+            'heading': _('How are learners doing on course assignments?'),
+            'switch': 'enable_course_api',
+            'items': [
+                {
+                    'title': ugettext_noop('How are learners doing on graded course assignments?'),
+                    'view': 'courses:performance:graded_content',
+                    'breadcrumbs': [_('Graded Content')],
+                    'fragment': '',
+                    'scope': 'course',
+                    'lens': 'performance',
+                    'report': 'graded',
+                    'depth': ''
+                },
+                {
+                    'title': ugettext_noop('How are learners doing on ungraded exercises?'),
+                    'view': 'courses:performance:ungraded_content',
+                    'breadcrumbs': [_('Ungraded Problems')],
+                    'fragment': '',
+                    'scope': 'course',
+                    'lens': 'performance',
+                    'report': 'ungraded',
+                    'depth': ''
+                },
+                {
                     'title': ugettext_noop('What is the breakdown for course learning outcomes?'),
                     'view': 'courses:performance:learning_outcomes',
+                    'switch': 'enable_performance_learning_outcome',
                     'breadcrumbs': [_('Learning Outcomes')],
                     'fragment': '',
                     'scope': 'course',
                     'lens': 'performance',
                     'report': 'outcomes',
                     'depth': ''
-                })
-
-            if switch_is_active('enable_problem_response_download'):
-                try:
-                    info = CourseReportDownloadPresenter(self.course_id).get_report_info(
-                        report_name=CourseReportDownloadPresenter.PROBLEM_RESPONSES
-                    )
-                except NotFoundError:
-                    info = {}
-                if 'download_url' in info:
-                    # A problem response report CSV is available:
-                    subitems.append({
-                        'title': ugettext_noop('How are learners responding to questions?'),
-                        'view': 'courses:csv:performance_problem_responses',
-                        'breadcrumbs': [_('Problem Response Report')],
-                        'format': 'csv',
-                    })
-
-            items.append({
-                'name': _('Performance'),
-                'icon': 'fa-check-square-o',
-                'heading': _('How are learners doing on course assignments?'),
-                'items': subitems
-            })
+                },
+                {
+                    'title': ugettext_noop('How are learners responding to questions?'),
+                    'view': 'courses:csv:performance_problem_responses',
+                    'switch': 'enable_problem_response_download',
+                    'breadcrumbs': [_('Problem Response Report')],
+                    'format': 'csv',
+                },
+            ],
+        },
+        {
+            'name': _('Learners'),
+            'icon': 'fa-users',
+            'heading': _('What are individual learners doing?'),
+            'flag': 'display_learner_analytics',
+            'items': [
+                {
+                    'title': ugettext_noop("Who is engaged? Who isn't?"),
+                    'view': 'courses:learners:learners',
+                    'breadcrumbs': [_('All Learners')],
+                    'fragment': '#?ignore_segments=inactive',
+                    'scope': 'course',
+                    'lens': 'learners',
+                    'report': 'roster',
+                    'depth': ''
+                },
+                # TODO: this is commented out until we complete the deep linking work, AN-6671
+                # {
+                #     'title': _('Who has been active recently?'),
+                #     'view': 'courses:learners:learners',  # TODO: map this to the actual action in AN-6205
+                #     # TODO: what would the breadcrumbs be?
+                #     'breadcrumbs': [_('Learners')]
+                # },
+                # {
+                #     'title': _('Who is most engaged in the discussions?'),
+                #     'view': 'courses:learners:learners',  # TODO: map this to the actual action in AN-6205
+                #     # TODO: what would the breadcrumbs be?
+                #     'breadcrumbs': [_('Learners')]
+                # },
+                # {
+                #     'title': _("Who hasn't watched videos recently?"),
+                #     'view': 'courses:learners:learners',  # TODO: map this to the actual action in AN-6205
+                #     # TODO: what would the breadcrumbs be?
+                #     'breadcrumbs': [_('Learners')]
+                # }
+            ],
+        },
+    ]
+    translate_table_columns(table_columns)
 
-        if flag_is_active(request, 'display_learner_analytics'):
-            items.append({
-                'name': _('Learners'),
-                'icon': 'fa-users',
-                'heading': _('What are individual learners doing?'),
-                'items': [
-                    {
-                        'title': ugettext_noop("Who is engaged? Who isn't?"),
-                        'view': 'courses:learners:learners',
-                        'breadcrumbs': [_('All Learners')],
-                        'fragment': '#?ignore_segments=inactive',
-                        'scope': 'course',
-                        'lens': 'learners',
-                        'report': 'roster',
-                        'depth': ''
-                    },
-                    # TODO: this is commented out until we complete the deep linking work, AN-6671
-                    # {
-                    #     'title': _('Who has been active recently?'),
-                    #     'view': 'courses:learners:learners',  # TODO: map this to the actual action in AN-6205
-                    #     # TODO: what would the breadcrumbs be?
-                    #     'breadcrumbs': [_('Learners')]
-                    # },
-                    # {
-                    #     'title': _('Who is most engaged in the discussions?'),
-                    #     'view': 'courses:learners:learners',  # TODO: map this to the actual action in AN-6205
-                    #     # TODO: what would the breadcrumbs be?
-                    #     'breadcrumbs': [_('Learners')]
-                    # },
-                    # {
-                    #     'title': _("Who hasn't watched videos recently?"),
-                    #     'view': 'courses:learners:learners',  # TODO: map this to the actual action in AN-6205
-                    #     # TODO: what would the breadcrumbs be?
-                    #     'breadcrumbs': [_('Learners')]
-                    # }
-                ]
-            })
+    def _start_problem_response_report_info_fetch(self):
+        """
+        Starts retrieving the problem response report info in the background so that it overlaps
+        with the Course API requests made while building the rest of the context.
+        """
+        if self.course_api_enabled and switch_is_active('enable_problem_response_download'):
+            presenter = CourseReportDownloadPresenter(self.course_id)
+            self.report_info_future = presenter.submit(
+                presenter.get_report_info, report_name=CourseReportDownloadPresenter.PROBLEM_RESPONSES
+            )
+
+    def _get_problem_response_report_info(self):
+        if self.report_info_future:
+            return self.report_info_future.result()
+        return CourseReportDownloadPresenter(self.course_id).get_report_info(
+            report_name=CourseReportDownloadPresenter.PROBLEM_RESPONSES
+        )
+
+    def compile_table_columns(self, columns, request):
+        """
+        Return the enabled columns with their enabled items, without the switches and flags.
+        """
+        compiled = []
+        for column in columns:
+            if self._is_enabled(column, request):
+                column = {key: value for key, value in column.iteritems() if key not in ('switch', 'flag')}
+                column['items'] = [{key: value for key, value in item.iteritems() if key != 'switch'}
+                                   for item in column['items'] if self._is_enabled(item, request)]
+                compiled.append(column)
+        return compiled
+
+    def is_report_available(self):
+        """
+        Return True if the problem response report can be downloaded.
+        """
+        try:
+            info = self._get_problem_response_report_info()
+        except NotFoundError:
+            info = {}
+        return 'download_url' in info
 
-        translate_dict_values(items, ('name',))
-        for item in items:
-            translate_dict_values(item['items'], ('title',))
+    def get_table_items(self, request):
+        items = []
+        for column in self.get_catalog('table', self.table_columns, request, self.compile_table_columns):
+            column = dict(column, items=[
+                dict(item, href=get_course_url(item['view'], self.course_id)) for item in column['items']
+                if item.get('format') != 'csv' or self.is_report_available()
+            ])
+            items.append(column)
 
         return items
 
     # pylint: disable=redefined-variable-type
     def get_context_data(self, **kwargs):
+        self._start_problem_response_report_info_fetch()
         context = super(CourseHome, self).get_context_data(**kwargs)
         context.update({
             'table_items': self.get_table_items(self.request)
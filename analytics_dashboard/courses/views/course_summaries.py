@@ -13,6 +13,7 @@ from core.utils import remove_keys
 from courses import permissions
 from courses.views import (
     CourseAPIMixin,
+    CourseValidMixin,
     LastUpdatedView,
     LazyEncoderMixin,
     TemplateView,
@@ -47,6 +48,9 @@ class CourseIndex(CourseAPIMixin, LoginRequiredMixin, TrackedViewMixin, LastUpda
             # The user is probably not a course administrator and should not be using this application.
             raise PermissionDenied
 
+        # The user is likely to open one of their courses next
+        CourseValidMixin.prevalidate_courses(courses)
+
         summaries_presenter = CourseSummariesPresenter()
         summaries, last_updated = summaries_presenter.get_course_summaries(courses)
 
@@ -2,12 +2,15 @@ import datetime
 import logging
 import urllib
 
-from django.http import HttpResponse, HttpResponseRedirect
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.utils import timezone
+import requests
 
 from analyticsclient.constants import data_format, demographic
 from analyticsclient.client import Client
 
+from core.utils import get_analytics_api_client, iter_response_content
 from courses.presenters.performance import CourseReportDownloadPresenter
 from courses.views import CourseView
 
@@ -51,6 +54,31 @@ class CourseCSVResponseMixin(CSVResponseMixin):
         return '-'.join([course_key.org, course_key.course, course_key.run])
 
 
+# pylint: disable=W0223
+class StreamingCSVResponseMixin(CourseCSVResponseMixin):
+    """
+    A CourseCSVResponseMixin for large exports.
+
+    The Data API response is relayed to the browser as it arrives instead of being read into memory first.
+    """
+    def get_api_client(self):
+        return get_analytics_api_client(timeout=settings.LMS_DEFAULT_TIMEOUT, stream=True)
+
+    # pylint: disable=unused-argument
+    def render_to_response(self, context, **response_kwargs):
+        data = self.get_data()
+        if isinstance(data, requests.Response):
+            content = iter_response_content(data)
+        elif isinstance(data, basestring):
+            content = [data]
+        else:
+            content = data
+
+        response = StreamingHttpResponse(content, content_type='text/csv', **response_kwargs)
+        response['Content-Disposition'] = u'attachment; filename="{0}"'.format(self._get_filename())
+        return response
+
+
 # pylint: disable=W0223
 class DatetimeCSVResponseMixin(CSVResponseMixin):
     """A CSVResponseMixin that implements csv_identifier to be the current time in ISO format."""
@@ -88,7 +116,7 @@ class CourseEnrollmentByCountryCSV(CourseCSVResponseMixin, CourseView):
         return self.course.enrollment(demographic.LOCATION, data_format=data_format.CSV)
 
 
-class CourseEnrollmentCSV(CourseCSVResponseMixin, CourseView):
+class CourseEnrollmentCSV(StreamingCSVResponseMixin, CourseView):
     csv_filename_suffix = u'enrollment'
 
     def get_data(self):
@@ -96,7 +124,7 @@ class CourseEnrollmentCSV(CourseCSVResponseMixin, CourseView):
         return self.course.enrollment('mode', data_format=data_format.CSV, end_date=end_date)
 
 
-class CourseEngagementActivityTrendCSV(CourseCSVResponseMixin, CourseView):
+class CourseEngagementActivityTrendCSV(StreamingCSVResponseMixin, CourseView):
     csv_filename_suffix = u'engagement-activity'
 
     def get_data(self):
@@ -104,7 +132,7 @@ class CourseEngagementActivityTrendCSV(CourseCSVResponseMixin, CourseView):
         return self.course.activity(data_format=data_format.CSV, end_date=end_date)
 
 
-class CourseEngagementVideoTimelineCSV(CourseCSVResponseMixin, CourseView):
+class CourseEngagementVideoTimelineCSV(StreamingCSVResponseMixin, CourseView):
     csv_filename_suffix = u'engagement-video-timeline'
 
     def get_data(self):
@@ -112,7 +140,7 @@ class CourseEngagementVideoTimelineCSV(CourseCSVResponseMixin, CourseView):
         return modules.video_timeline(data_format=data_format.CSV)
 
 
-class PerformanceAnswerDistributionCSV(CourseCSVResponseMixin, CourseView):
+class PerformanceAnswerDistributionCSV(StreamingCSVResponseMixin, CourseView):
     csv_filename_suffix = u'performance-answer-distribution'
 
     def get_data(self):
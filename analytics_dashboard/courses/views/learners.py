@@ -1,3 +1,4 @@
+from concurrent import futures
 import logging
 from urllib import urlencode
 from requests.exceptions import ConnectionError, Timeout
@@ -7,6 +8,8 @@ from django.core.urlresolvers import reverse
 from django.utils.translation import ugettext_lazy as _
 from waffle import switch_is_active
 
+from core import timing
+from core.utils import get_learners_prefetch_executor
 from courses.views import CourseTemplateWithNavView
 from learner_analytics_api.v0.clients import LearnerAPIClient
 
@@ -42,27 +45,39 @@ class LearnersView(CourseTemplateWithNavView):
             ),
         })
 
-        # Try to prefetch API responses.  If anything fails, the front-end will
-        # retry the requests and gracefully fail.
-        client = LearnerAPIClient()
-        for data_name, request_function, error_message in [
-                (
-                    'learner_list_json',
-                    lambda: client.learners.get(course_id=self.course_id).json(),
-                    'Failed to reach the Learner List endpoint',
-                ),
-                (
-                    'course_learner_metadata_json',
-                    lambda: client.course_learner_metadata(self.course_id).get().json(),
-                    'Failed to reach the Course Learner Metadata endpoint',
-                )
-        ]:
-            try:
-                context[data_name] = request_function()
-            except (Timeout, ConnectionError, ValueError):
-                # ValueError may be thrown by the call to .json()
-                logger.exception(error_message)
-                context[data_name] = error_message
+        # Try to prefetch API responses concurrently.  If anything fails, the front-end will
+        # retry the requests and gracefully fail.  Responses that are not ready within the
+        # prefetch budget are left as None, which tells the front-end to fetch them itself.
+        client = LearnerAPIClient(timeout=settings.LEARNERS_PREFETCH_TIMEOUT)
+        executor = get_learners_prefetch_executor()
+        prefetches = [
+            (
+                'learner_list_json',
+                executor.submit(timing.propagate(lambda: client.learners.get(course_id=self.course_id).json())),
+                'Failed to reach the Learner List endpoint',
+            ),
+            (
+                'course_learner_metadata_json',
+                executor.submit(timing.propagate(lambda: client.course_learner_metadata(self.course_id).get().json())),
+                'Failed to reach the Course Learner Metadata endpoint',
+            ),
+        ]
+        futures.wait([future for _, future, _ in prefetches], timeout=settings.LEARNERS_PREFETCH_BUDGET)
+
+        for data_name, future, error_message in prefetches:
+            if not future.done():
+                # Prefetches that have not started are dropped, rather than fetching what no one will read
+                future.cancel()
+                logger.warning('Prefetching %s took longer than %s seconds; it will be fetched client-side.',
+                               data_name, settings.LEARNERS_PREFETCH_BUDGET)
+                context[data_name] = None
+            else:
+                try:
+                    context[data_name] = future.result()
+                except (Timeout, ConnectionError, ValueError):
+                    # ValueError may be thrown by the call to .json()
+                    logger.exception(error_message)
+                    context[data_name] = error_message
             context['js_data']['course'].update({
                 data_name: context[data_name]
             })
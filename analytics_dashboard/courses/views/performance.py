@@ -1,4 +1,3 @@
-import copy
 import logging
 
 from django.conf import settings
@@ -32,7 +31,7 @@ class PerformanceTemplateView(CourseStructureExceptionMixin, CourseTemplateWithN
     # Translators: Do not translate UTC.
     update_message = _('Problem submission data was last updated %(update_date)s at %(update_time)s UTC.')
 
-    secondary_nav_items_base = [
+    secondary_nav_items = [
         {
             'name': 'graded_content',
             'text': ugettext_noop('Graded Content'),
@@ -51,26 +50,21 @@ class PerformanceTemplateView(CourseStructureExceptionMixin, CourseTemplateWithN
             'report': 'ungraded',
             'depth': ''
         },
+        {
+            'name': 'learning_outcomes',
+            'text': ugettext_noop('Learning Outcomes'),
+            'view': 'courses:performance:learning_outcomes',
+            'switch': 'enable_performance_learning_outcome',
+            'scope': 'course',
+            'lens': 'performance',
+            'report': 'outcomes',
+            'depth': ''
+        },
     ]
-    translate_dict_values(secondary_nav_items_base, ('text',))
-    secondary_nav_items = None
+    translate_dict_values(secondary_nav_items, ('text',))
     active_primary_nav_item = 'performance'
 
     def get_context_data(self, **kwargs):
-        self.secondary_nav_items = copy.deepcopy(self.secondary_nav_items_base)
-        if switch_is_active('enable_performance_learning_outcome'):
-            if not any(d['name'] == 'learning_outcomes' for d in self.secondary_nav_items):
-                self.secondary_nav_items.append({
-                    'name': 'learning_outcomes',
-                    'text': ugettext_noop('Learning Outcomes'),
-                    'view': 'courses:performance:learning_outcomes',
-                    'scope': 'course',
-                    'lens': 'performance',
-                    'report': 'outcomes',
-                    'depth': ''
-                })
-                translate_dict_values(self.secondary_nav_items, ('text',))
-
         context_data = super(PerformanceTemplateView, self).get_context_data(**kwargs)
         self.presenter = CoursePerformancePresenter(self.access_token, self.course_id)
 
@@ -200,6 +194,30 @@ class PerformanceAnswerDistributionView(PerformanceAnswerDistributionMixin,
         'depth': 'problem'
     }
 
+    def get_context_data(self, **kwargs):
+        context = super(PerformanceAnswerDistributionView, self).get_context_data(**kwargs)
+
+        if switch_is_active('enable_answer_distribution_prefetch'):
+            # Instructors commonly step through an assignment problem by problem
+            self.presenter.prefetch_answer_distributions(self.get_next_problem_ids())
+
+        return context
+
+    def get_next_problem_ids(self):
+        """
+        Returns the IDs of the ANSWER_DISTRIBUTION_PREFETCH_COUNT problems with submissions that follow this
+        one in its assignment.
+        """
+        if not self.assignment:
+            return []
+
+        problem_ids = [problem['id'] for problem in self.assignment['children'] if problem.get('url')]
+        if self.problem_id not in problem_ids:
+            return []
+
+        start = problem_ids.index(self.problem_id) + 1
+        return problem_ids[start:start + settings.ANSWER_DISTRIBUTION_PREFETCH_COUNT]
+
 
 class PerformanceGradedContent(PerformanceGradedContentTemplateView):
     template_name = 'courses/performance_graded_content.html'
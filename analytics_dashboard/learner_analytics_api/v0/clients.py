@@ -3,6 +3,9 @@ from slumber import API, exceptions, Resource, serialize
 
 from django.conf import settings
 
+from core import timing
+from core.utils import mount_http_adapter
+
 
 class TokenAuth(requests.auth.AuthBase):
     """A requests auth class for DRF-style token-based authentication"""
@@ -14,6 +17,21 @@ class TokenAuth(requests.auth.AuthBase):
         return r
 
 
+class TimeoutSession(requests.Session):
+    """
+    A requests session that applies a default timeout to its requests.  Unlike an attribute set on a plain
+    session, which requests ignores, the timeout is passed to every request made without one.
+    """
+    def __init__(self, timeout=None):
+        super(TimeoutSession, self).__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super(TimeoutSession, self).request(method, url, **kwargs)
+
+
 class TextSerializer(serialize.BaseSerializer):
     """
     Slumber API Serializer for text data, e.g. CSV.
@@ -45,16 +63,23 @@ class LearnerApiResource(Resource):
         return response
 
     def _process_response(self, response):
-        response.serialized_content = self._try_to_serialize_response(response)
+        if self._store['session'].stream and response.ok:
+            # Leave the body on the connection so that it can be relayed to the browser in chunks.
+            response.serialized_content = None
+        else:
+            response.serialized_content = self._try_to_serialize_response(response)
         return response
 
 
 class LearnerAPIClient(API):
     resource_class = LearnerApiResource
 
-    def __init__(self, timeout=5, serializer_type='json'):
-        session = requests.session()
-        session.timeout = timeout
+    def __init__(self, timeout=5, serializer_type='json', stream=False):
+        # Each client has its own session, so that its headers are its own, but connections come from
+        # the process-wide pool for the Data API.
+        session = mount_http_adapter(TimeoutSession(timeout), 'data_api')
+        session.stream = stream
+        timing.add_response_hook(session, 'learner_api')
 
         serializers = serialize.Serializer(
             default=serializer_type,
@@ -70,3 +95,10 @@ class LearnerAPIClient(API):
             auth=TokenAuth(settings.DATA_API_AUTH_TOKEN),
             serializer=serializers,
         )
+
+    def if_none_match(self, etag):
+        """
+        Sends the ETag of a previously-retrieved response with subsequent requests, so that the API can
+        answer 304 Not Modified if the response has not changed.
+        """
+        self._store['session'].headers['If-None-Match'] = etag
@@ -3,10 +3,11 @@ import json
 import ddt
 import httpretty
 import mock
-from requests.exceptions import ConnectTimeout
+from requests.exceptions import ConnectTimeout, ReadTimeout
 
 from django.conf import settings
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from waffle.testutils import override_flag
 
@@ -46,7 +47,8 @@ class LearnerAPITestMixin(UserTestCaseMixin, PermissionsTestMixin):
     def assert_response_equals(self, response, expected_status_code, expected_body=None):
         self.assertEqual(response.status_code, expected_status_code)
         if expected_body is not None:
-            self.assertEqual(json.loads(response.content), expected_body)
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+            self.assertEqual(json.loads(content), expected_body)
 
     def test_not_authenticated(self):
         response = self.client.get('/api/learner_analytics/v0' + self.endpoint, self.required_query_params)
@@ -57,11 +59,13 @@ class LearnerAPITestMixin(UserTestCaseMixin, PermissionsTestMixin):
         response = self.client.get('/api/learner_analytics/v0' + self.endpoint, self.required_query_params)
         self.assert_response_equals(response, self.no_permissions_status_code)
 
-    @mock.patch('learner_analytics_api.v0.clients.LearnerApiResource._request', mock.Mock(side_effect=ConnectTimeout))
-    def test_timeout(self):
+    @ddt.data(ConnectTimeout, ReadTimeout)
+    def test_timeout(self, timeout_class):
         self.login()
         self.grant_permission(self.user, 'edX/DemoX/Demo_Course')
-        response = self.client.get('/api/learner_analytics/v0' + self.endpoint, self.required_query_params)
+        with mock.patch('learner_analytics_api.v0.clients.LearnerApiResource._request',
+                        mock.Mock(side_effect=timeout_class)):
+            response = self.client.get('/api/learner_analytics/v0' + self.endpoint, self.required_query_params)
         self.assertEqual(response.status_code, 504)
 
     @ddt.data((200, {'test': 'value'}), (400, {'a': 'b', 'c': 'd'}), (500, {}))
@@ -104,6 +108,47 @@ class LearnerListViewTestCase(LearnerAPITestMixin, TestCase):
         response = self.client.get('/api/learner_analytics/v0/learners/')
         self.assert_response_equals(response, 403, {'detail': 'You do not have permission to perform this action.'})
 
+    def register_learners(self, body, status=200, **kwargs):
+        httpretty.register_uri(
+            httpretty.GET, settings.DATA_API_URL + self.remote_endpoint, body=json.dumps(body), status=status,
+            content_type=self.content_type, **kwargs
+        )
+
+    def get_learners(self, **params):
+        params.update(self.required_query_params)
+        return self.client.get('/api/learner_analytics/v0' + self.endpoint, params)
+
+    @httpretty.activate
+    def test_responses_cached(self):
+        self.login()
+        self.grant_permission(self.user, 'edX/DemoX/Demo_Course')
+        self.register_learners({'results': ['first']})
+        response = self.get_learners()
+        self.assert_response_equals(response, 200, {'results': ['first']})
+
+        # Identical requests are answered from the cache
+        self.register_learners({'results': ['second']})
+        response = self.get_learners()
+        self.assert_response_equals(response, 200, {'results': ['first']})
+
+        # Requests with different parameters are not
+        response = self.get_learners(page=2)
+        self.assert_response_equals(response, 200, {'results': ['second']})
+
+    @httpretty.activate
+    def test_stale_responses_revalidated(self):
+        self.login()
+        self.grant_permission(self.user, 'edX/DemoX/Demo_Course')
+        self.register_learners({'results': ['first']}, adding_headers={'ETag': '"abc"'})
+
+        with override_settings(LEARNER_API_CACHE_TIMEOUT=0):
+            self.get_learners()
+
+            self.register_learners({}, status=304)
+            response = self.get_learners()
+            self.assertEqual(httpretty.last_request().headers['If-None-Match'], '"abc"')
+            self.assert_response_equals(response, 200, {'results': ['first']})
+
 
 @ddt.ddt
 class LearnerListCSVTestCase(LearnerListViewTestCase):
@@ -128,6 +173,54 @@ class LearnerListCSVTestCase(LearnerListViewTestCase):
         response = self.client.get('/api/learner_analytics/v0' + self.endpoint, self.required_query_params)
         self.assertEquals(response['Content-Disposition'], content_disposition)
 
+    @httpretty.activate
+    def test_streamed_body(self):
+        self.login()
+        self.grant_permission(self.user, self.course_id)
+
+        body = 'username,course_id\r\n' * 1000
+        httpretty.register_uri(
+            httpretty.GET, settings.DATA_API_URL + self.remote_endpoint, body=body,
+            status=200, content_type=self.content_type,
+        )
+        response = self.client.get('/api/learner_analytics/v0' + self.endpoint, self.required_query_params)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], self.content_type)
+        self.assertEqual(b''.join(response.streaming_content), body)
+
+    def register_learners(self, body, status=200, **kwargs):
+        httpretty.register_uri(
+            httpretty.GET, settings.DATA_API_URL + self.remote_endpoint, body=body, status=status,
+            content_type=self.content_type, **kwargs
+        )
+
+    @httpretty.activate
+    def test_responses_cached(self):
+        # Downloads are streamed from the Data API on every request, rather than cached
+        self.login()
+        self.grant_permission(self.user, self.course_id)
+        self.register_learners('first')
+        response = self.get_learners()
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content), 'first')
+
+        self.register_learners('second')
+        response = self.get_learners()
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content), 'second')
+
+    @httpretty.activate
+    def test_stale_responses_revalidated(self):
+        # Downloads are not cached, so they are never revalidated
+        self.login()
+        self.grant_permission(self.user, self.course_id)
+        self.register_learners('first', adding_headers={'ETag': '"abc"'})
+        self.get_learners()
+
+        response = self.get_learners()
+        self.assertNotIn('If-None-Match', httpretty.last_request().headers)
+        self.assertEqual(b''.join(response.streaming_content), 'first')
+
 
 class EngagementTimelinesViewTestCase(LearnerAPITestMixin, TestCase):
     endpoint = '/engagement_timelines/username/'
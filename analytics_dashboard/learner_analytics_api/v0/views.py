@@ -1,16 +1,22 @@
-from requests.exceptions import ConnectTimeout
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from requests.exceptions import Timeout
 
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.generics import RetrieveAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.caching import cache
+from core.utils import iter_response_content, sanitize_cache_key
+
 from .clients import LearnerAPIClient
 from .permissions import HasCourseAccessPermission
 from .renderers import TextRenderer
 
 
-# TODO: Consider caching responses from the data api when working on AN-6157
 class BaseLearnerApiView(RetrieveAPIView):
     permission_classes = (IsAuthenticated, HasCourseAccessPermission,)
 
@@ -21,9 +27,20 @@ class BaseLearnerApiView(RetrieveAPIView):
     # This will be further investigated in AN-6928.
     include_headers = False
 
+    # Relay successful Data API responses to the browser in chunks rather than reading them into memory.
+    stream_response = False
+
+    # Headers describing the upstream connection or encoding, which do not apply to the relayed response.
+    excluded_stream_headers = ('connection', 'content-encoding', 'content-length', 'transfer-encoding',)
+
+    # Cache successful Data API responses.  Responses are served from the cache for LEARNER_API_CACHE_TIMEOUT
+    # seconds, then revalidated with If-None-Match for up to LEARNER_API_CACHE_REVALIDATION_PERIOD seconds.
+    # Response headers are not cached.
+    cache_responses = True
+
     def __init__(self, *args, **kwargs):
         super(BaseLearnerApiView, self).__init__(*args, **kwargs)
-        self.client = LearnerAPIClient(serializer_type=self.serializer_type)
+        self.client = LearnerAPIClient(serializer_type=self.serializer_type, stream=self.stream_response)
 
     def get_queryset(self):
         """
@@ -43,11 +60,67 @@ class BaseLearnerApiView(RetrieveAPIView):
             course_id = self.request.query_params.get('course_id')
         return course_id
 
+    def get_permission_scope(self):
+        """
+        Returns a string identifying which responses the requesting user may see.  Users with access to the
+        course see the same responses, but superusers may also request learners without a course.
+        """
+        return 'all' if self.request.user.is_superuser else 'course'
+
+    def get_cache_key(self):
+        """
+        Returns the key under which the Data API response to this request is cached.
+        """
+        params = sorted(self.request.query_params.items())
+        url_kwargs = sorted(self.kwargs.items())
+        key = u'learner_api_{view}_{scope}_{course_id}_{kwargs}_{params}'.format(
+            view=self.__class__.__name__,
+            scope=self.get_permission_scope(),
+            course_id=self.course_id,
+            kwargs=url_kwargs,
+            params=params,
+        )
+        return sanitize_cache_key(key)
+
+    def cache_response(self, cache_key, data, status, etag):
+        entry = {
+            'data': data,
+            'status': status,
+            'etag': etag,
+            'fresh_until': time.time() + settings.LEARNER_API_CACHE_TIMEOUT,
+        }
+        timeout = settings.LEARNER_API_CACHE_TIMEOUT
+        if etag:
+            timeout += settings.LEARNER_API_CACHE_REVALIDATION_PERIOD
+        cache.set(cache_key, entry, timeout)
+
     def get(self, request, *args, **kwargs):
         """
         Return the response from the Data API.
         """
+        cache_key = entry = None
+        if self.cache_responses:
+            cache_key = self.get_cache_key()
+            entry = cache.get(cache_key)
+            if entry:
+                if entry['fresh_until'] > time.time():
+                    return Response(data=entry['data'], status=entry['status'])
+                if entry['etag']:
+                    self.client.if_none_match(entry['etag'])
+
         api_response = self.get_api_response(request, *args, **kwargs)
+        if self.stream_response and api_response.ok:
+            return self.get_streaming_response(api_response)
+
+        if entry and api_response.status_code == 304:
+            # The cached response is still current
+            self.cache_response(cache_key, entry['data'], entry['status'], entry['etag'])
+            return Response(data=entry['data'], status=entry['status'])
+
+        if cache_key and api_response.status_code == 200:
+            self.cache_response(cache_key, api_response.serialized_content, api_response.status_code,
+                                api_response.headers.get('ETag'))
+
         response_kwargs = dict(
             data=api_response.serialized_content,
             status=api_response.status_code,
@@ -56,6 +129,21 @@ class BaseLearnerApiView(RetrieveAPIView):
             response_kwargs['headers'] = api_response.headers
         return Response(**response_kwargs)
 
+    def get_streaming_response(self, api_response):
+        """
+        Returns a response that relays the body of the Data API response as it is read.
+        """
+        response = StreamingHttpResponse(
+            iter_response_content(api_response),
+            status=api_response.status_code,
+            content_type=api_response.headers.get('Content-Type'),
+        )
+        if self.include_headers:
+            for name, value in api_response.headers.items():
+                if name.lower() not in self.excluded_stream_headers:
+                    response[name] = value
+        return response
+
     def get_api_response(self, request, *args, **kwargs):
         """
         Fetch the response from the API.
@@ -69,7 +157,7 @@ class BaseLearnerApiView(RetrieveAPIView):
         Handles timeouts raised by the API client by returning an HTTP
         504.
         """
-        if isinstance(exc, ConnectTimeout):
+        if isinstance(exc, Timeout):
             return Response(
                 data={'developer_message': 'Learner Analytics API timed out.', 'error_code': 'analytics_api_timeout'},
                 status=504
@@ -85,6 +173,8 @@ class DownloadLearnerApiViewMixin(object):
     include_headers = True
     content_type = 'text/csv'
     serializer_type = 'text'
+    stream_response = True
+    cache_responses = False
 
     def get_api_response(self, request, **kwargs):
         """
@@ -164,6 +164,8 @@ TEMPLATES = [
 ########## MIDDLEWARE CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#middleware-classes
 MIDDLEWARE_CLASSES = (
+    'core.middleware.ServerTimingMiddleware',
+    'core.middleware.RequestCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -302,6 +304,14 @@ DATA_API_AUTH_TOKEN = 'edx'
 # used to determine if a course ID is valid
 LMS_COURSE_VALIDATION_BASE_URL = None
 
+# Seconds for which the LMS's answer to whether a course ID is valid is cached. Invalid course IDs are
+# rechecked sooner, so that newly-created courses become available quickly.
+COURSE_VALIDATION_CACHE_TIMEOUT = 60 * 60
+COURSE_VALIDATION_NEGATIVE_CACHE_TIMEOUT = 5 * 60
+
+# Number of the courses a user has permission to view that the course index validates in the background.
+COURSE_VALIDATION_PREFETCH_LIMIT = 50
+
 # used to construct the shortcut link to course modules
 LMS_COURSE_SHORTCUT_BASE_URL = None
 
@@ -399,6 +409,33 @@ ANALYTICS_API_DEFAULT_TIMEOUT = 5
 LMS_DEFAULT_TIMEOUT = 5
 ########## END EXTERNAL SERVICE TIMEOUTS
 
+########## CONCURRENT API REQUESTS
+# Number of threads presenters may use to issue independent Data API and
+# Course API requests in parallel while rendering a single page.
+PRESENTER_FETCH_MAX_WORKERS = 10
+
+# Number of threads per process that fill caches in the background with data users are likely to request
+# next (see ANSWER_DISTRIBUTION_PREFETCH_COUNT).
+PREFETCH_MAX_WORKERS = 4
+
+# When the enable_answer_distribution_prefetch switch is active, the answer distribution page of a graded
+# problem prefetches the distributions of the next ANSWER_DISTRIBUTION_PREFETCH_COUNT problems of its
+# assignment.  At most ANSWER_DISTRIBUTION_PREFETCH_COURSE_LIMIT distributions of a course are fetched at
+# once; further prefetches are skipped rather than queued.
+ANSWER_DISTRIBUTION_PREFETCH_COUNT = 3
+ANSWER_DISTRIBUTION_PREFETCH_COURSE_LIMIT = 3
+########## END CONCURRENT API REQUESTS
+
+########## HTTP CONNECTION POOLS
+# Maximum number of keep-alive connections each process keeps open to an upstream service, keyed by the
+# upstream names passed to core.utils.get_http_session. Upstreams without an entry use the 'default' size.
+HTTP_POOL_MAXSIZE = {
+    'default': 10,
+    # Presenters fetch from the Data API on up to PRESENTER_FETCH_MAX_WORKERS threads at once.
+    'data_api': 20,
+}
+########## END HTTP CONNECTION POOLS
+
 _ = lambda s: s
 
 ########## LINKS THAT SHOULD BE SHOWN IN FOOTER
@@ -438,8 +475,54 @@ COURSE_ID_PATTERN = r'(?P<course_id>[^/+]+[/+][^/+]+[/+][^/]+)'
 LEARNER_API_LIST_DOWNLOAD_FIELDS = None
 ########## END LEARNER_API_LIST_DOWNLOAD_FIELDS
 
+########## LEARNER ROSTER PREFETCH
+# Seconds the learner roster page waits for each Data API response it prefetches, and the longest it
+# waits for all of them together before leaving the rest for the browser to fetch.  The budget must be
+# shorter than the timeout to have any effect.
+LEARNERS_PREFETCH_TIMEOUT = 5
+LEARNERS_PREFETCH_BUDGET = 3
+
+# Number of threads per process on which the roster page prefetches.  Responses that miss the budget keep
+# their thread until they time out; once every thread is busy, pages leave their prefetches to the browser.
+LEARNERS_PREFETCH_MAX_WORKERS = 4
+########## END LEARNER ROSTER PREFETCH
+
+########## LEARNER ANALYTICS API RESPONSE CACHE
+# Seconds for which responses from the learner analytics API are served from the cache.
+LEARNER_API_CACHE_TIMEOUT = 60
+# Seconds for which responses with an ETag are kept after that, so that they can be revalidated
+# with the Data API instead of downloaded again.
+LEARNER_API_CACHE_REVALIDATION_PERIOD = 15 * 60
+########## END LEARNER ANALYTICS API RESPONSE CACHE
+
+########## STREAMING RESPONSES
+# Size in bytes of the chunks read from the Data API and written to the client when
+# CSV exports are streamed through the dashboard.
+STREAMING_RESPONSE_CHUNK_SIZE = 64 * 1024
+########## END STREAMING RESPONSES
+
 ########## CACHE CONFIGURATION
 COURSE_SUMMARIES_CACHE_TIMEOUT = 3600  # 1 hour timeout
+
+# Individual course summaries are checked against the creation times in the summaries index before they
+# are used, so they can be kept much longer than the index itself.
+COURSE_SUMMARY_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Values cached through core.caching.get_or_set remain available for this many seconds after they
+# expire.  Stale values are served while a single worker refreshes them in the background.
+CACHE_STALE_GRACE_PERIOD = 600
+
+# Seconds a worker may hold the lock for filling an empty cache key, and the longest other workers
+# wait for it to finish before fetching the value themselves.
+CACHE_FILL_LOCK_TIMEOUT = 30
+CACHE_FILL_WAIT_TIMEOUT = 5
+
+# Codec for large values cached through core.caching.get_or_set, such as course structures and module data.
+# Encoded values of at least CACHE_COMPRESS_THRESHOLD bytes are compressed (None disables compression), and
+# those larger than CACHE_CHUNK_SIZE are split across several keys to fit memcached's 1 MB item limit.
+CACHE_VALUE_CODEC = 'core.caching.PickleCodec'
+CACHE_COMPRESS_THRESHOLD = 16 * 1024
+CACHE_CHUNK_SIZE = 1000 * 1000
 ########## END CACHE CONFIGURATION
 
 ########## WEBPACK CONFIGURATION
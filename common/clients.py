@@ -1,7 +1,11 @@
 import logging
 
+from analyticsclient.client import Client
+from analyticsclient.constants import data_format as DF
+from analyticsclient.exceptions import ClientError, InvalidRequestError, NotFoundError, TimeoutError
 from edx_rest_api_client.client import EdxRestApiClient
 from edx_rest_api_client.exceptions import HttpClientError
+import requests
 
 
 logger = logging.getLogger(__name__)
@@ -44,3 +48,61 @@ class CourseStructureApiClient(EdxRestApiClient):
                 break
 
         return courses
+
+
+class AnalyticsApiClient(Client):
+    """
+    Analytics Data API client that can share a connection pool and leave CSV response bodies unread.
+
+    Requests are sent through `session` if one is given, so that clients created for different requests
+    and threads reuse its keep-alive connections.
+
+    With `stream` enabled, CSV requests return the `requests` response with its body still on the
+    connection, so callers can pass it along in chunks rather than reading whole exports into memory.
+    JSON requests behave exactly as they do with the standard client.
+    """
+
+    def __init__(self, base_url, auth_token=None, timeout=0.25, stream=False, session=None):
+        super(AnalyticsApiClient, self).__init__(base_url, auth_token=auth_token, timeout=timeout)
+        self.stream = stream
+        self.session = session
+
+    def get(self, resource, timeout=None, data_format=DF.JSON):
+        if self.stream and data_format == DF.CSV:
+            return self._request(resource, timeout=timeout, data_format=data_format)
+        return super(AnalyticsApiClient, self).get(resource, timeout=timeout, data_format=data_format)
+
+    def _request(self, resource, timeout=None, data_format=DF.JSON):
+        if timeout is None:
+            timeout = self.timeout
+
+        headers = {
+            'Accept': 'text/csv' if data_format == DF.CSV else 'application/json',
+        }
+        if self.auth_token:
+            headers['Authorization'] = 'Token ' + self.auth_token
+
+        uri = '{0}/{1}'.format(self.base_url, resource)
+        stream = self.stream and data_format == DF.CSV
+
+        try:
+            response = (self.session or requests).get(uri, headers=headers, timeout=timeout, stream=stream)
+        except requests.exceptions.Timeout:
+            message = 'Response from {0} exceeded timeout of {1}s.'.format(resource, timeout)
+            logger.exception(message)
+            raise TimeoutError(message)
+
+        status_code = response.status_code
+        if status_code == requests.codes.ok:  # pylint: disable=no-member
+            return response
+
+        response.close()
+        message = 'Resource "{0}" returned status code {1}'.format(resource, status_code)
+        error_class = ClientError
+        if status_code == requests.codes.bad_request:  # pylint: disable=no-member
+            error_class = InvalidRequestError
+        elif status_code == requests.codes.not_found:  # pylint: disable=no-member
+            error_class = NotFoundError
+
+        logger.error(message)
+        raise error_class(message)
@@ -1,4 +1,197 @@
+class CompactCourseStructure(object):
+    """
+    The parts of a Course Blocks API response read by the dashboard, projected into parallel lists.
+
+    Blocks are numbered in course (pre-order) order and every list is indexed by that number, so the root is
+    node 0 and the subtree of node n is range(n, subtree_ends[n]).  Only the ID, type, display name, format
+    and graded fields of each block are kept, which makes the projection much smaller to cache and faster
+    to unpickle than the response it was built from.
+    """
+
+    __slots__ = ('ids', 'types', 'display_names', 'formats', 'graded', 'parents', 'subtree_ends',
+                 'encoded_module_ids', '_positions')
+
+    # Lists holding each block field that can be filtered on
+    FIELDS = {
+        u'id': 'ids',
+        u'type': 'types',
+        u'display_name': 'display_names',
+        u'format': 'formats',
+        u'graded': 'graded',
+    }
+
+    def __init__(self):
+        self.ids = []
+        self.types = []
+        self.display_names = []
+        self.formats = []
+        self.graded = []
+        # Node number of the parent of each block (None for the root)
+        self.parents = []
+        # Node number just past the last descendant of each block
+        self.subtree_ends = []
+        # Encoded module ID of each block, as used by the data API, or None if they were not computed
+        self.encoded_module_ids = None
+        self._positions = None
+
+    @classmethod
+    def from_blocks(cls, structure, encode_id=None):
+        """
+        Returns the projection of a Course Blocks API response.
+
+        Arguments
+            structure   --  Course Blocks API response, with 'root' and 'blocks' keys
+            encode_id   --  Callable returning the encoded module ID of a block ID, or None if it has none.
+                            Encoded module IDs are not kept if it is omitted.
+        """
+        projected = cls()
+        if not structure or u'blocks' not in structure:
+            return projected
+
+        blocks = structure[u'blocks']
+        if encode_id is not None:
+            projected.encoded_module_ids = []
+
+        # Types and formats repeat, so each distinct value is stored (and pickled) once
+        interned = {}
+
+        # Iterative depth-first traversal; a (None, node) entry marks the end of the subtree of node.
+        stack = [(structure[u'root'], None)]
+        while stack:
+            block_id, parent = stack.pop()
+            if block_id is None:
+                projected.subtree_ends[parent] = len(projected.ids)
+                continue
+
+            block = blocks[block_id]
+            node = len(projected.ids)
+            projected.ids.append(block_id)
+            projected.types.append(interned.setdefault(block.get(u'type'), block.get(u'type')))
+            projected.display_names.append(block.get(u'display_name'))
+            projected.formats.append(interned.setdefault(block.get(u'format'), block.get(u'format')))
+            projected.graded.append(block.get(u'graded'))
+            projected.parents.append(parent)
+            projected.subtree_ends.append(None)
+            if encode_id is not None:
+                projected.encoded_module_ids.append(encode_id(block_id))
+
+            stack.append((None, node))
+            for child_id in reversed(block.get(u'children', [])):
+                stack.append((child_id, node))
+
+        return projected
+
+    def __getstate__(self):
+        return (self.ids, self.types, self.display_names, self.formats, self.graded, self.parents,
+                self.subtree_ends, self.encoded_module_ids)
+
+    def __setstate__(self, state):
+        (self.ids, self.types, self.display_names, self.formats, self.graded, self.parents,
+         self.subtree_ends, self.encoded_module_ids) = state
+        self._positions = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def root(self):
+        return self.ids[0] if self.ids else None
+
+    @property
+    def positions(self):
+        """ Dictionary mapping each block ID to its node number, built on first use. """
+        if self._positions is None:
+            self._positions = {block_id: node for node, block_id in enumerate(self.ids)}
+        return self._positions
+
+    def children(self, node):
+        """ Returns the node numbers of the children of node, in course order. """
+        children = []
+        child = node + 1
+        while child < self.subtree_ends[node]:
+            children.append(child)
+            child = self.subtree_ends[child]
+        return children
+
+    def block(self, block_id):
+        """ Returns a Course Blocks API style dictionary for the block, with the fields kept. """
+        return self.node_block(self.positions[block_id])
+
+    def node_block(self, node):
+        return {
+            u'id': self.ids[node],
+            u'type': self.types[node],
+            u'display_name': self.display_names[node],
+            u'format': self.formats[node],
+            u'graded': self.graded[node],
+            u'children': [self.ids[child] for child in self.children(node)],
+        }
+
+    def encoded_module_id(self, block_id):
+        """ Returns the encoded module ID of the block, or None if it is unknown. """
+        node = self.positions.get(block_id)
+        if node is None or self.encoded_module_ids is None:
+            return None
+        return self.encoded_module_ids[node]
+
+    def filter_nodes(self, node, require_format=False, **criteria):
+        """
+        Returns the node numbers of the blocks in the subtree of node (inclusive) matching `criteria`, in
+        course order.  Blocks nested under a match are not considered.
+
+        Arguments
+            node            --   Node number of the root of the subtree
+            require_format  --   Boolean indicating if the format field should be required to have a
+                                 non-empty (truthy) value if a match is made
+            criteria        --   Dictionary mapping field names to required values for matches.  The
+                                 `block_type` name is accepted as an alias for `type`.  Fields that are
+                                 not kept are treated as None.
+        """
+        if node >= len(self.ids):
+            return []
+
+        if u'block_type' in criteria:
+            criteria[u'type'] = criteria.pop(u'block_type')
+
+        columns = []
+        for name, value in criteria.items():
+            if name in self.FIELDS:
+                columns.append((getattr(self, self.FIELDS[name]), value))
+            elif value is not None:
+                return []
+
+        formats = self.formats
+        subtree_ends = self.subtree_ends
+        matches = []
+        current = node
+        end = subtree_ends[node]
+        while current < end:
+            if all(column[current] == value for column, value in columns) and \
+                    (not require_format or formats[current]):
+                matches.append(current)
+                current = subtree_ends[current]
+            else:
+                current += 1
+
+        return matches
+
+    def filter_descendants(self, block_id, require_format=False, **criteria):
+        """
+        Returns the blocks in the subtree rooted at `block_id` (inclusive) matching `criteria`, in course
+        order, as returned by `block`.  See `filter_nodes`.
+        """
+        nodes = self.filter_nodes(self.positions[block_id], require_format=require_format, **criteria)
+        return [self.node_block(node) for node in nodes]
+
+
 class CourseStructure(object):
+    @staticmethod
+    def index(structure):
+        """ Returns a CompactCourseStructure for the structure, reusing it if one is passed in. """
+        if isinstance(structure, CompactCourseStructure):
+            return structure
+        return CompactCourseStructure.from_blocks(structure)
+
     @staticmethod
     def _filter_children(blocks, key, require_format=False, **kwargs):
         """
@@ -11,40 +204,19 @@ class CourseStructure(object):
                                  non-empty (truthy) value if a match is made
             kwargs          --   Dictionary mapping field names to required values for matches
         """
-        block = blocks[key]
-
-        block_type = kwargs.pop(u'block_type', None)
-        if block_type:
-            kwargs[u'type'] = block_type
-
-        matched = True
-        for name, value in kwargs.iteritems():
-            matched &= (block.get(name, None) == value)
-            if not matched:
-                break
-
-        if matched:
-            if require_format:
-                if u'format' in block and block[u'format']:
-                    return [block]
-            else:
-                return [block]
-
-        children = []
-        if u'children' in block:
-            for child in block[u'children']:
-                children += CourseStructure._filter_children(blocks, child, require_format=require_format, **kwargs)
-
-        return children
+        structure = CompactCourseStructure.from_blocks({u'blocks': blocks, u'root': key})
+        return structure.filter_descendants(key, require_format=require_format, **kwargs)
 
     @staticmethod
     def course_structure_to_assignments(structure, graded=None, assignment_type=None):
         """
         Returns the assignments and nested problems from the given course structure.
-        """
 
-        blocks = structure[u'blocks']
-        root = blocks[structure[u'root']]
+        `structure` may be a Course Blocks API response or a CompactCourseStructure built from one.
+        """
+        structure = CourseStructure.index(structure)
+        ids = structure.ids
+        display_names = structure.display_names
 
         # Break down the course structure into assignments and nested problems, returning only the data
         # we absolutely need.
@@ -57,22 +229,18 @@ class CourseStructure(object):
         if assignment_type:
             kwargs[u'format'] = assignment_type
 
-        filtered = CourseStructure._filter_children(blocks, root[u'id'], require_format=True, **kwargs)
-
-        for assignment in filtered:
-            filtered_children = CourseStructure._filter_children(blocks, assignment[u'id'], graded=graded,
-                                                                 block_type=u'problem', require_format=False)
+        for assignment in structure.filter_nodes(0, require_format=True, **kwargs):
             problems = []
-            for problem in filtered_children:
+            for problem in structure.filter_nodes(assignment, graded=graded, block_type=u'problem'):
                 problems.append({
-                    'id': problem['id'],
-                    'name': problem['display_name']
+                    'id': ids[problem],
+                    'name': display_names[problem]
                 })
 
             assignments.append({
-                'id': assignment['id'],
-                'name': assignment['display_name'],
-                'assignment_type': assignment['format'],
+                'id': ids[assignment],
+                'name': display_names[assignment],
+                'assignment_type': structure.formats[assignment],
                 'children': problems,
             })
 
@@ -83,35 +251,31 @@ class CourseStructure(object):
         """
         Returns sections, subsections, and the child block type (e.g. problem or video), nested
         within 'children' attributes.
-        """
 
-        blocks = structure[u'blocks']
-        root = blocks[structure[u'root']]
-        sections = CourseStructure._build_sections(blocks, root[u'id'],
-                                                   graded, [u'chapter', u'sequential', unicode(child_block_type)])
+        `structure` may be a Course Blocks API response or a CompactCourseStructure built from one.
+        """
+        structure = CourseStructure.index(structure)
+        sections = CourseStructure._build_sections(structure, 0, graded,
+                                                   [u'chapter', u'sequential', unicode(child_block_type)])
         return sections
 
     @staticmethod
-    def _build_sections(blocks, section_id, graded, block_types):
+    def _build_sections(structure, node, graded, block_types):
         """ Recursively build sections of block_type. """
         sections = []
         if block_types:
-            block_types = list(block_types)
-            block_type = block_types.pop(0)
+            block_type = block_types[0]
             filter_kwargs = {
                 'block_type': block_type,
             }
             if graded is not None:
                 filter_kwargs['graded'] = graded
-            structure_sections = CourseStructure._filter_children(blocks, section_id,
-                                                                  require_format=False,
-                                                                  **filter_kwargs)
 
-            for section in structure_sections:
-                children = CourseStructure._build_sections(blocks, section[u'id'], graded, block_types)
+            for section in structure.filter_nodes(node, **filter_kwargs):
+                children = CourseStructure._build_sections(structure, section, graded, block_types[1:])
                 sections.append({
-                    'id': section['id'],
-                    'name': section['display_name'],
+                    'id': structure.ids[section],
+                    'name': structure.display_names[section],
                     'children': children
                 })
 
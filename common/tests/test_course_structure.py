@@ -1,6 +1,8 @@
+import cPickle as pickle
 from unittest import TestCase
 
-from common.course_structure import CourseStructure
+from common.course_structure import CompactCourseStructure, CourseStructure
+from common.tests.course_fixtures import ChapterFixture, CourseFixture, SequentialFixture, VerticalFixture, VideoFixture
 from common.tests.factories import CourseStructureFactory
 
 
@@ -69,3 +71,77 @@ class CourseStructureTests(TestCase):
 
         actual = CourseStructure.course_structure_to_sections(structure, 'problem', False)
         self.assertListEqual(actual, self._prepare_structure(structure, factory.sections, False))
+
+    def test_course_structure_to_sections_with_index(self):
+        factory = CourseStructureFactory()
+        structure = factory.structure
+        index = CourseStructure.index(structure)
+
+        self.assertIs(CourseStructure.index(index), index)
+        self.assertListEqual(CourseStructure.course_structure_to_sections(index, 'problem', False),
+                             CourseStructure.course_structure_to_sections(structure, 'problem', False))
+        self.assertListEqual(CourseStructure.course_structure_to_assignments(index, graded=True),
+                             CourseStructure.course_structure_to_assignments(structure, graded=True))
+
+
+class CompactCourseStructureTests(TestCase):
+    def setUp(self):
+        self.video = VideoFixture()
+        self.vertical = VerticalFixture().add_children(self.video)
+        self.sequential = SequentialFixture().add_children(self.vertical)
+        self.chapter = ChapterFixture().add_children(self.sequential)
+        self.course = CourseFixture().add_children(self.chapter)
+
+        # Fixtures inherit 'graded' from their parents when added, so grade the subsection afterwards.
+        for block in self.sequential.pre_order():
+            block.graded = True
+
+        self.structure = CompactCourseStructure.from_blocks(self.course.course_structure(),
+                                                            encode_id=lambda block_id: block_id.upper())
+
+    def test_ids(self):
+        self.assertListEqual(self.structure.ids, [block.id for block in self.course.pre_order()])
+        self.assertEqual(self.structure.root, self.course.id)
+        self.assertEqual(self.structure.positions[self.video.id], 4)
+
+    def test_parents_and_children(self):
+        self.assertListEqual(self.structure.parents, [None, 0, 1, 2, 3])
+        self.assertListEqual(self.structure.children(0), [1])
+        self.assertListEqual(self.structure.children(4), [])
+
+    def test_block(self):
+        block = self.structure.block(self.vertical.id)
+        self.assertEqual(block['id'], self.vertical.id)
+        self.assertEqual(block['type'], 'vertical')
+        self.assertTrue(block['graded'])
+        self.assertListEqual(block['children'], [self.video.id])
+
+    def test_encoded_module_ids(self):
+        self.assertEqual(self.structure.encoded_module_id(self.video.id), self.video.id.upper())
+        self.assertIsNone(self.structure.encoded_module_id('unknown'))
+        self.assertIsNone(CompactCourseStructure.from_blocks(self.course.course_structure())
+                          .encoded_module_id(self.video.id))
+
+    def test_filter_descendants(self):
+        self.assertListEqual([block['id'] for block in self.structure.filter_descendants(self.course.id,
+                                                                                          block_type='video')],
+                             [self.video.id])
+        # Blocks nested under a match are not returned
+        self.assertListEqual([block['id'] for block in self.structure.filter_descendants(self.course.id,
+                                                                                          graded=True)],
+                             [self.sequential.id])
+        self.assertListEqual(self.structure.filter_descendants(self.chapter.id, require_format=True, graded=True),
+                             [])
+        self.assertListEqual(self.structure.filter_nodes(0, unknown_field='value'), [])
+
+    def test_pickle(self):
+        unpickled = pickle.loads(pickle.dumps(self.structure, pickle.HIGHEST_PROTOCOL))
+        self.assertListEqual(unpickled.ids, self.structure.ids)
+        self.assertListEqual(unpickled.subtree_ends, self.structure.subtree_ends)
+        self.assertEqual(unpickled.positions[self.video.id], 4)
+
+    def test_empty(self):
+        structure = CompactCourseStructure.from_blocks({})
+        self.assertFalse(structure)
+        self.assertIsNone(structure.root)
+        self.assertListEqual(CourseStructure.course_structure_to_sections(structure, 'video'), [])